@@ -0,0 +1,95 @@
+"""Microbenchmark for Dispatcher.handlers_for_address.
+
+Compares the original linear-scan resolution (re-compiling the incoming
+address and every wildcard key on each message) against the cached
+dispatcher, with 10, 100 and 1000 mapped addresses plus the "/*" catch-all
+mapping the OSC Controller add-on installs.
+
+Usage:
+    python bench_dispatcher.py [--messages N]
+"""
+
+import argparse
+import logging
+import os
+import re
+import sys
+import time
+
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "osc_controller", "vendor"),
+)
+
+from pythonosc.dispatcher import Dispatcher
+
+
+class LegacyDispatcher(Dispatcher):
+    """Dispatcher using the pre-cache address resolution"""
+
+    def handlers_for_address(self, address_pattern):
+        escaped_address_pattern = re.escape(address_pattern)
+        pattern = escaped_address_pattern.replace("\\?", "\\w?")
+        pattern = pattern.replace("\\*", "[\\w|\\+]*")
+        pattern = f"{pattern}$"
+        patterncompiled = re.compile(pattern)
+        matched = False
+
+        for addr, handlers in self._map.items():
+            if patterncompiled.match(addr) or (
+                ("*" in addr)
+                and re.match(addr.replace("*", "[^/]*?/*"), address_pattern)
+            ):
+                yield from handlers
+                matched = True
+
+        if not matched and self._default_handler:
+            logging.debug("No handler matched but default handler present, added it.")
+            yield self._default_handler
+
+
+def _handler(address, *args):
+    pass
+
+
+def _build(dispatcher_cls, mapped, catch_all):
+    dispatcher = dispatcher_cls()
+    addresses = [f"/rig/channel{i}/value" for i in range(mapped)]
+    for address in addresses:
+        dispatcher.map(address, _handler)
+    if catch_all:
+        dispatcher.map("/*", _handler)
+    return dispatcher, addresses
+
+
+def _messages_per_second(dispatcher, addresses, messages):
+    count = len(addresses)
+    # Warm up so steady-state throughput is measured
+    for address in addresses:
+        for _ in dispatcher.handlers_for_address(address):
+            pass
+    start = time.perf_counter()
+    for i in range(messages):
+        for _ in dispatcher.handlers_for_address(addresses[i % count]):
+            pass
+    return messages / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=20000, help="Lookups per run")
+    args = parser.parse_args()
+
+    print(f"{'mapped':>8} {'catch-all':>10} {'before msg/s':>14} {'after msg/s':>14} {'speedup':>8}")
+    for mapped in (10, 100, 1000):
+        for catch_all in (False, True):
+            legacy, addresses = _build(LegacyDispatcher, mapped, catch_all)
+            cached, _ = _build(Dispatcher, mapped, catch_all)
+            # Legacy lookups get slow with many keys, keep the run short
+            before = _messages_per_second(legacy, addresses, max(1000, args.messages // mapped * 10))
+            after = _messages_per_second(cached, addresses, args.messages)
+            print(f"{mapped:>8} {str(catch_all):>10} {before:>14,.0f} {after:>14,.0f} {after / before:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
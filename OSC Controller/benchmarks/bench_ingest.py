@@ -0,0 +1,203 @@
+"""End-to-end ingest benchmark for the OSC Controller add-on.
+
+Registers the add-on against the bpy stand-in in bpy_stub.py, maps one OSC
+address per object to location X, starts the OSC server through the real
+osc.start_server operator and floods it with UDP traffic from a separate
+process. Each datagram carries its own send time (seconds since a shared
+monotonic epoch), so the stub can timestamp the property write and compute
+datagram-to-property-write latency without any bookkeeping in the add-on.
+
+Reports per target rate: achieved send rate, messages handled by the add-on,
+property writes, p50/p99/max latency and receiver CPU time per message.
+Results are printed and written as JSON.
+
+Usage:
+    python bench_ingest.py [--rates 1000,5000,...] [--duration S] [--objects N]
+                           [--server-type batched|threading|blocking|asyncio]
+                           [--output results.json]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import socket
+import statistics
+import struct
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.realpath(__file__))
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, os.path.join(BENCH_DIR, ".."))  # Parent of the osc_controller package
+
+import bpy_stub
+
+DEFAULT_RATES = "1000,5000,10000,20000,50000"
+
+
+def _send_traffic(host, port, rate, duration, epoch, addresses):
+    """Sender process: paced UDP traffic, each message carrying its send time as a double"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    prefixes = []
+    for address in addresses:
+        encoded = address.encode() + b"\0"
+        encoded += b"\0" * (-len(encoded) % 4)
+        prefixes.append(encoded + b",d\0\0")
+    pack = struct.Struct(">d").pack
+    count = len(prefixes)
+
+    sent = 0
+    start = time.monotonic()
+    end = start + duration
+    now = start
+    while now < end:
+        # Send everything that is due so far, then yield briefly
+        due = int((now - start) * rate)
+        while sent < due:
+            sock.sendto(prefixes[sent % count] + pack(time.monotonic() - epoch), (host, port))
+            sent += 1
+        time.sleep(0.0005)
+        now = time.monotonic()
+    sock.close()
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+def _setup(bpy, objects, server_type, port):
+    import osc_controller
+
+    osc_controller.register()
+    bpy_stub.run_timers()  # Deferred routing table rebuild
+
+    scene = bpy.context.scene
+    settings = scene.osc_settings
+    settings.ip_address = "127.0.0.1"
+    settings.port = port
+    settings.server_type = server_type
+
+    addresses = []
+    for i in range(objects):
+        obj = bpy_stub.new_object(f"Bench.{i:03d}")
+        mapping = scene.osc_mappings.add()
+        mapping.osc_address = f"/bench/{i}/x"
+        mapping.property_type = 'location_x'
+        mapping.target_object = obj
+        addresses.append(mapping.osc_address)
+    return osc_controller, addresses
+
+
+def run_rate(bpy, rate, duration, addresses, port, epoch):
+    from osc_controller.core import metrics
+
+    latencies = []
+    last_written = {}
+
+    def on_write(obj, attribute, values):
+        # Only count values that changed
+        if attribute == "location" and last_written.get(obj) != values[0]:
+            last_written[obj] = values[0]
+            latencies.append(time.monotonic() - epoch - values[0])
+
+    bpy_stub.write_hook = on_write
+    metrics.reset()
+
+    if bpy.ops.osc.start_server() != {'FINISHED'}:
+        raise RuntimeError(f"Could not start the OSC server: {bpy_stub.reports[-1][1]}")
+
+    sender = multiprocessing.Process(
+        target=_send_traffic,
+        args=("127.0.0.1", port, rate, duration, epoch, addresses),
+    )
+    cpu_start = time.process_time()
+    wall_start = time.monotonic()
+    sender.start()
+
+    # Stand-in for Blender's main loop: run timers until the sender is done
+    # and the last datagrams have been applied
+    while sender.is_alive():
+        bpy_stub.run_timers()
+        time.sleep(0.001)
+    settle_end = time.monotonic() + 0.25
+    while time.monotonic() < settle_end:
+        bpy_stub.run_timers()
+        time.sleep(0.001)
+
+    wall = time.monotonic() - wall_start
+    cpu = time.process_time() - cpu_start
+    bpy.ops.osc.stop_server()
+    bpy_stub.write_hook = None
+
+    received = metrics.messages_total
+    latencies.sort()
+    return {
+        "target_rate": rate,
+        "duration": duration,
+        "messages_received": received,
+        "received_rate": received / duration,
+        "property_writes": len(latencies),
+        "coalesced": metrics.total_drain_stats["coalesced"],
+        "dropped": metrics.total_drain_stats["dropped"],
+        "latency_ms": {
+            "p50": _percentile(latencies, 0.50) * 1000.0,
+            "p99": _percentile(latencies, 0.99) * 1000.0,
+            "max": (latencies[-1] if latencies else 0.0) * 1000.0,
+            "mean": (statistics.fmean(latencies) if latencies else 0.0) * 1000.0,
+        },
+        "cpu_seconds": cpu,
+        "cpu_us_per_message": cpu / received * 1e6 if received else 0.0,
+        "wall_seconds": wall,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rates", default=DEFAULT_RATES, help="Comma-separated target message rates (msg/s)")
+    parser.add_argument("--duration", type=float, default=3.0, help="Seconds of traffic per rate")
+    parser.add_argument("--objects", type=int, default=16, help="Number of mapped objects/addresses")
+    parser.add_argument("--server-type", default="batched", choices=("batched", "threading", "blocking", "asyncio"))
+    parser.add_argument("--port", type=int, default=9701)
+    parser.add_argument("--output", default="bench_ingest.json", help="JSON results file")
+    args = parser.parse_args()
+
+    bpy = bpy_stub.install()
+    osc_controller, addresses = _setup(bpy, args.objects, args.server_type, args.port)
+    epoch = time.monotonic()
+
+    results = []
+    print(f"{'target/s':>9} {'recv/s':>9} {'writes':>8} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'cpu us/msg':>11}")
+    try:
+        for rate in (int(r) for r in args.rates.split(",")):
+            result = run_rate(bpy, rate, args.duration, addresses, args.port, epoch)
+            results.append(result)
+            latency = result["latency_ms"]
+            print(
+                f"{rate:>9,} {result['received_rate']:>9,.0f} {result['property_writes']:>8,}"
+                f" {latency['p50']:>8.2f} {latency['p99']:>8.2f} {latency['max']:>8.2f}"
+                f" {result['cpu_us_per_message']:>11.1f}"
+            )
+    finally:
+        osc_controller.unregister()
+
+    report = {
+        "benchmark": "ingest",
+        "server_type": args.server_type,
+        "objects": args.objects,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Benchmark for the single-scalar OSC message fast path.
+
+Compares decoding typical controller traffic (",f", ",i" and ",fff" messages)
+with the full OscPacket/OscMessage parser against
+osc_message.parse_simple_message, reporting throughput and the number of
+memory blocks each decoded message keeps alive while its handlers run.
+
+Usage:
+    python bench_parser.py [--messages N]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "osc_controller", "vendor"),
+)
+
+from pythonosc import osc_message, osc_packet
+from pythonosc.osc_message_builder import OscMessageBuilder
+
+
+def _dgram(address, *typed_args):
+    builder = OscMessageBuilder(address)
+    for value, arg_type in typed_args:
+        builder.add_arg(value, arg_type)
+    return builder.build().dgram
+
+
+def _parse_full(dgram):
+    for timed_msg in osc_packet.OscPacket(dgram).messages:
+        return timed_msg.message.address, tuple(timed_msg.message)
+
+
+def _parse_fast(dgram):
+    return osc_message.parse_simple_message(dgram)
+
+
+def _throughput(parse, dgram, messages):
+    start = time.perf_counter()
+    for _ in range(messages):
+        parse(dgram)
+    return messages / (time.perf_counter() - start)
+
+
+def _blocks_per_message(parse, dgram, messages):
+    """Memory blocks held per decoded message"""
+    parse(dgram)  # Warm caches outside of the measurement
+    tracemalloc.start()
+    try:
+        snapshot_before = tracemalloc.take_snapshot()
+        # Keep every result alive so each message's allocations stay visible
+        results = [parse(dgram) for _ in range(messages)]
+        snapshot_after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    stats = snapshot_after.compare_to(snapshot_before, "filename")
+    blocks = sum(stat.count_diff for stat in stats if stat.count_diff > 0)
+    del results
+    return blocks / messages
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=100000, help="Messages per run")
+    args = parser.parse_args()
+
+    cases = {
+        ",f": _dgram("/controller/fader1", (0.5, "f")),
+        ",i": _dgram("/controller/button3", (1, "i")),
+        ",fff": _dgram("/tracker/head/pos", (0.1, "f"), (0.2, "f"), (0.3, "f")),
+    }
+
+    print(f"{'type':>6} {'full msg/s':>12} {'fast msg/s':>12} {'speedup':>8} {'full blk/msg':>13} {'fast blk/msg':>13}")
+    for name, dgram in cases.items():
+        assert _parse_full(dgram) == _parse_fast(dgram)
+        full_rate = _throughput(_parse_full, dgram, args.messages)
+        fast_rate = _throughput(_parse_fast, dgram, args.messages)
+        full_blocks = _blocks_per_message(osc_packet.OscPacket, dgram, 2000)
+        fast_blocks = _blocks_per_message(_parse_fast, dgram, 2000)
+        print(
+            f"{name:>6} {full_rate:>12,.0f} {fast_rate:>12,.0f} {fast_rate / full_rate:>7.1f}x"
+            f" {full_blocks:>13.1f} {fast_blocks:>13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,546 @@
+"""Minimal stand-in for Blender's bpy module.
+
+Provides just enough of the API for the OSC Controller add-on to register and
+run outside Blender: scenes, objects with location/rotation_euler/scale,
+property groups and properties (with update callbacks), actions with
+F-Curves and keyframe points, operators reachable through bpy.ops,
+app.timers, app.handlers and app.driver_namespace.
+
+Timers only run when the host calls run_timers(), standing in for Blender's
+main event loop. Every transform write is reported to the optional
+write_hook(obj, attribute, values) callable so benchmarks can timestamp
+property writes.
+
+Usage:
+    import bpy_stub
+    bpy = bpy_stub.install()
+"""
+
+import heapq
+import itertools
+import sys
+import time
+import types
+
+# Called as write_hook(obj, attribute, values) after every transform write
+write_hook = None
+
+# (level, message) tuples passed to Operator.report
+reports = []
+
+
+# ---------------------------------------------------------------------------
+# Properties
+
+
+class _Property:
+    """Descriptor standing in for a bpy.props property definition"""
+
+    def __init__(self, default=None, type=None, items=None, update=None, **kwargs):
+        self.default = default
+        self.type = type
+        self.items = items
+        self.update = update
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def make_default(self):
+        if self.default is not None:
+            return self.default
+        if self.items:
+            return self.items[0][0]
+        return self.empty
+
+    empty = None
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        values = instance.__dict__
+        if self.name not in values:
+            values[self.name] = self.make_default()
+        return values[self.name]
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.name] = value
+        if self.update is not None:
+            self.update(instance, _module.context)
+
+
+class _StringProperty(_Property):
+    empty = ""
+
+
+class _IntProperty(_Property):
+    empty = 0
+
+
+class _FloatProperty(_Property):
+    empty = 0.0
+
+
+class _BoolProperty(_Property):
+    empty = False
+
+
+class _EnumProperty(_Property):
+    empty = ""
+
+
+class _PointerProperty(_Property):
+    def make_default(self):
+        # ID pointers (e.g. bpy.types.Object) start empty, property groups are created
+        if issubclass(self.type, ID):
+            return None
+        return self.type()
+
+
+class _CollectionProperty(_Property):
+    def make_default(self):
+        return Collection(self.type)
+
+
+class Collection(list):
+    """bpy_prop_collection stand-in for CollectionProperty values"""
+
+    def __init__(self, item_type=None, items=()):
+        super().__init__(items)
+        self.item_type = item_type
+
+    def add(self):
+        item = self.item_type()
+        self.append(item)
+        return item
+
+    def remove(self, index):
+        item = self.pop(index)
+        if isinstance(item, ID):
+            item.__class__ = RemovedID
+
+    def get(self, name, default=None):
+        for item in self:
+            if getattr(item, "name", None) == name:
+                return item
+        return default
+
+    def foreach_get(self, attribute, buffer):
+        offset = 0
+        for item in self:
+            values = getattr(item, attribute)
+            buffer[offset:offset + len(values)] = values
+            offset += len(values)
+
+    def foreach_set(self, attribute, buffer):
+        offset = 0
+        for item in self:
+            size = len(getattr(item, attribute))
+            setattr(item, attribute, [float(v) for v in buffer[offset:offset + size]])
+            offset += size
+
+
+# ---------------------------------------------------------------------------
+# Types
+
+
+class _StructMeta(type):
+    """Lets properties be added to a class after creation, like bpy.types.Scene.foo = ..."""
+
+    def __setattr__(cls, name, value):
+        if isinstance(value, _Property):
+            value.__set_name__(cls, name)
+        super().__setattr__(name, value)
+
+
+class bpy_struct(metaclass=_StructMeta):
+    pass
+
+
+class PropertyGroup(bpy_struct):
+    pass
+
+
+class ID(bpy_struct):
+    def __init__(self, name=""):
+        self.name = name
+
+
+class RemovedID:
+    """An ID removed from bpy.data: any attribute access raises, as in Blender"""
+
+    def __getattribute__(self, attribute):
+        if attribute == "__class__":
+            return object.__getattribute__(self, attribute)
+        raise ReferenceError("StructRNA of type Object has been removed")
+
+
+class _Vector(list):
+    """Mutable float vector that reports element writes to its owner"""
+
+    def __init__(self, values, owner, attribute):
+        super().__init__(float(v) for v in values)
+        self._owner = owner
+        self._attribute = attribute
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        if write_hook is not None:
+            write_hook(self._owner, self._attribute, self)
+
+
+class _VectorProperty:
+    def __init__(self, default):
+        self.default = default
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        values = instance.__dict__
+        if self.name not in values:
+            values[self.name] = _Vector(self.default, instance, self.name)
+        return values[self.name]
+
+    def __set__(self, instance, value):
+        vector = _Vector(value, instance, self.name)
+        instance.__dict__[self.name] = vector
+        if write_hook is not None:
+            write_hook(instance, self.name, vector)
+
+
+class KeyframePoints:
+    """Keyframe points of an F-Curve, stored as flat lists of (x, y) pairs and enum ints"""
+
+    # Enum values of new keys: BEZIER interpolation, AUTO easing, AUTO_CLAMPED handles
+    SETTING_DEFAULTS = {"interpolation": 2, "easing": 0, "handle_left_type": 4, "handle_right_type": 4}
+
+    def __init__(self):
+        self.clear()
+
+    def __len__(self):
+        return len(self.co) // 2
+
+    def add(self, count):
+        for attribute in ("co", "handle_left", "handle_right"):
+            getattr(self, attribute).extend([0.0, 0.0] * count)
+        for attribute, default in self.SETTING_DEFAULTS.items():
+            getattr(self, attribute).extend([default] * count)
+
+    def clear(self):
+        self.co = []
+        self.handle_left = []
+        self.handle_right = []
+        for attribute in self.SETTING_DEFAULTS:
+            setattr(self, attribute, [])
+
+    def foreach_get(self, attribute, buffer):
+        buffer[:] = getattr(self, attribute)
+
+    def foreach_set(self, attribute, buffer):
+        cast = int if attribute in self.SETTING_DEFAULTS else float
+        setattr(self, attribute, [cast(v) for v in buffer])
+
+
+class FCurve:
+    # FREE and ALIGNED handles keep their positions on update
+    MANUAL_HANDLES = (0, 3)
+
+    def __init__(self, data_path, index=0, group=None):
+        self.data_path = data_path
+        self.array_index = index
+        self.group = group
+        self.keyframe_points = KeyframePoints()
+
+    def update(self):
+        """Sort the keys and recalculate auto handles (a third of the way to each neighbour)"""
+        points = self.keyframe_points
+        count = len(points)
+        order = sorted(range(count), key=lambda i: (points.co[2 * i], points.co[2 * i + 1]))
+        for attribute in ("co", "handle_left", "handle_right"):
+            values = getattr(points, attribute)
+            setattr(points, attribute, [v for i in order for v in values[2 * i:2 * i + 2]])
+        for attribute in KeyframePoints.SETTING_DEFAULTS:
+            values = getattr(points, attribute)
+            setattr(points, attribute, [values[i] for i in order])
+
+        pairs = list(zip(points.co[::2], points.co[1::2]))
+        for i, (x, y) in enumerate(pairs):
+            previous = pairs[max(i - 1, 0)]
+            following = pairs[min(i + 1, len(pairs) - 1)]
+            span = following[0] - previous[0]
+            slope = (following[1] - previous[1]) / span if span else 0.0
+            left = (x - previous[0]) / 3.0
+            right = (following[0] - x) / 3.0
+            if points.handle_left_type[i] not in self.MANUAL_HANDLES:
+                points.handle_left[2 * i:2 * i + 2] = [x - left, y - slope * left]
+            if points.handle_right_type[i] not in self.MANUAL_HANDLES:
+                points.handle_right[2 * i:2 * i + 2] = [x + right, y + slope * right]
+
+
+class FCurves(list):
+    def find(self, data_path, index=0):
+        for fcurve in self:
+            if fcurve.data_path == data_path and fcurve.array_index == index:
+                return fcurve
+        return None
+
+    def new(self, data_path, index=0, action_group=None):
+        fcurve = FCurve(data_path, index, action_group)
+        self.append(fcurve)
+        return fcurve
+
+
+class Action(ID):
+    def __init__(self, name=""):
+        super().__init__(name)
+        self.fcurves = FCurves()
+
+
+class _Actions(list):
+    def new(self, name):
+        action = Action(name)
+        self.append(action)
+        return action
+
+
+class Object(ID):
+    location = _VectorProperty((0.0, 0.0, 0.0))
+    rotation_euler = _VectorProperty((0.0, 0.0, 0.0))
+    rotation_quaternion = _VectorProperty((1.0, 0.0, 0.0, 0.0))
+    scale = _VectorProperty((1.0, 1.0, 1.0))
+
+    _uids = itertools.count(1)
+
+    def __init__(self, name=""):
+        super().__init__(name)
+        self.session_uid = next(Object._uids)
+        self.rotation_mode = 'XYZ'
+        self.type = 'MESH'
+        self.pose = None
+        self._custom = {}
+        self.update_tags = 0
+        self.animation_data = None
+
+    def animation_data_create(self):
+        if self.animation_data is None:
+            self.animation_data = types.SimpleNamespace(action=None)
+        return self.animation_data
+
+    def __contains__(self, key):
+        return key in self._custom
+
+    def __getitem__(self, key):
+        return self._custom[key]
+
+    def __setitem__(self, key, value):
+        self._custom[key] = value
+
+    def update_tag(self, refresh=None):
+        self.update_tags += 1
+
+    def __repr__(self):
+        return f"<Object {self.name!r}>"
+
+
+class Scene(ID):
+    def __init__(self, name="Scene"):
+        super().__init__(name)
+        self.frame_current = 1
+        self.frame_start = 1
+        self.frame_end = 250
+        self.render = types.SimpleNamespace(fps=24, fps_base=1.0)
+
+
+class Operator(bpy_struct):
+    def report(self, level, message):
+        reports.append((level, message))
+
+
+class Panel(bpy_struct):
+    pass
+
+
+# ---------------------------------------------------------------------------
+# Timers and handlers
+
+
+class _Timers:
+    """bpy.app.timers stand-in, driven by run_timers()"""
+
+    def __init__(self):
+        self._heap = []
+        self._sequence = itertools.count()
+        self._registered = set()
+
+    def register(self, function, first_interval=0.0, persistent=False):
+        self._registered.add(function)
+        heapq.heappush(self._heap, (time.monotonic() + first_interval, next(self._sequence), function))
+        return function
+
+    def unregister(self, function):
+        self._registered.discard(function)
+
+    def is_registered(self, function):
+        return function in self._registered
+
+    def get_list(self):
+        return list(self._registered)
+
+    def run(self):
+        """Run every timer that is due, rescheduling those that return an interval"""
+        now = time.monotonic()
+        while self._heap and self._heap[0][0] <= now:
+            _, _, function = heapq.heappop(self._heap)
+            if function not in self._registered:
+                continue
+            interval = function()
+            if interval is None:
+                self._registered.discard(function)
+            elif function in self._registered:
+                heapq.heappush(self._heap, (now + interval, next(self._sequence), function))
+
+    def next_due(self):
+        return self._heap[0][0] if self._heap else None
+
+
+def persistent(function):
+    return function
+
+
+# ---------------------------------------------------------------------------
+# Operators
+
+
+class _OperatorCategory:
+    def __init__(self, name):
+        self._name = name
+
+    def __getattr__(self, name):
+        idname = f"{self._name}.{name}"
+
+        def call(*args, **kwargs):
+            cls = _operators.get(idname)
+            if cls is None:
+                return {'CANCELLED'}
+            operator = cls()
+            for key, value in kwargs.items():
+                setattr(operator, key, value)
+            return operator.execute(_module.context)
+
+        return call
+
+
+class _Ops:
+    def __getattr__(self, name):
+        return _OperatorCategory(name)
+
+
+_operators = {}
+
+
+def register_class(cls):
+    # Annotated properties become descriptors, as in Blender
+    for name, value in list(cls.__dict__.get("__annotations__", {}).items()):
+        if isinstance(value, _Property):
+            setattr(cls, name, value)
+    idname = getattr(cls, "bl_idname", None)
+    if idname and issubclass(cls, Operator):
+        _operators[idname] = cls
+
+
+def unregister_class(cls):
+    _operators.pop(getattr(cls, "bl_idname", None), None)
+
+
+# ---------------------------------------------------------------------------
+# Module assembly
+
+_module = None
+
+
+def run_timers():
+    """Run due timers, call this from the host's main loop"""
+    _module.app.timers.run()
+
+
+def install():
+    """Create the bpy stub and register it in sys.modules. Returns the module."""
+    global _module
+    if _module is not None:
+        return _module
+
+    bpy = types.ModuleType("bpy")
+
+    props = types.ModuleType("bpy.props")
+    props.StringProperty = _StringProperty
+    props.IntProperty = _IntProperty
+    props.FloatProperty = _FloatProperty
+    props.BoolProperty = _BoolProperty
+    props.EnumProperty = _EnumProperty
+    props.PointerProperty = _PointerProperty
+    props.CollectionProperty = _CollectionProperty
+
+    types_module = types.ModuleType("bpy.types")
+    for cls in (bpy_struct, PropertyGroup, ID, Action, FCurve, Object, Scene, Operator, Panel):
+        setattr(types_module, cls.__name__, cls)
+
+    app = types.ModuleType("bpy.app")
+    app.timers = _Timers()
+    app.driver_namespace = {}
+    app.version = (4, 3, 0)
+    handlers = types.ModuleType("bpy.app.handlers")
+    handlers.persistent = persistent
+    for name in ("load_post", "undo_post", "redo_post", "frame_change_pre", "frame_change_post",
+                 "render_init", "render_complete", "render_cancel", "depsgraph_update_post"):
+        setattr(handlers, name, [])
+    app.handlers = handlers
+
+    utils = types.ModuleType("bpy.utils")
+    utils.register_class = register_class
+    utils.unregister_class = unregister_class
+
+    path = types.ModuleType("bpy.path")
+    path.abspath = lambda p: p[2:] if p.startswith("//") else p
+
+    scene = Scene()
+    bpy.data = types.SimpleNamespace(
+        objects=Collection(Object),
+        scenes=Collection(Scene, [scene]),
+        actions=_Actions(),
+    )
+    bpy.context = types.SimpleNamespace(
+        scene=scene,
+        screen=types.SimpleNamespace(is_animation_playing=False),
+        window=None,
+        window_manager=types.SimpleNamespace(windows=[]),  # Headless, like blender -b
+    )
+
+    bpy.props = props
+    bpy.types = types_module
+    bpy.app = app
+    bpy.utils = utils
+    bpy.path = path
+    bpy.ops = _Ops()
+
+    sys.modules.update({
+        "bpy": bpy,
+        "bpy.props": props,
+        "bpy.types": types_module,
+        "bpy.app": app,
+        "bpy.app.handlers": handlers,
+        "bpy.app.timers": app.timers,
+        "bpy.utils": utils,
+        "bpy.path": path,
+    })
+    _module = bpy
+    return bpy
+
+
+def new_object(name):
+    """Create an object and link it into bpy.data.objects"""
+    obj = Object(name)
+    _module.data.objects.append(obj)
+    return obj
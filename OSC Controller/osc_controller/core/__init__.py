@@ -1,26 +1,51 @@
 import bpy
 from . import property_groups
+from . import routing
+from . import apply_queue
 from . import osc_server
+from . import debug_snapshot
 from . import driver_functions
 from . import recording
+from . import post_process
+from . import background_render
 from . import utils
 
 def register():
     # Register property groups first
     property_groups.register()
     
+    # Keep the address routing table in sync with the mappings
+    routing.register()
+    
     # Register OSC server functionality
     osc_server.register()
     
+    # Refresh the debug panel at the snapshot rate
+    debug_snapshot.register()
+    
+    # Start the main-thread apply queue drain
+    apply_queue.register()
+    
     # Register driver functions
     driver_functions.register()
     
     # Register recording functionality
     recording.register()
     
+    # Register post-recording processing
+    post_process.register()
+    
+    # Register background rendering
+    background_render.register()
+    
 def unregister():
     # Unregister in reverse order
+    background_render.unregister()
+    post_process.unregister()
     recording.unregister()
     driver_functions.unregister()
+    apply_queue.unregister()
+    debug_snapshot.unregister()
     osc_server.unregister()
+    routing.unregister()
     property_groups.unregister()
\ No newline at end of file
@@ -0,0 +1,185 @@
+import bpy
+import threading
+import time
+from bpy.app import timers
+from . import utils
+from . import metrics
+from . import smoothing
+from . import recording
+
+# How often the main-thread drain timer runs (in seconds)
+DRAIN_INTERVAL = 0.01
+
+# Maximum number of distinct pending keys before new keys are dropped
+MAX_PENDING_KEYS = 4096
+
+class ApplyQueue:
+    """
+    Thread-safe, latest-value-wins queue of pending property writes.
+
+    The network thread pushes values keyed by (object, property type, custom
+    property name) together with their monotonic receive time. Pushing a key
+    that is already pending overwrites its value, so the main thread only ever
+    applies the newest value per key.
+    """
+
+    def __init__(self, max_pending=MAX_PENDING_KEYS):
+        self._lock = threading.Lock()
+        self._pending = {}
+        self.max_pending = max_pending
+        self.coalesced = 0  # Updates overwritten before they were applied
+        self.dropped = 0  # Updates rejected because the queue was full
+
+    def __len__(self):
+        return len(self._pending)
+
+    def push(self, key, value, received_at=None):
+        """
+        Queue a value for a key, replacing any pending value for the same key.
+
+        Args:
+            key: (object, property type, custom property name)
+            value: The mapped value to apply
+            received_at: time.monotonic() when the message arrived, for latency metrics
+        """
+        with self._lock:
+            if key in self._pending:
+                self.coalesced += 1
+            elif len(self._pending) >= self.max_pending:
+                self.dropped += 1
+                return False
+            self._pending[key] = (value, received_at)
+        return True
+
+    def take(self):
+        """
+        Swap out all pending updates.
+
+        Returns:
+            Tuple of (pending dict of key -> (value, received_at), coalesced count,
+            dropped count) since the last take
+        """
+        with self._lock:
+            pending = self._pending
+            coalesced = self.coalesced
+            dropped = self.dropped
+            self._pending = {}
+            self.coalesced = 0
+            self.dropped = 0
+        return pending, coalesced, dropped
+
+    def clear(self):
+        """Discard all pending updates and counters"""
+        self.take()
+
+# Global queue shared by the network thread and the drain timer
+update_queue = ApplyQueue()
+
+# Set while a render is running. Values stay queued, latest per key, and are
+# applied in one drain once the hold is released.
+hold_updates = False
+
+def hold():
+    """Stop applying values to the scene, e.g. while a render reads it"""
+    global hold_updates
+    hold_updates = True
+
+def release():
+    """Apply the values buffered during the hold on the next drain"""
+    global hold_updates
+    hold_updates = False
+
+def drain_apply_queue():
+    """Apply the newest pending value per key. Runs on the main thread."""
+    # The timer must always return its interval: Blender unregisters a timer
+    # that raises, and no OSC values would be applied from then on
+    try:
+        apply_pending()
+    except Exception as e:
+        print(f"OSC Controller: Error applying OSC values: {str(e)}")
+    return DRAIN_INTERVAL
+
+def apply_pending():
+    """Take the pending updates, smooth them and write them to the scene"""
+    depth = len(update_queue)
+    if hold_updates:
+        metrics.record_drain(depth, 0, 0, 0, 0, 0.0)
+        return
+    
+    pending, coalesced, dropped = update_queue.take()
+
+    start = time.perf_counter()
+    writes = 0
+    if pending:
+        # Objects deleted while their values were queued are dropped before
+        # anything reads them
+        updates = [(key, value) for key, (value, _) in pending.items() if utils.object_alive(key[0])]
+        updates = smooth_updates(updates)
+        
+        # Components of the same object and channel are written together
+        writes = utils.apply_property_batch(updates)
+
+        # Receive-to-apply latency of the values that made it to the scene
+        applied_at = time.monotonic()
+        newest = None
+        for _, received_at in pending.values():
+            if received_at is not None:
+                metrics.latency.record((applied_at - received_at) * 1000.0)
+                if newest is None or received_at > newest:
+                    newest = received_at
+        
+        # The scene now holds the values received up to the newest timestamp
+        if recording.is_recording:
+            recording.on_values_applied(newest if newest is not None else applied_at)
+
+    metrics.record_drain(depth, len(pending), writes, coalesced, dropped,
+                         time.perf_counter() - start)
+
+def smooth_updates(updates):
+    """Run a tick's updates through the live smoothing bank as one batch"""
+    scene = bpy.context.scene
+    if scene is None or not scene.osc_settings.enable_smoothing:
+        return updates
+
+    smoothing.live_bank.configure(scene.osc_settings)
+    
+    # Vector values are smoothed per component
+    keys = []
+    values = []
+    for (obj, prop_type, custom_name), value in updates:
+        if isinstance(value, tuple):
+            for index, component in enumerate(value):
+                keys.append(smoothing.channel_key(obj, (prop_type, custom_name, index)))
+                values.append(component)
+        else:
+            keys.append(smoothing.channel_key(obj, (prop_type, custom_name)))
+            values.append(value)
+    
+    smoothed = smoothing.live_bank.process(keys, values, time.monotonic()).tolist()
+    
+    result = []
+    position = 0
+    for key, value in updates:
+        if isinstance(value, tuple):
+            size = len(value)
+            result.append((key, tuple(smoothed[position:position + size])))
+            position += size
+        else:
+            result.append((key, smoothed[position]))
+            position += 1
+    return result
+
+def register():
+    """Start the persistent main-thread drain timer"""
+    release()
+    update_queue.clear()
+    metrics.reset()
+    smoothing.live_bank.reset()
+    if not timers.is_registered(drain_apply_queue):
+        timers.register(drain_apply_queue, first_interval=DRAIN_INTERVAL, persistent=True)
+
+def unregister():
+    """Stop the drain timer and discard pending updates"""
+    if timers.is_registered(drain_apply_queue):
+        timers.unregister(drain_apply_queue)
+    update_queue.clear()
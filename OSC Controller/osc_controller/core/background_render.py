@@ -0,0 +1,264 @@
+import collections
+import itertools
+import os
+import subprocess
+import tempfile
+import time
+import bpy
+from bpy.app import timers
+from bpy.app.handlers import persistent
+from . import routing
+from . import utils
+
+# How often the queue starts jobs and collects finished renders (in seconds)
+POLL_INTERVAL = 0.5
+
+class RenderJob:
+    """One queued render of a snapshot of the scene"""
+
+    def __init__(self, job_id, scene, signature):
+        self.job_id = job_id
+        self.scene_name = scene.name
+        self.frame = scene.frame_current
+        self.signature = signature
+        self.triggers = 1  # Triggers coalesced into this job
+        self.queued_at = time.monotonic()
+        self.started_at = None
+        self.process = None
+        self.log = None
+
+        # Snapshot the current state, including values applied from OSC
+        self.copy_path = os.path.join(tempfile.gettempdir(), f"osc_render_{os.getpid()}_{job_id}.blend")
+        bpy.ops.wm.save_as_mainfile(filepath=self.copy_path, copy=True)
+
+        # One output file per job. The path is resolved here, relative paths
+        # would resolve next to the copy.
+        base = bpy.path.abspath(scene.render.filepath).replace("#", "")
+        self.output_pattern = f"{base}job{job_id:04d}_####"
+        self.output_path = f"{base}job{job_id:04d}_{self.frame:04d}{scene.render.file_extension}"
+
+    def start(self):
+        """Start the headless Blender process rendering this job"""
+        command = [
+            bpy.app.binary_path, "-b", self.copy_path,
+            "-S", self.scene_name,
+            "-o", self.output_pattern,
+            "-f", str(self.frame),
+        ]
+        # Log to a file, a pipe nobody reads could fill up and stall the render
+        self.log = open(self.copy_path + ".log", "wb")
+        self.process = subprocess.Popen(command, stdout=self.log, stderr=subprocess.STDOUT)
+        self.started_at = time.monotonic()
+
+    def cleanup(self, keep_log=False):
+        """Remove the snapshot, and the log unless it is kept for inspection"""
+        if self.log is not None:
+            self.log.close()
+        paths = [self.copy_path]
+        if not keep_log:
+            paths.append(self.copy_path + ".log")
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+# Jobs waiting for a worker, oldest first
+pending = collections.deque()
+
+# Jobs being rendered by a worker process
+running = []
+
+# (job id, output path, seconds, return code) of the last finished job
+last_result = None
+
+_job_ids = itertools.count(1)
+
+# Reply client, recreated when the reply address changes
+_reply_client = None
+_reply_address = None
+
+# Counts scene changes that OSC mappings don't explain, such as edits in the
+# UI. Only counted while jobs are waiting, the only time it is compared.
+scene_edits = 0
+
+# Routing table the mapped target set was collected from, and the set
+_targets_table = None
+_targets = frozenset()
+
+# Transform attributes of mapped objects and pose bones that renders depend on
+STATE_ATTRIBUTES = ("location", "rotation_euler", "rotation_quaternion", "scale")
+
+def mapped_targets():
+    """Objects written by OSC mappings and bone streams"""
+    global _targets_table, _targets
+    table = routing.routing_table
+    if table is not _targets_table:
+        _targets = frozenset(record.target_object for records in table.values() for record in records)
+        _targets_table = table
+    return _targets
+
+def mapped_state():
+    """Current transforms and custom properties of everything OSC writes to"""
+    state = []
+    for records in routing.routing_table.values():
+        for record in records:
+            obj = record.target_object
+            if record.property_type == 'custom_property' and utils.object_alive(obj):
+                name = record.custom_property_name
+                state.append((obj.name, name, obj[name] if name in obj else None))
+    for obj in mapped_targets():
+        if not utils.object_alive(obj):
+            continue
+        state.append((obj.name, tuple(v for attribute in STATE_ATTRIBUTES for v in getattr(obj, attribute))))
+        if obj.pose is not None:
+            for pose_bone in obj.pose.bones:
+                state.append((obj.name, pose_bone.name,
+                              tuple(v for attribute in STATE_ATTRIBUTES for v in getattr(pose_bone, attribute))))
+    # Sorted by name, the target set has no stable order across table rebuilds
+    return tuple(sorted(state, key=lambda entry: entry[:-1]))
+
+def state_signature(scene):
+    """
+    Identify a trigger by what the render depends on, for coalescing.
+
+    Covers the frame, the current values of everything OSC mappings write
+    to and the count of other scene edits. OSC traffic that no mapping
+    routes to the scene doesn't change the signature.
+    """
+    return (scene.name, scene.frame_current, scene_edits, mapped_state())
+
+@persistent
+def render_edit_handler(scene, depsgraph=None):
+    """Count scene updates that aren't OSC values written to mapped targets"""
+    global scene_edits
+    if not pending:
+        return
+    if depsgraph is None:
+        scene_edits += 1
+        return
+    targets = mapped_targets()
+    for update in depsgraph.updates:
+        target = update.id.original
+        if isinstance(target, bpy.types.Scene):
+            continue
+        if target in targets and not update.is_updated_geometry and not update.is_updated_shading:
+            continue  # Transforms and properties of mapped targets are in the signature
+        scene_edits += 1
+        return
+
+def submit(scene):
+    """
+    Queue a render of the current frame of a snapshot of the scene.
+
+    A trigger with the same signature as a job that is still waiting for a
+    worker is coalesced into that job, see state_signature().
+
+    Args:
+        scene: Scene to render
+
+    Returns:
+        The new or coalesced RenderJob
+    """
+    signature = state_signature(scene)
+    for job in pending:
+        if job.signature == signature:
+            job.triggers += 1
+            send_reply("/render/coalesced", job.job_id, job.triggers)
+            return job
+
+    job = RenderJob(next(_job_ids), scene, signature)
+    pending.append(job)
+    print(f"OSC Controller: Queued render job {job.job_id} (frame {job.frame})")
+    send_reply("/render/queued", job.job_id, len(pending), len(running))
+
+    if not timers.is_registered(poll_background_renders):
+        timers.register(poll_background_renders, first_interval=0.0)
+    return job
+
+def worker_count():
+    """Number of renders allowed to run at once"""
+    try:
+        return max(1, bpy.context.scene.osc_settings.render_workers)
+    except AttributeError:
+        return 1
+
+def poll_background_renders():
+    """Collect finished renders, start queued jobs on free workers and report progress"""
+    global last_result
+
+    for job in list(running):
+        code = job.process.poll()
+        if code is None:
+            continue
+        running.remove(job)
+        seconds = time.monotonic() - job.started_at
+        last_result = (job.job_id, job.output_path, seconds, code)
+        job.cleanup(keep_log=code != 0)
+        if code == 0:
+            print(f"OSC Controller: Render job {job.job_id} finished in {seconds:.1f}s ({job.output_path})")
+            send_reply("/render/done", job.job_id, float(seconds), job.output_path)
+        else:
+            print(f"OSC Controller: Render job {job.job_id} failed with code {code}, see {job.log.name}")
+            send_reply("/render/failed", job.job_id, code, job.log.name)
+        send_reply("/render/queue", len(pending), len(running))
+
+    while pending and len(running) < worker_count():
+        job = pending.popleft()
+        try:
+            job.start()
+        except OSError as e:
+            print(f"OSC Controller: Could not start render job {job.job_id}: {e}")
+            job.cleanup()
+            send_reply("/render/failed", job.job_id, -1, str(e))
+            continue
+        running.append(job)
+        print(f"OSC Controller: Rendering job {job.job_id} in background process {job.process.pid}")
+        send_reply("/render/started", job.job_id, float(job.started_at - job.queued_at))
+        send_reply("/render/queue", len(pending), len(running))
+
+    return POLL_INTERVAL if pending or running else None
+
+def send_reply(address, *args):
+    """Send a render status message to the reply address, if replies are enabled"""
+    global _reply_client, _reply_address
+
+    try:
+        settings = bpy.context.scene.osc_settings
+        if not settings.render_reply_enabled:
+            return
+        target = (settings.render_reply_host, settings.render_reply_port)
+        if _reply_client is None or _reply_address != target:
+            from pythonosc.udp_client import SimpleUDPClient
+            _reply_client = SimpleUDPClient(*target)
+            _reply_address = target
+        _reply_client.send_message(address, list(args))
+    except Exception as e:
+        print(f"OSC Controller: Error sending render reply: {str(e)}")
+
+def cancel_pending():
+    """Drop queued jobs that have not started. Returns how many were dropped."""
+    count = len(pending)
+    while pending:
+        pending.popleft().cleanup()
+    if count:
+        send_reply("/render/queue", 0, len(running))
+    return count
+
+def register():
+    """Register background render functionality"""
+    # The queue timer runs only while jobs are queued or running
+    if render_edit_handler not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(render_edit_handler)
+
+def unregister():
+    """Stop polling and drop queued jobs, running renders are left to finish on their own"""
+    global _reply_client, _reply_address
+
+    if timers.is_registered(poll_background_renders):
+        timers.unregister(poll_background_renders)
+    if render_edit_handler in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(render_edit_handler)
+    cancel_pending()
+    _reply_client = None
+    _reply_address = None
@@ -0,0 +1,240 @@
+"""
+Capture and replay of raw OSC traffic.
+
+A capture file is an 8 byte magic header followed by append-only records:
+
+    float64  monotonic receive time (seconds, little-endian)
+    uint32   datagram length (little-endian)
+    bytes    datagram
+
+Files are read through mmap, so multi-gigabyte captures replay without being
+loaded into memory. This module doesn't import bpy and can be run on its own
+to replay a capture into a running OSC Controller:
+
+    python capture.py traffic.osccap --host 127.0.0.1 --port 9001 --speed 2
+"""
+
+import argparse
+import mmap
+import socket
+import struct
+import threading
+import time
+
+CAPTURE_MAGIC = b"OSCCAP01"
+RECORD_HEADER = struct.Struct("<dI")
+
+# Client address reported to handlers for packets replayed into a dispatcher
+REPLAY_CLIENT_ADDRESS = ("replay", 0)
+
+# Writer that receives a copy of every packet, None when not capturing
+active_writer = None
+
+# Background replay state
+replay_thread = None
+replay_stop_event = threading.Event()
+last_replay_result = None
+
+class CaptureWriter:
+    """
+    Append-only writer for capture files. Safe to call from any thread.
+
+    Raises FileExistsError rather than replacing an existing file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "xb")
+        self._file.write(CAPTURE_MAGIC)
+        self.records = 0
+        self.bytes_written = len(CAPTURE_MAGIC)
+
+    def write(self, data, received_at=None):
+        """Append one datagram with its monotonic receive time"""
+        if received_at is None:
+            received_at = time.monotonic()
+        header = RECORD_HEADER.pack(received_at, len(data))
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(header)
+            self._file.write(data)
+            self.records += 1
+            self.bytes_written += RECORD_HEADER.size + len(data)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+class CaptureDispatcher:
+    """
+    Wraps a python-osc dispatcher and copies every packet to the active capture
+    writer before dispatching it.
+
+    All receive engines hand packets to call_handlers_for_packet (or its async
+    variant for TCP), so this is the one place every datagram passes through.
+    With no active writer the overhead is a single global lookup.
+    """
+
+    def __init__(self, dispatcher):
+        self.dispatcher = dispatcher
+
+    def call_handlers_for_packet(self, data, client_address):
+        writer = active_writer
+        if writer is not None:
+            writer.write(data)
+        return self.dispatcher.call_handlers_for_packet(data, client_address)
+
+    async def async_call_handlers_for_packet(self, data, client_address):
+        writer = active_writer
+        if writer is not None:
+            writer.write(data)
+        return await self.dispatcher.async_call_handlers_for_packet(data, client_address)
+
+    def __getattr__(self, name):
+        # Everything else (map, set_scheduler, ...) goes to the real dispatcher
+        return getattr(self.dispatcher, name)
+
+def start_capture(path):
+    """Start copying received packets to a new capture file"""
+    global active_writer
+    stop_capture()
+    active_writer = CaptureWriter(path)
+    return active_writer
+
+def stop_capture():
+    """
+    Stop capturing and close the file.
+
+    Returns:
+        The writer that was active, or None
+    """
+    global active_writer
+    writer = active_writer
+    active_writer = None
+    if writer is not None:
+        writer.close()
+    return writer
+
+def iter_capture(path):
+    """
+    Yield (receive time, datagram) tuples from a capture file.
+
+    Raises:
+        ValueError if the file is not a capture file
+    """
+    with open(path, "rb") as f:
+        if f.read(len(CAPTURE_MAGIC)) != CAPTURE_MAGIC:
+            raise ValueError(f"{path} is not an OSC capture file")
+        f.seek(0, 2)
+        if f.tell() == len(CAPTURE_MAGIC):
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            size = len(mapped)
+            offset = len(CAPTURE_MAGIC)
+            while offset + RECORD_HEADER.size <= size:
+                received_at, length = RECORD_HEADER.unpack_from(mapped, offset)
+                offset += RECORD_HEADER.size
+                if offset + length > size:
+                    break  # Truncated last record, e.g. Blender was killed mid-capture
+                yield received_at, mapped[offset:offset + length]
+                offset += length
+
+def replay(path, target, speed=1.0, stop_event=None):
+    """
+    Feed a capture file into a dispatcher or a UDP address.
+
+    Args:
+        path: Capture file to replay
+        target: A dispatcher (anything with call_handlers_for_packet) or a
+                (host, port) tuple to send UDP datagrams to
+        speed: Playback speed relative to the original timing, 0 replays as fast as possible
+        stop_event: Optional threading.Event that aborts the replay when set
+
+    Returns:
+        Dictionary with the number of packets replayed and the elapsed time
+    """
+    sock = None
+    if isinstance(target, tuple):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        address = target
+        send = lambda data: sock.sendto(data, address)
+    else:
+        send = lambda data: target.call_handlers_for_packet(data, REPLAY_CLIENT_ADDRESS)
+
+    packets = 0
+    first_time = None
+    start = time.monotonic()
+    try:
+        for received_at, data in iter_capture(path):
+            if stop_event is not None and stop_event.is_set():
+                break
+            if first_time is None:
+                first_time = received_at
+            if speed > 0:
+                delay = start + (received_at - first_time) / speed - time.monotonic()
+                if delay > 0:
+                    # Wait on the stop event so long gaps can be interrupted
+                    if stop_event is not None:
+                        if stop_event.wait(delay):
+                            break
+                    else:
+                        time.sleep(delay)
+            try:
+                send(data)
+            except Exception as e:
+                print(f"OSC Controller: Error replaying packet: {str(e)}")
+            packets += 1
+    finally:
+        if sock is not None:
+            sock.close()
+
+    return {"packets": packets, "elapsed": time.monotonic() - start}
+
+def start_replay(path, target, speed=1.0):
+    """Replay a capture file on a background thread, see replay()"""
+    global replay_thread
+    stop_replay()
+    replay_stop_event.clear()
+
+    def run():
+        global last_replay_result
+        try:
+            last_replay_result = replay(path, target, speed, replay_stop_event)
+            print(f"OSC Controller: Replayed {last_replay_result['packets']} packets "
+                  f"in {last_replay_result['elapsed']:.2f} s")
+        except Exception as e:
+            print(f"OSC Controller: Error replaying capture: {str(e)}")
+
+    replay_thread = threading.Thread(target=run, daemon=True)
+    replay_thread.start()
+
+def is_replaying():
+    return replay_thread is not None and replay_thread.is_alive()
+
+def stop_replay():
+    """Abort a running background replay and wait for it to finish"""
+    global replay_thread
+    if replay_thread is not None:
+        replay_stop_event.set()
+        replay_thread.join()
+        replay_thread = None
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay an OSC capture file over UDP")
+    parser.add_argument("path", help="Capture file")
+    parser.add_argument("--host", default="127.0.0.1", help="Destination host")
+    parser.add_argument("--port", type=int, default=9001, help="Destination port")
+    parser.add_argument("--speed", type=float, default=1.0, help="Playback speed, 0 = as fast as possible")
+    args = parser.parse_args()
+
+    result = replay(args.path, (args.host, args.port), args.speed)
+    rate = result["packets"] / result["elapsed"] if result["elapsed"] else 0.0
+    print(f"Replayed {result['packets']} packets in {result['elapsed']:.2f} s ({rate:,.0f} packets/s)")
+
+if __name__ == "__main__":
+    main()
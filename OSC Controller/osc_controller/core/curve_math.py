@@ -0,0 +1,467 @@
+import numpy as np
+
+# Gaussian kernels are cut off at this many standard deviations
+KERNEL_RADIUS_SIGMAS = 3.0
+
+def pack_curves(curves):
+    """
+    Pack curves of different lengths into one padded matrix.
+
+    Args:
+        curves: Sequence of 1-D arrays
+
+    Returns:
+        Tuple of (float64 matrix of shape (curves, longest), bool mask of valid entries)
+    """
+    lengths = np.array([len(curve) for curve in curves], dtype=np.intp)
+    width = int(lengths.max()) if len(lengths) else 0
+    matrix = np.zeros((len(curves), width), dtype=np.float64)
+    mask = np.arange(width) < lengths[:, None]
+    for row, curve in enumerate(curves):
+        matrix[row, :len(curve)] = curve
+    return matrix, mask
+
+def unpack_curves(matrix, mask):
+    """Split a padded matrix back into one 1-D array per row"""
+    return [row[valid] for row, valid in zip(matrix, mask)]
+
+def gaussian_sigma(smooth_factor):
+    """Standard deviation, in frames, for a post-smoothing factor"""
+    return float(smooth_factor)
+
+def gaussian_smooth(frames, matrix, mask, sigma):
+    """
+    Gaussian-smooth every row of a padded curve matrix at once.
+
+    Keys are weighted by their distance in frames, not by their position in
+    the curve, so the result doesn't depend on how densely a curve is keyed
+    and gaps between keys are respected. Keys further than
+    KERNEL_RADIUS_SIGMAS standard deviations away don't contribute.
+
+    Only valid entries contribute, and each output is divided by the kernel
+    weight that actually fell on valid entries, so curve ends are not pulled
+    toward zero.
+
+    Args:
+        frames: (curves, keys) key frames, padded like matrix
+        matrix: (curves, keys) values, padded
+        mask: Bool mask of valid entries
+        sigma: Kernel standard deviation in frames
+
+    Returns:
+        Smoothed matrix, padding left at zero
+    """
+    width = matrix.shape[1]
+    reach = KERNEL_RADIUS_SIGMAS * sigma
+    values = np.where(mask, matrix, 0.0)
+    if width < 2:
+        return values
+
+    # Enough neighbouring keys to cover the reach on the most densely keyed curve
+    spacing = np.diff(frames, axis=1)[mask[:, 1:]]
+    spacing = spacing[spacing > 0]
+    closest = spacing.min() if len(spacing) else 1.0
+    radius = int(min(width - 1, max(1, np.ceil(reach / closest))))
+
+    padded_frames = np.pad(frames, ((0, 0), (radius, radius)))
+    padded_values = np.pad(values, ((0, 0), (radius, radius)))
+    padded_mask = np.pad(mask, ((0, 0), (radius, radius)))
+
+    # One vectorized multiply-add per key offset over all curves
+    total = np.zeros_like(values)
+    norm = np.zeros_like(values)
+    for tap in range(2 * radius + 1):
+        distance = padded_frames[:, tap:tap + width] - frames
+        weight = np.exp(-0.5 * (distance / sigma) ** 2)
+        weight[~padded_mask[:, tap:tap + width] | (np.abs(distance) > reach)] = 0.0
+        total += weight * padded_values[:, tap:tap + width]
+        norm += weight
+
+    smoothed = np.divide(total, norm, out=np.zeros_like(total), where=norm > 0)
+    return np.where(mask, smoothed, 0.0)
+
+# Hampel filter window half-width and MAD multiplier
+HAMPEL_HALF_WINDOW = 2
+HAMPEL_SIGMAS = 3.0
+
+# Scales the median absolute deviation to a standard deviation for normal noise
+MAD_SCALE = 1.4826
+
+def hampel_outliers(values, threshold, half_window=HAMPEL_HALF_WINDOW, n_sigmas=HAMPEL_SIGMAS):
+    """
+    Find jitter outliers with a rolling median / MAD (Hampel) test.
+
+    A key is an outlier when its distance from the median of its window is
+    more than n_sigmas robust standard deviations and more than threshold
+    times the window's value range. The first and last half_window keys are
+    never flagged.
+
+    Args:
+        values: 1-D array of key values ordered by frame
+        threshold: Minimum deviation relative to the local range (smaller = more aggressive)
+
+    Returns:
+        Bool array marking the outliers
+    """
+    values = np.asarray(values, dtype=np.float64)
+    outliers = np.zeros(len(values), dtype=bool)
+    size = 2 * half_window + 1
+    if len(values) < size:
+        return outliers
+
+    windows = np.lib.stride_tricks.sliding_window_view(values, size)
+    median = np.median(windows, axis=1)
+    mad = np.median(np.abs(windows - median[:, None]), axis=1)
+    local_range = np.ptp(windows, axis=1)
+    local_range[local_range == 0] = 0.0001  # Avoid division by zero
+
+    centre = values[half_window:len(values) - half_window]
+    deviation = np.abs(centre - median)
+    outliers[half_window:len(values) - half_window] = (
+        (deviation > n_sigmas * MAD_SCALE * mad)
+        & (deviation / local_range > threshold)
+    )
+    return outliers
+
+# Consecutive keys closer than this count as identical
+DUPLICATE_EPSILON = 0.0001
+
+# Newton iterations used to invert a Bezier segment's frame curve
+BEZIER_NEWTON_STEPS = 12
+
+def duplicate_run_interiors(values, epsilon=DUPLICATE_EPSILON):
+    """
+    Mark the inner keys of runs of identical values.
+
+    The first and last key of each run are kept, so the curve keeps its
+    shape while the redundant keys in between can be dropped.
+
+    Returns:
+        Bool array marking the keys to remove
+    """
+    values = np.asarray(values, dtype=np.float64)
+    interiors = np.zeros(len(values), dtype=bool)
+    if len(values) < 3:
+        return interiors
+    same = np.abs(np.diff(values)) < epsilon
+    interiors[1:-1] = same[:-1] & same[1:]
+    return interiors
+
+def gap_frames(frames, max_gap):
+    """
+    Whole frames missing between consecutive keys.
+
+    Only gaps of at most max_gap frames are filled.
+
+    Returns:
+        Tuple of (segment index of each missing frame, missing frames)
+    """
+    frames = np.asarray(frames, dtype=np.float64)
+    if len(frames) < 2:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float64)
+
+    first = np.floor(frames[:-1]) + 1
+    last = np.ceil(frames[1:]) - 1
+    counts = (last - first + 1).astype(np.intp)
+    counts[(frames[1:] - frames[:-1]) > max_gap] = 0
+    counts = np.maximum(counts, 0)
+
+    segments = np.repeat(np.arange(len(counts)), counts)
+    starts = np.cumsum(counts) - counts
+    offsets = np.arange(counts.sum()) - np.repeat(starts, counts)
+    return segments, first[segments] + offsets
+
+def smoothstep_values(frames, values, segments, missing):
+    """Ease between the keys around each missing frame with 3t^2 - 2t^3"""
+    f0 = frames[segments]
+    f1 = frames[segments + 1]
+    v0 = values[segments]
+    v1 = values[segments + 1]
+    t = (missing - f0) / (f1 - f0)
+    return v0 + (v1 - v0) * (3 * t ** 2 - 2 * t ** 3)
+
+def bezier_values(frames, values, handles_left, handles_right, segments, missing):
+    """
+    Evaluate the cubic Bezier segments of a curve at the missing frames.
+
+    Each segment runs from key i through its right handle and the left handle
+    of key i + 1 to key i + 1, as Blender evaluates it. The curve parameter
+    for a frame is found with a few clamped Newton steps on the frame cubic.
+
+    Args:
+        handles_left, handles_right: (keys, 2) arrays of handle positions
+    """
+    x0 = frames[segments]
+    x1 = handles_right[segments, 0]
+    x2 = handles_left[segments + 1, 0]
+    x3 = frames[segments + 1]
+    y0 = values[segments]
+    y1 = handles_right[segments, 1]
+    y2 = handles_left[segments + 1, 1]
+    y3 = values[segments + 1]
+
+    # Cubic coefficients of x(t) = ((a t + b) t + c) t + x0
+    cx = 3 * (x1 - x0)
+    bx = 3 * (x2 - x1) - cx
+    ax = x3 - x0 - cx - bx
+
+    t = (missing - x0) / (x3 - x0)
+    for _ in range(BEZIER_NEWTON_STEPS):
+        x = ((ax * t + bx) * t + cx) * t + x0
+        dx = (3 * ax * t + 2 * bx) * t + cx
+        step = np.divide(x - missing, dx, out=np.zeros_like(t), where=np.abs(dx) > 1e-12)
+        t = np.clip(t - step, 0.0, 1.0)
+
+    u = 1 - t
+    return u ** 3 * y0 + 3 * u ** 2 * t * y1 + 3 * u * t ** 2 * y2 + t ** 3 * y3
+
+def fill_gaps(frames, values, max_gap, method='smoothstep', handles_left=None, handles_right=None):
+    """
+    Add keys on every whole frame missing in gaps of at most max_gap frames.
+
+    Args:
+        frames, values: Key positions ordered by frame
+        method: 'smoothstep' or 'bezier' (needs the key handles)
+
+    Returns:
+        Tuple of (frames, values, number of keys added), ordered by frame
+    """
+    frames = np.asarray(frames, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    segments, missing = gap_frames(frames, max_gap)
+    if not len(missing):
+        return frames, values, 0
+
+    if method == 'bezier' and handles_left is not None and handles_right is not None:
+        added = bezier_values(frames, values, handles_left, handles_right, segments, missing)
+    else:
+        added = smoothstep_values(frames, values, segments, missing)
+
+    all_frames = np.concatenate((frames, missing))
+    all_values = np.concatenate((values, added))
+    order = np.argsort(all_frames, kind="stable")
+    return all_frames[order], all_values[order], len(missing)
+
+def decimate(frames, values, tolerance):
+    """
+    Ramer-Douglas-Peucker simplification of a keyframe curve.
+
+    Runs level by level: every pass measures the value error of the keys still
+    in play against the straight line between the kept keys around them, and
+    keeps the worst key of each segment whose error exceeds the tolerance.
+    Keys of segments that are already within tolerance drop out of later
+    passes, and each pass is a few vectorized operations over the keys still
+    in play. The tolerance bounds straight lines between the kept keys, see
+    decimated_segments().
+
+    Args:
+        frames, values: Key positions ordered by frame
+        tolerance: Largest allowed value error of a dropped key
+
+    Returns:
+        Bool array marking the keys to keep
+    """
+    frames = np.asarray(frames, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    count = len(frames)
+    keep = np.zeros(count, dtype=bool)
+    if count <= 2:
+        keep[:] = True
+        return keep
+    keep[0] = keep[-1] = True
+
+    # Keys still in play, with the kept keys around each of them
+    active = np.arange(1, count - 1)
+    start = np.zeros(len(active), dtype=np.intp)
+    end = np.full(len(active), count - 1, dtype=np.intp)
+    while len(active):
+        span = frames[end] - frames[start]
+        t = np.divide(frames[active] - frames[start], span, out=np.zeros(len(active)), where=span != 0)
+        error = np.abs(values[active] - (values[start] + t * (values[end] - values[start])))
+
+        # The active keys of a segment are contiguous and share its start key
+        group_starts = np.flatnonzero(np.r_[True, start[1:] != start[:-1]])
+        group_sizes = np.diff(np.r_[group_starts, len(active)])
+        worst = np.maximum.reduceat(error, group_starts)
+        split = worst > tolerance
+        if not split.any():
+            break
+
+        # Worst key of every segment, the first of any ties
+        group = np.repeat(np.arange(len(group_starts)), group_sizes)
+        candidates = np.flatnonzero(error == worst[group])
+        first = candidates[np.r_[True, group[candidates[1:]] != group[candidates[:-1]]]]
+        pivot = active[first]
+        keep[pivot[split]] = True
+
+        # The split key becomes the end of the keys before it and the start
+        # of the keys after it
+        pivot = np.repeat(pivot, group_sizes)
+        before = active < pivot
+        end = np.where(before, pivot, end)
+        start = np.where(before, start, pivot)
+        remain = np.repeat(split, group_sizes) & (active != pivot)
+        active = active[remain]
+        start = start[remain]
+        end = end[remain]
+    return keep
+
+def decimated_segments(keep):
+    """
+    Kept keys that are followed by dropped keys.
+
+    decimate() bounds the error of straight lines between kept keys, so the
+    segments starting at these keys must be LINEAR: auto Bezier handles
+    through the remaining keys can stray far from the dropped ones.
+
+    Args:
+        keep: Bool array returned by decimate()
+
+    Returns:
+        Bool array with one entry per kept key
+    """
+    kept = np.flatnonzero(keep)
+    linear = np.zeros(len(kept), dtype=bool)
+    linear[:-1] = np.diff(kept) > 1
+    return linear
+
+def auto_handles(frames, values):
+    """
+    Approximate Blender's auto-clamped handles for keys that were moved.
+
+    Handles reach a third of the way to the neighbouring keys along the slope
+    between the neighbours, and are flat on local extremes and at the ends.
+
+    Returns:
+        Tuple of (left, right) arrays of shape (keys, 2)
+    """
+    frames = np.asarray(frames, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    count = len(frames)
+    slope = np.zeros(count)
+    if count > 2:
+        span = frames[2:] - frames[:-2]
+        slope[1:-1] = np.divide(values[2:] - values[:-2], span, out=np.zeros(count - 2), where=span != 0)
+        extreme = (values[1:-1] - values[:-2]) * (values[2:] - values[1:-1]) <= 0
+        slope[1:-1][extreme] = 0.0
+
+    left_length = np.zeros(count)
+    right_length = np.zeros(count)
+    if count > 1:
+        gaps = np.diff(frames) / 3.0
+        left_length[1:] = gaps
+        right_length[:-1] = gaps
+
+    left = np.column_stack((frames - left_length, values - slope * left_length))
+    right = np.column_stack((frames + right_length, values + slope * right_length))
+    return left, right
+
+def process_curve(frames, values, handles_left=None, handles_right=None, jitter_threshold=None,
+                  max_gap=None, interpolation_method='bezier', smooth_sigma=None, decimate_tolerance=None):
+    """
+    Run the post-recording stages on one curve, in the order the operators run.
+
+    Stages whose option is None are skipped. Has no bpy dependency, so it can
+    run in a worker process.
+
+    Returns:
+        Tuple of (frames, values, stats dict with 'removed', 'added', 'decimated',
+        bool array of keys whose segment must be LINEAR or None)
+    """
+    frames = np.asarray(frames, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    stats = {'removed': 0, 'added': 0, 'decimated': 0}
+    linear = None
+    reshaped = False
+
+    if jitter_threshold is not None and len(values) >= 5:
+        outliers = hampel_outliers(values, jitter_threshold)
+        if outliers.any():
+            stats['removed'] += int(outliers.sum())
+            frames = frames[~outliers]
+            values = values[~outliers]
+            reshaped = True
+
+    if max_gap is not None and len(values) >= 3:
+        if interpolation_method == 'bezier' and (reshaped or handles_left is None):
+            handles_left, handles_right = auto_handles(frames, values)
+        frames, values, added = fill_gaps(
+            frames, values, max_gap, interpolation_method, handles_left, handles_right)
+        interiors = duplicate_run_interiors(values)
+        stats['added'] += added
+        stats['removed'] += int(interiors.sum())
+        frames = frames[~interiors]
+        values = values[~interiors]
+
+    if smooth_sigma is not None and len(values) >= 3:
+        matrix, mask = pack_curves([values])
+        values = gaussian_smooth(frames[None, :], matrix, mask, smooth_sigma)[0]
+
+    if decimate_tolerance is not None and len(values) >= 3:
+        keep = decimate(frames, values, decimate_tolerance)
+        stats['decimated'] += int((~keep).sum())
+        frames = frames[keep]
+        values = values[keep]
+        linear = decimated_segments(keep)
+
+    return frames, values, stats, linear
+
+def resample_to_grid(times, samples, start_time, start_frame, scene_fps, keyframe_rate, end_frame=None):
+    """
+    Resample timestamped samples onto a keyframe grid.
+
+    Grid points are 1 / keyframe_rate seconds apart counted from start_time,
+    which falls on start_frame, so they land exactly on scene frames when the
+    keyframe rate matches the scene frame rate. Only grid points within the
+    sampled time span are produced, so a slice of a take resamples onto the
+    same grid as the whole take. Values are linearly interpolated between the
+    sample times around each grid point when those are at most one grid step
+    apart. Across longer gaps the earlier sample is held, since samples are
+    only taken when values arrive and a sender that sends on change is
+    holding its last value until then.
+
+    Args:
+        times: 1-D monotonic sample times in seconds
+        samples: (samples, channels) values
+        end_frame: Drop grid points after this frame, if given
+
+    Returns:
+        Tuple of (frames, samples) arrays
+    """
+    times = np.maximum.accumulate(np.asarray(times, dtype=np.float64))
+    samples = np.asarray(samples, dtype=np.float64)
+    count = len(times)
+    if not count:
+        return np.empty(0), np.empty((0, samples.shape[1]))
+
+    first = int(np.ceil((times[0] - start_time) * keyframe_rate - 1e-9))
+    last = int(np.floor((times[-1] - start_time) * keyframe_rate + 1e-9))
+    steps = np.arange(max(first, 0), last + 1)
+    grid = start_time + steps / keyframe_rate
+    frames = start_frame + steps * (scene_fps / keyframe_rate)
+    if end_frame is not None:
+        inside = frames <= end_frame
+        grid = grid[inside]
+        frames = frames[inside]
+
+    upper = np.searchsorted(times, grid, side='right')
+    hi = np.minimum(upper, count - 1)
+    lo = np.maximum(upper - 1, 0)
+    span = times[hi] - times[lo]
+    interpolate = (span > 0) & (span <= 1.0 / keyframe_rate + 1e-9)
+    weight = np.divide(grid - times[lo], span, out=np.zeros_like(grid), where=interpolate)
+    values = samples[lo] + weight[:, None] * (samples[hi] - samples[lo])
+    return frames, values
+
+def last_per_frame(frames, samples):
+    """
+    Samples keyed by the frame they were taken on, the last sample of a
+    frame winning.
+
+    Returns:
+        Tuple of (frames, samples) arrays ordered by frame
+    """
+    frames = np.asarray(frames, dtype=np.float64)
+    _, last = np.unique(frames[::-1], return_index=True)
+    keep = len(frames) - 1 - last
+    return frames[keep], np.asarray(samples)[keep]
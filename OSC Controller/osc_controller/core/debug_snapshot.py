@@ -0,0 +1,92 @@
+import time
+import bpy
+from bpy.app import timers
+from . import osc_server
+
+# Minimum time between snapshot rebuilds and debug panel redraws (in seconds)
+SNAPSHOT_INTERVAL = 0.1
+
+# Number of recent messages shown in the debug panel
+RECENT_COUNT = 8
+
+class DebugSnapshot:
+    """Copy of the received OSC state taken at most every SNAPSHOT_INTERVAL"""
+
+    def __init__(self):
+        self.time = 0.0
+        self.address_filter = None
+        self.last_address = "None"
+        self.last_value = "None"
+        self.recent = []  # Newest first (address, value)
+        self.rows = []  # Sorted (address, raw value, mapped value or None)
+
+    def is_stale(self, address_filter):
+        return (address_filter != self.address_filter
+                or time.monotonic() - self.time >= SNAPSHOT_INTERVAL)
+
+_snapshot = DebugSnapshot()
+
+def get_snapshot(address_filter=""):
+    """
+    Return the current debug snapshot, rebuilding it if it is older than
+    SNAPSHOT_INTERVAL or the filter changed.
+
+    Args:
+        address_filter: Case-insensitive substring the addresses must contain
+    """
+    global _snapshot
+
+    if not _snapshot.is_stale(address_filter):
+        return _snapshot
+
+    snapshot = DebugSnapshot()
+    snapshot.time = time.monotonic()
+    snapshot.address_filter = address_filter
+
+    try:
+        recent = list(osc_server.recent_messages)
+    except RuntimeError:
+        recent = []  # Mutated while copying, keep the previous view
+        snapshot.recent = _snapshot.recent
+    if recent:
+        snapshot.recent = recent[:-RECENT_COUNT - 1:-1]
+    if snapshot.recent:
+        address, value = snapshot.recent[0]
+        snapshot.last_address = address
+        snapshot.last_value = str(value)
+
+    # Copy first, the network thread keeps adding addresses while we sort
+    values = dict(osc_server.osc_values_dict)
+    mapped = osc_server.mapped_values_dict
+    needle = address_filter.lower()
+    snapshot.rows = [
+        (address, value, mapped.get(f"{address}_mapped"))
+        for address, value in sorted(values.items())
+        if needle in address.lower()
+    ]
+
+    _snapshot = snapshot
+    return snapshot
+
+def redraw_debug_panel():
+    """Redraw the sidebar at the snapshot rate while debug info is shown"""
+    try:
+        scene = bpy.context.scene
+        if scene and osc_server.is_server_running and scene.osc_debug.show_debug:
+            for window in bpy.context.window_manager.windows:
+                for area in window.screen.areas:
+                    if area.type == 'VIEW_3D':
+                        area.tag_redraw()
+    except Exception:
+        pass
+    return SNAPSHOT_INTERVAL
+
+def register():
+    """Start the debug panel redraw timer"""
+    if not timers.is_registered(redraw_debug_panel):
+        timers.register(redraw_debug_panel, first_interval=SNAPSHOT_INTERVAL, persistent=True)
+
+def unregister():
+    """Stop the debug panel redraw timer"""
+    if timers.is_registered(redraw_debug_panel):
+        timers.unregister(redraw_debug_panel)
@@ -1,6 +1,7 @@
 import bpy
 from . import osc_server
 from . import utils
+from . import metrics
 
 # Functions for Blender drivers to access OSC data
 def get_osc_value(address):
@@ -15,17 +16,21 @@ def get_osc_value(address):
     """
     return osc_server.osc_values_dict.get(address, 0.0)
 
-def get_mapped_osc_value(address):
+def get_mapped_osc_value(address, index=0):
     """
     Get the mapped OSC value for a given address.
     
     Args:
         address: The OSC address to get the mapped value for
+        index: Component to return for vector and matrix mappings
         
     Returns:
         The mapped OSC value, or 0.0 if not found
     """
-    return osc_server.mapped_values_dict.get(f"{address}_mapped", 0.0)
+    value = osc_server.mapped_values_dict.get(f"{address}_mapped", 0.0)
+    if isinstance(value, tuple):
+        return value[index] if index < len(value) else 0.0
+    return value
 
 # Function for drivers to perform custom remapping
 def remap_osc_value(address, out_min, out_max, in_min=None, in_max=None):
@@ -58,6 +63,7 @@ def register():
     bpy.app.driver_namespace["get_osc_value"] = get_osc_value
     bpy.app.driver_namespace["get_mapped_osc_value"] = get_mapped_osc_value
     bpy.app.driver_namespace["remap_osc_value"] = remap_osc_value
+    bpy.app.driver_namespace["get_osc_metrics"] = metrics.snapshot
 
 def unregister():
     """Unregister driver functions from Blender's driver namespace"""
@@ -66,4 +72,6 @@ def unregister():
     if "get_mapped_osc_value" in bpy.app.driver_namespace:
         del bpy.app.driver_namespace["get_mapped_osc_value"]
     if "remap_osc_value" in bpy.app.driver_namespace:
-        del bpy.app.driver_namespace["remap_osc_value"]
\ No newline at end of file
+        del bpy.app.driver_namespace["remap_osc_value"]
+    if "get_osc_metrics" in bpy.app.driver_namespace:
+        del bpy.app.driver_namespace["get_osc_metrics"]
\ No newline at end of file
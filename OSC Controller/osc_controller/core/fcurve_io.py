@@ -0,0 +1,198 @@
+import bpy
+import numpy as np
+
+# Action group Blender uses for keyframes inserted on object transforms
+TRANSFORM_GROUP = "Object Transforms"
+
+# Per-key enum settings kept when keys are rewritten, accessed as ints by
+# foreach_get and foreach_set
+KEY_SETTINGS = ("interpolation", "easing", "handle_left_type", "handle_right_type")
+
+# The 'LINEAR' interpolation item as foreach_get and foreach_set see it
+INTERPOLATION_LINEAR = 1
+
+def ensure_action(obj):
+    """Return the object's action, creating animation data and an action if needed"""
+    if obj.animation_data is None:
+        obj.animation_data_create()
+    action = obj.animation_data.action
+    if action is None:
+        action = bpy.data.actions.new(name=f"{obj.name}Action")
+        obj.animation_data.action = action
+    return action
+
+def find_or_create_fcurve(action, data_path, index=0, group=None):
+    """Return the F-Curve for a data path and array index, creating it if needed"""
+    fcurve = action.fcurves.find(data_path, index=index)
+    if fcurve is None:
+        if group:
+            fcurve = action.fcurves.new(data_path, index=index, action_group=group)
+        else:
+            fcurve = action.fcurves.new(data_path, index=index)
+    return fcurve
+
+def read_keyframes(fcurve):
+    """
+    Read all keyframe positions of an F-Curve.
+
+    Returns:
+        Tuple of (frames, values) float64 arrays
+    """
+    count = len(fcurve.keyframe_points)
+    co = np.empty(count * 2, dtype=np.float32)
+    if count:
+        fcurve.keyframe_points.foreach_get("co", co)
+    co = co.reshape(-1, 2).astype(np.float64)
+    return co[:, 0], co[:, 1]
+
+def read_handles(fcurve):
+    """
+    Read the handle positions of all keyframes of an F-Curve.
+
+    Returns:
+        Tuple of (left, right) float64 arrays of shape (keys, 2)
+    """
+    count = len(fcurve.keyframe_points)
+    left = np.empty(count * 2, dtype=np.float32)
+    right = np.empty(count * 2, dtype=np.float32)
+    if count:
+        fcurve.keyframe_points.foreach_get("handle_left", left)
+        fcurve.keyframe_points.foreach_get("handle_right", right)
+    return left.reshape(-1, 2).astype(np.float64), right.reshape(-1, 2).astype(np.float64)
+
+def read_key_settings(fcurve):
+    """
+    Read the per-key enum settings of all keyframes of an F-Curve.
+
+    Returns:
+        Dict of KEY_SETTINGS attribute -> int array
+    """
+    count = len(fcurve.keyframe_points)
+    settings = {}
+    for attribute in KEY_SETTINGS:
+        buffer = np.empty(count, dtype=np.int32)
+        if count:
+            fcurve.keyframe_points.foreach_get(attribute, buffer)
+        settings[attribute] = buffer
+    return settings
+
+def set_values(fcurve, frames, values):
+    """
+    Overwrite the positions of an F-Curve's existing keyframes in bulk.
+
+    The curve must already have len(frames) keyframe points; their interpolation
+    and handle types are kept.
+    """
+    co = np.empty((len(frames), 2), dtype=np.float32)
+    co[:, 0] = frames
+    co[:, 1] = values
+    fcurve.keyframe_points.foreach_set("co", co.ravel())
+    fcurve.update()
+
+def write_keyframes(fcurve, frames, values, replace=False, linear=None):
+    """
+    Write keyframes to an F-Curve in one bulk operation.
+
+    New keys replace existing keys on the same frame, like keyframe_insert.
+    Existing keys on other frames are kept unless replace is True. Keys on
+    frames that already had a key keep its interpolation, easing and handle
+    types, and its handles move with the key.
+
+    Args:
+        fcurve: The F-Curve to write
+        frames: Sequence of frame numbers
+        values: Sequence of values, one per frame
+        replace: Discard all existing keys first
+        linear: Optional bool array, one per new key, of keys whose segment
+                to the next key is made LINEAR
+    """
+    frames = np.asarray(frames, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    if linear is not None:
+        linear = np.asarray(linear, dtype=bool)
+
+    keyframe_points = fcurve.keyframe_points
+    old = None
+    if len(keyframe_points):
+        old_frames, old_values = read_keyframes(fcurve)
+        old = (old_frames, old_values, read_handles(fcurve), read_key_settings(fcurve))
+        if not replace:
+            keep = ~np.isin(old_frames, frames)
+            frames = np.concatenate((old_frames[keep], frames))
+            values = np.concatenate((old_values[keep], values))
+            if linear is not None:
+                linear = np.concatenate((np.zeros(int(keep.sum()), dtype=bool), linear))
+
+    order = np.argsort(frames, kind="stable")
+    frames = frames[order]
+    values = values[order]
+    co = np.empty((len(frames), 2), dtype=np.float32)
+    co[:, 0] = frames
+    co[:, 1] = values
+
+    keyframe_points.clear()
+    keyframe_points.add(len(co))
+    keyframe_points.foreach_set("co", co.ravel())
+    if old is not None:
+        restore_key_settings(fcurve, frames, values, *old)
+    if linear is not None and linear.any():
+        interpolation = np.empty(len(frames), dtype=np.int32)
+        keyframe_points.foreach_get("interpolation", interpolation)
+        interpolation[linear[order]] = INTERPOLATION_LINEAR
+        keyframe_points.foreach_set("interpolation", interpolation)
+
+    # Recalculate handles for the new points
+    fcurve.update()
+
+def restore_key_settings(fcurve, frames, values, old_frames, old_values, old_handles, old_settings):
+    """
+    Give rewritten keys the settings and handles of the old keys on the same frame.
+
+    Handles are shifted by the change in value, so FREE and ALIGNED handles
+    keep their shape; auto handles are recalculated by fcurve.update().
+    """
+    order = np.argsort(old_frames, kind="stable")
+    position = np.minimum(np.searchsorted(old_frames[order], frames), len(order) - 1)
+    source = order[position]
+    matched = old_frames[source] == frames
+    if not matched.any():
+        return
+    target = np.flatnonzero(matched)
+    source = source[matched]
+
+    keyframe_points = fcurve.keyframe_points
+    count = len(frames)
+    for attribute, old in old_settings.items():
+        buffer = np.empty(count, dtype=np.int32)
+        keyframe_points.foreach_get(attribute, buffer)
+        buffer[target] = old[source]
+        keyframe_points.foreach_set(attribute, buffer)
+
+    shift = values[target] - old_values[source]
+    for attribute, old in zip(("handle_left", "handle_right"), old_handles):
+        buffer = np.empty((count, 2), dtype=np.float32)
+        keyframe_points.foreach_get(attribute, buffer.ravel())
+        buffer[target, 0] = old[source, 0]
+        buffer[target, 1] = old[source, 1] + shift
+        keyframe_points.foreach_set(attribute, buffer.ravel())
+
+def write_channels(obj, channels, frames, samples):
+    """
+    Write a block of sampled channels of one object as F-Curves.
+
+    Args:
+        obj: Object to animate
+        channels: List of (data_path, array index, action group or None)
+        frames: 1-D array of frame numbers, one per sample row
+        samples: 2-D array (frame, channel) of values
+
+    Returns:
+        Number of F-Curves written
+    """
+    if not len(frames):
+        return 0
+    action = ensure_action(obj)
+    for column, (data_path, index, group) in enumerate(channels):
+        fcurve = find_or_create_fcurve(action, data_path, index, group)
+        write_keyframes(fcurve, frames, samples[:, column])
+    return len(channels)
@@ -0,0 +1,286 @@
+import asyncio
+import select
+import socket
+import threading
+
+# Largest datagram read from the socket in one call
+MAX_DATAGRAM_SIZE = 65535
+
+# Maximum number of datagrams handled per wakeup before checking for shutdown
+MAX_BATCH_SIZE = 1024
+
+class BatchedOSCUDPServer:
+    """
+    Single-thread OSC UDP receiver.
+
+    One thread waits for the socket to become readable and then drains every
+    pending datagram with non-blocking reads, dispatching them in arrival order.
+    Exposes the same serve_forever/shutdown/server_close interface as the
+    python-osc socketserver flavours.
+    """
+
+    def __init__(self, server_address, dispatcher, receive_buffer_size=None):
+        self.server_address = server_address
+        self.dispatcher = dispatcher
+
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            if receive_buffer_size:
+                set_receive_buffer_size(self.socket, receive_buffer_size)
+            self.socket.bind(server_address)
+            self.socket.setblocking(False)
+        except Exception:
+            self.socket.close()
+            raise
+
+        self._shutdown_request = False
+        self._is_shut_down = threading.Event()
+        self._is_shut_down.set()
+
+        # Receive statistics
+        self.datagrams_received = 0
+        self.batches_received = 0
+        self.largest_batch = 0
+
+    def serve_forever(self, poll_interval=0.5):
+        """Receive and dispatch datagrams until shutdown() is called"""
+        self._is_shut_down.clear()
+        try:
+            while not self._shutdown_request:
+                readable, _, _ = select.select([self.socket], [], [], poll_interval)
+                if readable:
+                    self._receive_batch()
+        finally:
+            self._shutdown_request = False
+            self._is_shut_down.set()
+
+    def _receive_batch(self):
+        """Drain all pending datagrams from the socket"""
+        recvfrom = self.socket.recvfrom
+        dispatch = self.dispatcher.call_handlers_for_packet
+        count = 0
+
+        while count < MAX_BATCH_SIZE:
+            try:
+                data, client_address = recvfrom(MAX_DATAGRAM_SIZE)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                # e.g. ICMP port unreachable surfacing as a reset on Windows
+                break
+            count += 1
+
+            # Same sanity check as python-osc: only messages and bundles
+            if not data.startswith((b"/", b"#bundle")):
+                continue
+
+            try:
+                responses = dispatch(data, client_address)
+                if responses:
+                    self._send_responses(responses, client_address)
+            except Exception as e:
+                print(f"OSC Controller: Error dispatching OSC packet: {str(e)}")
+
+        self.datagrams_received += count
+        self.batches_received += 1
+        if count > self.largest_batch:
+            self.largest_batch = count
+
+    def _send_responses(self, responses, client_address):
+        """Send handler return values back to the client, like python-osc does"""
+        from pythonosc.osc_message_builder import build_msg
+
+        for response in responses:
+            if not isinstance(response, tuple):
+                response = [response]
+            msg = build_msg(response[0], response[1:])
+            self.socket.sendto(msg.dgram, client_address)
+
+    def shutdown(self):
+        """Stop serve_forever and wait until it has returned"""
+        self._shutdown_request = True
+        self._is_shut_down.wait()
+
+    def server_close(self):
+        """Close the socket"""
+        self.socket.close()
+
+class AsyncIOIngestEngine:
+    """
+    Hosts any number of UDP and TCP OSC listeners on one asyncio event loop.
+
+    All sockets are bound in the constructor so errors surface immediately;
+    serve_forever then runs the loop on the calling (background) thread.
+    Exposes the same serve_forever/shutdown/server_close interface as the
+    other servers.
+    """
+
+    def __init__(self, listeners, dispatcher, receive_buffer_size=None):
+        """
+        Args:
+            listeners: List of (protocol, host, port) with protocol 'udp' or 'tcp'
+            dispatcher: The python-osc dispatcher to hand packets to
+            receive_buffer_size: Optional SO_RCVBUF size for the UDP sockets
+        """
+        self.listeners = listeners
+        self.dispatcher = dispatcher
+        self.receive_buffer_size = receive_buffer_size
+        self.loop = asyncio.new_event_loop()
+        self._udp_transports = []
+        self._tcp_servers = []
+        self._shutdown_request = False
+        self._is_shut_down = threading.Event()
+        self._is_shut_down.set()
+
+        try:
+            self.loop.run_until_complete(self._start_listeners())
+        except Exception:
+            self.server_close()
+            raise
+
+    async def _start_listeners(self):
+        from pythonosc.osc_server import AsyncIOOSCUDPServer
+        from pythonosc.osc_tcp_server import AsyncOSCTCPServer
+
+        for protocol, host, port in self.listeners:
+            if protocol == 'udp':
+                udp_server = AsyncIOOSCUDPServer((host, port), self.dispatcher, self.loop)
+                transport, _ = await udp_server.create_serve_endpoint()
+                self._udp_transports.append(transport)
+                if self.receive_buffer_size:
+                    sock = transport.get_extra_info("socket")
+                    try:
+                        set_receive_buffer_size(sock, self.receive_buffer_size)
+                    except OSError as e:
+                        print(f"OSC Controller: Could not set receive buffer size: {str(e)}")
+            else:
+                # Bind through asyncio directly so bind errors are raised here,
+                # the python-osc server only provides the connection handler
+                tcp_server = AsyncOSCTCPServer(host, port, self.dispatcher)
+                server = await asyncio.start_server(
+                    lambda reader, writer, handle=tcp_server.handle: self._handle_tcp(handle, reader, writer),
+                    host,
+                    port,
+                )
+                self._tcp_servers.append(server)
+
+    async def _handle_tcp(self, handle, reader, writer):
+        """Run a TCP connection handler, closing the connection quietly on shutdown"""
+        try:
+            await handle(reader, writer)
+        except asyncio.CancelledError:
+            writer.close()
+
+    def serve_forever(self):
+        """Run the event loop until shutdown() is called"""
+        self._is_shut_down.clear()
+        try:
+            if not self._shutdown_request:
+                asyncio.set_event_loop(self.loop)
+                self.loop.run_forever()
+        finally:
+            self._is_shut_down.set()
+
+    def shutdown(self):
+        """Stop the event loop and wait until serve_forever has returned"""
+        self._shutdown_request = True
+        stop_sent = False
+        while not self._is_shut_down.wait(0.05):
+            # The loop may not be running yet if the thread has only just started
+            if not stop_sent and self.loop.is_running():
+                self.loop.call_soon_threadsafe(self.loop.stop)
+                stop_sent = True
+
+    def server_close(self):
+        """Close all listeners and open TCP connections, then the loop itself"""
+        if self.loop.is_closed():
+            return
+
+        for transport in self._udp_transports:
+            transport.close()
+        for server in self._tcp_servers:
+            server.close()
+
+        # Cancel connection handlers still reading from TCP clients
+        pending = asyncio.all_tasks(self.loop)
+        for task in pending:
+            task.cancel()
+        if pending:
+            self.loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+
+        self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+        self.loop.close()
+
+def parse_listeners(settings):
+    """
+    Build the listener list for the asyncio engine.
+
+    The main IP address and port always get a UDP listener. Additional
+    listeners come from the comma-separated extra_listeners setting, with
+    entries of the form 'udp:9002', 'tcp:9003' or 'tcp:192.168.1.5:9004'.
+
+    Raises:
+        ValueError if an entry can't be parsed
+    """
+    listeners = [('udp', settings.ip_address, settings.port)]
+
+    for entry in settings.extra_listeners.split(','):
+        entry = entry.strip()
+        if not entry:
+            continue
+        parts = entry.split(':')
+        if len(parts) == 2:
+            protocol, host, port = parts[0], settings.ip_address, parts[1]
+        elif len(parts) == 3:
+            protocol, host, port = parts
+        else:
+            raise ValueError(f"Invalid listener '{entry}'")
+
+        protocol = protocol.strip().lower()
+        if protocol not in ('udp', 'tcp'):
+            raise ValueError(f"Invalid listener protocol '{protocol}' in '{entry}'")
+        try:
+            port = int(port)
+        except ValueError:
+            raise ValueError(f"Invalid listener port in '{entry}'")
+
+        listeners.append((protocol, host.strip(), port))
+
+    return listeners
+
+def set_receive_buffer_size(sock, size):
+    """Request a kernel receive buffer size. The OS may clamp the value."""
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, size)
+
+def create_server(settings, dispatcher):
+    """
+    Create an OSC server of the type selected in the settings.
+
+    Args:
+        settings: The scene's OSCSettings
+        dispatcher: The python-osc dispatcher to hand packets to
+
+    Returns:
+        A server object with serve_forever, shutdown and server_close methods
+    """
+    from pythonosc import osc_server as osc_server_lib
+
+    server_address = (settings.ip_address, settings.port)
+    receive_buffer_size = settings.receive_buffer_size * 1024
+
+    if settings.server_type == 'batched':
+        return BatchedOSCUDPServer(server_address, dispatcher, receive_buffer_size)
+
+    if settings.server_type == 'asyncio':
+        return AsyncIOIngestEngine(parse_listeners(settings), dispatcher, receive_buffer_size)
+
+    if settings.server_type == 'blocking':
+        server = osc_server_lib.BlockingOSCUDPServer(server_address, dispatcher)
+    else:
+        server = osc_server_lib.ThreadingOSCUDPServer(server_address, dispatcher)
+
+    try:
+        set_receive_buffer_size(server.socket, receive_buffer_size)
+    except OSError as e:
+        print(f"OSC Controller: Could not set receive buffer size: {str(e)}")
+    return server
@@ -0,0 +1,205 @@
+import bisect
+import threading
+import time
+
+# Upper bounds (in milliseconds) of the receive-to-apply latency histogram buckets
+LATENCY_BUCKETS_MS = (0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 50.0, 100.0, 200.0, 500.0, 1000.0)
+
+# Maximum number of distinct addresses tracked individually
+MAX_TRACKED_ADDRESSES = 4096
+OTHER_ADDRESSES = "(other)"
+
+# Minimum time between rate recalculations (in seconds)
+RATE_WINDOW = 1.0
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with approximate percentiles"""
+
+    def __init__(self, buckets_ms=LATENCY_BUCKETS_MS):
+        self.buckets_ms = buckets_ms
+        self.reset()
+
+    def reset(self):
+        self.counts = [0] * (len(self.buckets_ms) + 1)  # Last bucket is overflow
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, latency_ms):
+        self.counts[bisect.bisect_left(self.buckets_ms, latency_ms)] += 1
+        self.count += 1
+        self.total_ms += latency_ms
+        if latency_ms > self.max_ms:
+            self.max_ms = latency_ms
+
+    def mean(self):
+        return self.total_ms / self.count if self.count else 0.0
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket containing the given fraction of samples"""
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                if index < len(self.buckets_ms):
+                    return min(self.buckets_ms[index], self.max_ms)
+                return self.max_ms
+        return self.max_ms
+
+# Per-address message counts, written by the network thread. The threading
+# server calls record_message from one thread per datagram, so the counters
+# are only updated under the lock.
+address_counts = {}
+messages_total = 0
+_count_lock = threading.Lock()
+
+# Bundle messages the timetag scheduler refused, by reason ('full' or
+# 'ahead'), updated under the count lock like the message counters
+scheduler_drops = {"full": 0, "ahead": 0}
+
+# Rate calculation state, only touched from the main thread
+_rate_time = time.monotonic()
+_rate_counts = {}
+address_rates = {}
+
+# Receive-to-apply latency, recorded by the drain timer
+latency = LatencyHistogram()
+
+# Apply queue and drain statistics
+last_drain_stats = {"applied": 0, "writes": 0, "coalesced": 0, "dropped": 0}
+total_drain_stats = {"applied": 0, "writes": 0, "coalesced": 0, "dropped": 0}
+queue_depth = 0
+max_queue_depth = 0
+last_apply_ms = 0.0
+max_apply_ms = 0.0
+ticks = 0
+
+def record_message(address):
+    """Count one received message. Called from the network thread."""
+    global messages_total
+    with _count_lock:
+        messages_total += 1
+        try:
+            address_counts[address] += 1
+        except KeyError:
+            if len(address_counts) >= MAX_TRACKED_ADDRESSES:
+                address = OTHER_ADDRESSES
+            address_counts[address] = address_counts.get(address, 0) + 1
+
+def record_scheduler_drop(reason):
+    """Count one scheduled bundle message that was dropped. Called from the network thread."""
+    with _count_lock:
+        scheduler_drops[reason] += 1
+
+def record_drain(depth, applied, writes, coalesced, dropped, apply_seconds):
+    """Record the outcome of one apply queue drain. Called from the main thread."""
+    global queue_depth, max_queue_depth, last_apply_ms, max_apply_ms, ticks
+
+    ticks += 1
+    queue_depth = depth
+    if depth > max_queue_depth:
+        max_queue_depth = depth
+
+    for key, value in (("applied", applied), ("writes", writes),
+                       ("coalesced", coalesced), ("dropped", dropped)):
+        last_drain_stats[key] = value
+        total_drain_stats[key] += value
+
+    last_apply_ms = apply_seconds * 1000.0
+    if last_apply_ms > max_apply_ms:
+        max_apply_ms = last_apply_ms
+
+def update_rates():
+    """Recalculate per-address message rates if the rate window has elapsed"""
+    global _rate_time, _rate_counts, address_rates
+
+    now = time.monotonic()
+    elapsed = now - _rate_time
+    if elapsed < RATE_WINDOW:
+        return address_rates
+
+    with _count_lock:
+        counts = dict(address_counts)
+    address_rates = {
+        address: (count - _rate_counts.get(address, 0)) / elapsed
+        for address, count in counts.items()
+    }
+    _rate_time = now
+    _rate_counts = counts
+    return address_rates
+
+def top_addresses(limit=10):
+    """Return the busiest addresses as (address, rate, count) tuples"""
+    rates = update_rates()
+    busiest = sorted(rates.items(), key=lambda item: item[1], reverse=True)[:limit]
+    return [(address, rate, address_counts.get(address, 0)) for address, rate in busiest]
+
+def snapshot():
+    """
+    Return all ingest metrics as a plain dictionary.
+
+    Also available to drivers and scripts as
+    bpy.app.driver_namespace["get_osc_metrics"]().
+    """
+    rates = update_rates()
+    with _count_lock:
+        total = messages_total
+        counts = dict(address_counts)
+        drops = dict(scheduler_drops)
+    return {
+        "messages_total": total,
+        "addresses": {
+            address: {"count": count, "rate": rates.get(address, 0.0)}
+            for address, count in counts.items()
+        },
+        "latency_ms": {
+            "samples": latency.count,
+            "mean": latency.mean(),
+            "p50": latency.percentile(0.5),
+            "p99": latency.percentile(0.99),
+            "max": latency.max_ms,
+            "buckets": list(latency.buckets_ms),
+            "histogram": list(latency.counts),
+        },
+        "queue": {
+            "depth": queue_depth,
+            "max_depth": max_queue_depth,
+        },
+        "scheduler": {
+            "dropped_full": drops["full"],
+            "dropped_ahead": drops["ahead"],
+        },
+        "drain": {
+            "ticks": ticks,
+            "last": dict(last_drain_stats),
+            "total": dict(total_drain_stats),
+            "last_apply_ms": last_apply_ms,
+            "max_apply_ms": max_apply_ms,
+        },
+    }
+
+def reset():
+    """Reset all metrics"""
+    global messages_total, _rate_time, _rate_counts, address_rates
+    global queue_depth, max_queue_depth, last_apply_ms, max_apply_ms, ticks
+
+    with _count_lock:
+        address_counts.clear()
+        messages_total = 0
+        for reason in scheduler_drops:
+            scheduler_drops[reason] = 0
+    _rate_time = time.monotonic()
+    _rate_counts = {}
+    address_rates = {}
+    latency.reset()
+    for stats in (last_drain_stats, total_drain_stats):
+        for key in stats:
+            stats[key] = 0
+    queue_depth = 0
+    max_queue_depth = 0
+    last_apply_ms = 0.0
+    max_apply_ms = 0.0
+    ticks = 0
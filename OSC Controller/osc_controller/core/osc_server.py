@@ -1,19 +1,35 @@
 import bpy
+import collections
 import threading
+import time
 from bpy.app import timers
+from bpy.app.handlers import persistent
 from . import utils
 from . import recording
 from . import driver_functions
+from . import apply_queue
+from . import routing
+from . import scheduler
+from . import metrics
+from . import capture
+from . import background_render
 
 # Global variables
 osc_server_thread = None
 osc_server_instance = None
+osc_dispatcher = None  # Dispatcher the running server hands packets to
 is_server_running = False
 osc_values_dict = {}  # Dictionary to store the latest OSC values by address
 mapped_values_dict = {}  # Dictionary to store the mapped values by address
+recent_messages = collections.deque(maxlen=256)  # Ring buffer of (address, value) for the debug panel
+timetag_scheduler = scheduler.TimetagScheduler(on_drop=metrics.record_scheduler_drop)  # Releases future-timestamped bundle messages
 
 # OSC message handler
 def osc_handler(address, *args):
+    # Receive timestamp for the latency metrics, taken on the network thread
+    received_at = time.monotonic()
+    metrics.record_message(address)
+    
     if not args:
         return
     
@@ -25,16 +41,16 @@ def osc_handler(address, *args):
         # Store the raw OSC value
         osc_values_dict[address] = value
         
-        # Update debug info
-        if hasattr(bpy.context.scene, 'osc_debug'):
-            debug = bpy.context.scene.osc_debug
-            debug.last_received_address = address
-            debug.last_received_value = str(value)
+        # Record for the debug panel. deque.append is atomic, so the network
+        # thread never touches RNA or takes a lock for debug info.
+        recent_messages.append((address, value))
         
         # Handle special OSC addresses
         if address == "/renderimage" and value == 1.0:
-            # Register the render operation to run in the main thread
-            timers.register(start_render_image)
+            # Register the render operation to run in the main thread. Triggers
+            # arriving before it runs are coalesced into one render.
+            if not timers.is_registered(start_render_image):
+                timers.register(start_render_image)
             return
         
         # Handle record frames command
@@ -48,84 +64,98 @@ def osc_handler(address, *args):
                 timers.register(recording.stop_recording)
             return
         
-        # Process each mapping
-        for idx, mapping in enumerate(bpy.context.scene.osc_mappings):
-            if not mapping.is_active or not mapping.target_object:
-                continue
+        # Look up the precompiled mappings for this address. The routing
+        # table is built on the main thread, so no RNA is touched here.
+        records = routing.routing_table.get(address)
+        if not records:
+            return
+        
+        for record in records:
+            # Remap the incoming value from raw range to the remapped range.
+            # Vector and matrix mappings take all their arguments at once.
+            if record.arity == 1:
+                mapped_value = record.remap(value)
+            else:
+                mapped_value = record.remap_vector(args)
+                if mapped_value is None:
+                    continue
+            
+            # Store the mapped value for driver use
+            mapped_values_dict[record.mapped_key] = mapped_value
             
-            # Check if the OSC address matches
-            if mapping.osc_address == address:
-                # Remap the incoming value from raw range to the remapped range
-                mapped_value = utils.remap_value(
-                    value, 
-                    mapping.raw_min_value, 
-                    mapping.raw_max_value,
-                    mapping.remap_min_value, 
-                    mapping.remap_max_value
-                )
-                
-                # Store the mapped value for driver use
-                mapped_values_dict[f"{address}_mapped"] = mapped_value
-                
-                # Add to queue for execution in the main thread
-                timers.register(
-                    lambda obj=mapping.target_object, 
-                        prop_type=mapping.property_type, 
-                        custom_name=mapping.custom_property_name,
-                        val=mapped_value: utils.set_object_property(obj, prop_type, custom_name, val)
-                )
+            # Queue the value for the main-thread drain timer; only the
+            # newest value per (object, property) is applied each tick
+            apply_queue.update_queue.push(record.key, mapped_value, received_at)
     except Exception as e:
         print(f"OSC Controller: Error in OSC handler: {str(e)}")
 
 # Function to handle the render image command
 def start_render_image():
-    print("OSC Controller: Starting render")
-    # Stop the OSC server before rendering
-    bpy.ops.osc.stop_server()
+    scene = bpy.context.scene
+    
+    # The OSC server stays bound; renders never rebind the socket
+    if scene.osc_settings.render_mode == 'background':
+        try:
+            background_render.submit(scene)
+        except Exception as e:
+            print(f"OSC Controller: Error queueing background render: {str(e)}")
+        return None
     
-    # Add handlers for render completion and cancellation
-    bpy.app.handlers.render_complete.append(render_complete_handler)
-    bpy.app.handlers.render_cancel.append(render_cancel_handler)
+    if apply_queue.hold_updates:
+        print("OSC Controller: Render already running, ignoring render command")
+        return None
     
-    # Start the render
+    print("OSC Controller: Starting render")
     bpy.ops.render.render('INVOKE_DEFAULT')
+    return None
 
-# Function to restart OSC server after render completes
-def restart_osc_server_after_render():
-    print("OSC Controller: Render completed, restarting OSC server")
-    bpy.ops.osc.start_server()
+# Handler for render start: buffer incoming values instead of writing them
+# into the scene the renderer is reading
+@persistent
+def render_init_handler(scene, depsgraph=None):
+    apply_queue.hold()
 
-# Handler for render completion
-def render_complete_handler(scene):
-    timers.register(restart_osc_server_after_render, first_interval=0.5)
+# Handler for render completion: apply the latest buffered values once
+@persistent
+def render_complete_handler(scene, depsgraph=None):
+    apply_queue.release()
 
 # Handler for render cancellation
-def render_cancel_handler(scene):
-    timers.register(restart_osc_server_after_render, first_interval=0.5)
+@persistent
+def render_cancel_handler(scene, depsgraph=None):
+    apply_queue.release()
+
+# (handler list, handler) pairs installed while the add-on is registered
+RENDER_HANDLERS = (
+    (bpy.app.handlers.render_init, render_init_handler),
+    (bpy.app.handlers.render_complete, render_complete_handler),
+    (bpy.app.handlers.render_cancel, render_cancel_handler),
+)
 
 def register():
     """Register render handlers"""
     # Make sure the render handlers are removed before adding them
     # to avoid duplicates if the addon is reloaded
-    if render_complete_handler in bpy.app.handlers.render_complete:
-        bpy.app.handlers.render_complete.remove(render_complete_handler)
-    bpy.app.handlers.render_complete.append(render_complete_handler)
-    
-    if render_cancel_handler in bpy.app.handlers.render_cancel:
-        bpy.app.handlers.render_cancel.remove(render_cancel_handler)
-    bpy.app.handlers.render_cancel.append(render_cancel_handler)
+    for handlers, handler in RENDER_HANDLERS:
+        if handler in handlers:
+            handlers.remove(handler)
+        handlers.append(handler)
 
 def unregister():
     """Unregister render handlers and stop server if running"""
     # Stop OSC server if running
-    global osc_server_instance, is_server_running
+    global osc_server_instance, osc_dispatcher, is_server_running
+    capture.stop_replay()
     if is_server_running and osc_server_instance:
         osc_server_instance.shutdown()
+        osc_server_instance.server_close()
         osc_server_instance = None
         is_server_running = False
+    osc_dispatcher = None
+    timetag_scheduler.stop()
+    capture.stop_capture()
     
     # Remove render handlers
-    if render_complete_handler in bpy.app.handlers.render_complete:
-        bpy.app.handlers.render_complete.remove(render_complete_handler)
-    if render_cancel_handler in bpy.app.handlers.render_cancel:
-        bpy.app.handlers.render_cancel.remove(render_cancel_handler)
\ No newline at end of file
+    for handlers, handler in RENDER_HANDLERS:
+        if handler in handlers:
+            handlers.remove(handler)
\ No newline at end of file
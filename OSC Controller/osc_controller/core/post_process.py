@@ -0,0 +1,209 @@
+import os
+import runpy
+import multiprocessing
+import concurrent.futures
+import bpy
+from bpy.app.handlers import persistent
+from . import fcurve_io
+from . import curve_math
+
+# Run by path in every worker process to make curve_math importable there,
+# importing it through the add-on package would pull in bpy
+WORKER_STARTUP = os.path.join(os.path.dirname(os.path.realpath(__file__)), "post_process_worker.py")
+
+# Takes with fewer keys than this are processed in Blender's own process,
+# starting worker processes would cost more than it saves
+PARALLEL_MIN_KEYS = 100000
+
+# Shared worker pool, kept alive between runs to avoid process start-up cost
+_executor = None
+_executor_workers = 0
+
+# Run in progress, shown by the recording panel
+active_run = None
+
+def pipeline_options(settings):
+    """
+    Keyword arguments for curve_math.process_curve from OSCSettings.
+
+    Returns:
+        Dict of options, or None if no post-processing stage is enabled
+    """
+    options = {}
+    if settings.remove_jitter:
+        options['jitter_threshold'] = settings.jitter_threshold
+    if settings.interpolate_keyframes:
+        options['max_gap'] = settings.interpolation_gap_threshold
+        options['interpolation_method'] = settings.interpolation_method
+    if settings.post_smooth_keyframes:
+        options['smooth_sigma'] = curve_math.gaussian_sigma(settings.post_smooth_factor)
+    if settings.decimate_keyframes:
+        options['decimate_tolerance'] = settings.decimate_tolerance
+    return options or None
+
+def get_executor(workers):
+    """Return the shared process pool, recreating it if the worker count changed"""
+    global _executor, _executor_workers
+
+    if _executor is not None and _executor_workers != workers:
+        shutdown_executor()
+    if _executor is None:
+        # Never fork Blender, start clean interpreters instead
+        context = multiprocessing.get_context("spawn")
+        _executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, mp_context=context,
+            initializer=runpy.run_path, initargs=(WORKER_STARTUP, {"PACKAGE": __package__}))
+        _executor_workers = workers
+    return _executor
+
+def shutdown_executor():
+    """Stop the worker processes"""
+    global _executor, _executor_workers
+
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+        _executor_workers = 0
+
+class PostProcessRun:
+    """
+    One post-processing run over a set of F-Curves.
+
+    Curve arrays are read up front, processed in worker processes (or inline
+    for small takes), and written back in one pass once every curve is done.
+    Cancelling before that leaves the curves untouched.
+
+    The run keeps no RNA references while it waits. Curves are found again by
+    object name, data path and index at write-back, and curves that no
+    longer exist are skipped.
+    """
+
+    def __init__(self, curves, options, workers=0):
+        """
+        Args:
+            curves: Sequence of (object, F-Curve) pairs
+            options: Keyword arguments for curve_math.process_curve
+            workers: Number of worker processes, 0 for one per CPU core
+        """
+        self.options = options
+        self.workers = workers or os.cpu_count() or 1
+        self.jobs = []  # ((object name, data path, index), frames, values, handles left, handles right)
+        for obj, fcurve in curves:
+            frames, values = fcurve_io.read_keyframes(fcurve)
+            left = right = None
+            if options.get('interpolation_method') == 'bezier':
+                left, right = fcurve_io.read_handles(fcurve)
+            target = (obj.name, fcurve.data_path, fcurve.array_index)
+            self.jobs.append((target, frames, values, left, right))
+
+        self.keys = sum(len(job[1]) for job in self.jobs)
+        self.results = [None] * len(self.jobs)
+        self.futures = {}
+        self.cancelled = False
+
+    @property
+    def total(self):
+        return len(self.jobs)
+
+    @property
+    def done(self):
+        return sum(result is not None for result in self.results)
+
+    @property
+    def finished(self):
+        return self.done == self.total
+
+    def start(self):
+        """Submit every curve, or process them inline when the take is small"""
+        if self.workers == 1 or self.keys < PARALLEL_MIN_KEYS:
+            for index, (_, frames, values, left, right) in enumerate(self.jobs):
+                self.results[index] = curve_math.process_curve(frames, values, left, right, **self.options)
+            return
+
+        executor = get_executor(self.workers)
+        for index, (_, frames, values, left, right) in enumerate(self.jobs):
+            future = executor.submit(curve_math.process_curve, frames, values, left, right, **self.options)
+            self.futures[future] = index
+
+    def poll(self):
+        """Collect finished curves without blocking. Returns the number done."""
+        for future in [future for future in self.futures if future.done()]:
+            index = self.futures.pop(future)
+            self.results[index] = future.result()
+        return self.done
+
+    def wait(self):
+        """Block until every curve is processed"""
+        for future in concurrent.futures.as_completed(list(self.futures)):
+            self.results[self.futures.pop(future)] = future.result()
+
+    def cancel(self):
+        """Drop curves that have not been processed yet"""
+        self.cancelled = True
+        for future in self.futures:
+            future.cancel()
+        self.futures.clear()
+
+    def write_back(self):
+        """
+        Write every processed curve back in one bulk pass.
+
+        Returns:
+            Dict of summed stats ('removed', 'added', 'decimated', 'keys_before',
+            'keys_after', 'skipped' curves that no longer exist)
+        """
+        totals = {'removed': 0, 'added': 0, 'decimated': 0, 'keys_before': self.keys, 'keys_after': 0, 'skipped': 0}
+        for (target, read_frames, _, _, _), (frames, values, stats, linear) in zip(self.jobs, self.results):
+            fcurve = find_fcurve(*target)
+            if fcurve is None:
+                totals['skipped'] += 1
+                totals['keys_before'] -= len(read_frames)
+                continue
+            fcurve_io.write_keyframes(fcurve, frames, values, replace=True, linear=linear)
+            totals['keys_after'] += len(frames)
+            for key, value in stats.items():
+                totals[key] += value
+        return totals
+
+def find_fcurve(object_name, data_path, index):
+    """The F-Curve of an object's action by data path and index, or None"""
+    obj = bpy.data.objects.get(object_name)
+    if obj is None or not obj.animation_data or not obj.animation_data.action:
+        return None
+    return obj.animation_data.action.fcurves.find(data_path, index=index)
+
+def cancel_active_run():
+    """Drop the running post-processing run, its modal operator ends on its next event"""
+    global active_run
+
+    if active_run is not None:
+        active_run.cancel()
+        active_run = None
+        print("OSC Controller: Post-processing cancelled, curves left unchanged")
+
+# Undo, redo and file loads replace the curves a run has read. Its results
+# would overwrite whatever is there now, so the run is dropped.
+@persistent
+def post_process_reset_handler(*args):
+    cancel_active_run()
+
+_handler_lists = (
+    bpy.app.handlers.load_post,
+    bpy.app.handlers.undo_post,
+    bpy.app.handlers.redo_post,
+)
+
+def register():
+    """Register post-processing functionality"""
+    # The worker pool is started on first use
+    for handler_list in _handler_lists:
+        if post_process_reset_handler not in handler_list:
+            handler_list.append(post_process_reset_handler)
+
+def unregister():
+    """Cancel a running post-processing run and stop the workers"""
+    for handler_list in _handler_lists:
+        if post_process_reset_handler in handler_list:
+            handler_list.remove(post_process_reset_handler)
+    cancel_active_run()
+    shutdown_executor()
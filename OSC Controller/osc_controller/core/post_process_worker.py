@@ -0,0 +1,37 @@
+"""
+Start-up script of the post-processing worker processes.
+
+Workers are plain Python interpreters without bpy, so the add-on package,
+whose __init__ imports bpy, can't be imported in them. The process pool
+runs this file by path in every worker before its first job. It loads
+curve_math under the module name it has in Blender, so jobs pickled as
+calls to curve_math functions resolve, without running the package
+__init__ files and without putting the core directory on sys.path.
+
+Run with PACKAGE, the name of the add-on's core package, in its globals.
+"""
+
+import importlib.util
+import os
+import sys
+import types
+
+def install(package):
+    """Register curve_math as <package>.curve_math in this process"""
+    # Empty parent packages, they only let the full module name resolve
+    parts = package.split(".")
+    for depth in range(1, len(parts) + 1):
+        name = ".".join(parts[:depth])
+        if name not in sys.modules:
+            module = types.ModuleType(name)
+            module.__path__ = []
+            sys.modules[name] = module
+
+    name = f"{package}.curve_math"
+    path = os.path.join(os.path.dirname(os.path.realpath(__file__)), "curve_math.py")
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+
+install(PACKAGE)
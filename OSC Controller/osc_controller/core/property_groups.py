@@ -1,13 +1,15 @@
 import bpy
 from bpy.props import StringProperty, IntProperty, FloatProperty, EnumProperty, PointerProperty, BoolProperty
 from bpy.types import PropertyGroup
+from . import routing
 
 # Data structure to store OSC mappings
 class OSCMapping(PropertyGroup):
     target_object: PointerProperty(
         name="Target Object",
         type=bpy.types.Object,
-        description="Object to be controlled by OSC"
+        description="Object to be controlled by OSC",
+        update=routing.mapping_target_updated
     )
     
     property_types = [
@@ -21,55 +23,71 @@ class OSCMapping(PropertyGroup):
         ('scale_y', "Scale Y", "Y Scale"),
         ('scale_z', "Scale Z", "Z Scale"),
         ('custom_property', "Custom Property", "Use a custom property of the object"),
+        # Appended after custom_property, Blender saves enums by item index
+        ('location', "Location XYZ", "Whole location from a 3 argument message (x, y, z)"),
+        ('rotation_euler', "Rotation XYZ", "Whole Euler rotation from a 3 argument message (x, y, z)"),
+        ('rotation_quaternion', "Rotation Quaternion", "Quaternion rotation from a 4 argument message (w, x, y, z)"),
+        ('scale', "Scale XYZ", "Whole scale from a 3 argument message (x, y, z)"),
+        ('location_rotation', "Location + Rotation", "6-DoF pose from a 6 argument message (x, y, z, rx, ry, rz)"),
+        ('location_quaternion', "Location + Quaternion", "Pose from a 7 argument message (x, y, z, w, qx, qy, qz)"),
+        ('matrix', "Matrix", "Local transform matrix from a 16 argument message (row-major 4x4)"),
     ]
     
     property_type: EnumProperty(
         name="Property",
         description="Property to be controlled",
-        items=property_types
+        items=property_types,
+        update=routing.mapping_target_updated
     )
     
     custom_property_name: StringProperty(
         name="Custom Property Name",
-        description="Name of the custom property if 'Custom Property' is selected"
+        description="Name of the custom property if 'Custom Property' is selected",
+        update=routing.mapping_updated
     )
     
     osc_address: StringProperty(
         name="OSC Address",
         description="OSC address pattern (e.g., /position/x)",
-        default="/blender/value"
+        default="/blender/value",
+        update=routing.mapping_updated
     )
     
     # Raw input range
     raw_min_value: FloatProperty(
         name="Raw Min Value",
         description="Minimum value expected from OSC input",
-        default=0.0
+        default=0.0,
+        update=routing.mapping_updated
     )
     
     raw_max_value: FloatProperty(
         name="Raw Max Value",
         description="Maximum value expected from OSC input",
-        default=1.0
+        default=1.0,
+        update=routing.mapping_updated
     )
     
     # Remapped output range
     remap_min_value: FloatProperty(
         name="Remap Min Value",
         description="Minimum value for remapped output",
-        default=0.0
+        default=0.0,
+        update=routing.mapping_updated
     )
     
     remap_max_value: FloatProperty(
         name="Remap Max Value",
         description="Maximum value for remapped output",
-        default=1.0
+        default=1.0,
+        update=routing.mapping_updated
     )
     
     is_active: BoolProperty(
         name="Active",
         description="Enable/disable this mapping",
-        default=True
+        default=True,
+        update=routing.mapping_updated
     )
     
     show_driver_info: BoolProperty(
@@ -78,6 +96,49 @@ class OSCMapping(PropertyGroup):
         default=False
     )
 
+# Armatures are the only valid bone stream targets
+def poll_armature(self, obj):
+    return obj.type == 'ARMATURE'
+
+# Data structure binding an address template to all pose bones of an armature
+class OSCBoneStream(PropertyGroup):
+    armature: PointerProperty(
+        name="Armature",
+        type=bpy.types.Object,
+        description="Armature whose pose bones are driven by the stream",
+        poll=poll_armature,
+        update=routing.mapping_updated
+    )
+    
+    address_template: StringProperty(
+        name="Address Template",
+        description="OSC address with a * standing for the bone name (e.g., /skel/*/rot)",
+        default="/skel/*/rot",
+        update=routing.mapping_updated
+    )
+    
+    bone_channels = [
+        ('bone_rotation_quaternion', "Rotation Quaternion", "4 arguments per bone (w, x, y, z)"),
+        ('bone_rotation_euler', "Rotation XYZ", "3 arguments per bone (x, y, z), bones must use an Euler rotation mode"),
+        ('bone_location', "Location", "3 arguments per bone (x, y, z)"),
+        ('bone_scale', "Scale", "3 arguments per bone (x, y, z)"),
+        ('bone_location_quaternion', "Location + Quaternion", "7 arguments per bone (x, y, z, w, qx, qy, qz)"),
+    ]
+    
+    channel: EnumProperty(
+        name="Channel",
+        description="Pose bone transform driven by each message",
+        items=bone_channels,
+        update=routing.mapping_updated
+    )
+    
+    is_active: BoolProperty(
+        name="Active",
+        description="Enable/disable this bone stream",
+        default=True,
+        update=routing.mapping_updated
+    )
+
 # Data structure for objects to record keyframes for
 class OSCRecordObject(PropertyGroup):
     target_object: PointerProperty(
@@ -137,6 +198,69 @@ class OSCSettings(PropertyGroup):
         min=1024,
         max=65535
     )
+    
+    server_types = [
+        ('batched', "Batched", "One receive thread that drains all pending datagrams per wakeup, in order"),
+        ('threading', "Threading", "Handle every datagram in a new thread (python-osc default)"),
+        ('blocking', "Blocking", "Handle datagrams one at a time on a single thread"),
+        ('asyncio', "Asyncio", "One background event loop hosting several UDP and TCP listeners"),
+    ]
+    
+    server_type: EnumProperty(
+        name="Server Type",
+        description="How incoming OSC datagrams are received and dispatched",
+        items=server_types,
+        default='batched'
+    )
+    
+    extra_listeners: StringProperty(
+        name="Extra Listeners",
+        description="Comma-separated additional listeners for the asyncio server, e.g. 'udp:9002, tcp:9003, tcp:192.168.1.5:9004' (TCP uses OSC 1.1 SLIP framing)",
+        default=""
+    )
+    
+    receive_buffer_size: IntProperty(
+        name="Receive Buffer (KB)",
+        description="Socket receive buffer size requested from the OS, absorbs bursts of datagrams",
+        default=1024,
+        min=64,
+        max=65536
+    )
+    
+    # Traffic capture and replay
+    capture_path: StringProperty(
+        name="Capture File",
+        description="Base name of capture files. Every capture is written to a new numbered file next to it (osc_capture_001.osccap, ...)",
+        default="//osc_capture.osccap",
+        subtype='FILE_PATH'
+    )
+    
+    last_capture_path: StringProperty(
+        name="Last Capture",
+        description="Capture file the last capture was written to",
+        default="",
+        subtype='FILE_PATH'
+    )
+    
+    replay_speed: FloatProperty(
+        name="Replay Speed",
+        description="Replay speed relative to the captured timing (0 = as fast as possible)",
+        default=1.0,
+        min=0.0,
+        max=100.0
+    )
+    
+    replay_targets = [
+        ('dispatcher', "Dispatcher", "Feed packets straight into the running server's dispatcher"),
+        ('udp', "UDP", "Send packets to the server's IP address and port, exercising the receive engine"),
+    ]
+    
+    replay_target: EnumProperty(
+        name="Replay Target",
+        description="Where replayed packets are delivered",
+        items=replay_targets,
+        default='udp'
+    )
 
     interpolate_keyframes: BoolProperty(
         name="Interpolate Missing Frames",
@@ -151,6 +275,103 @@ class OSCSettings(PropertyGroup):
         min=2,
         max=20
     )
+
+    interpolation_method: EnumProperty(
+        name="Interpolation Method",
+        description="How values for missing frames are computed",
+        items=[
+            ('bezier', "Bezier", "Evaluate the recorded curve through its keyframe handles"),
+            ('smoothstep', "Smoothstep", "Ease between the keyframes on either side of the gap"),
+        ],
+        default='bezier'
+    )
+
+    decimate_keyframes: BoolProperty(
+        name="Decimate Keyframes",
+        description="Remove keyframes that the curve can do without after recording. Segments that lose keyframes become linear",
+        default=False
+    )
+
+    decimate_tolerance: FloatProperty(
+        name="Decimate Tolerance",
+        description="Largest value error a removed keyframe may leave behind",
+        default=0.001,
+        min=0.00001,
+        max=1.0,
+        precision=5
+    )
+
+    parallel_post_processing: BoolProperty(
+        name="Process in Background",
+        description="Run post-recording processing in worker processes with progress and Esc to cancel",
+        default=True
+    )
+
+    post_process_workers: IntProperty(
+        name="Worker Processes",
+        description="Number of worker processes for post-recording processing (0 = one per CPU core)",
+        default=0,
+        min=0,
+        max=64
+    )
+
+    render_mode: EnumProperty(
+        name="Render Mode",
+        description="How /renderimage renders; the OSC server stays running either way",
+        items=[
+            ('interactive', "This Session", "Render in this Blender session; OSC values received during the render are held and applied once it ends"),
+            ('background', "Background Queue", "Queue a snapshot of the current state and render it in headless Blender processes, so the live rig keeps responding"),
+        ],
+        default='interactive'
+    )
+
+    render_workers: IntProperty(
+        name="Render Workers",
+        description="Number of headless Blender processes rendering queued /renderimage jobs at once",
+        default=1,
+        min=1,
+        max=16
+    )
+
+    render_reply_enabled: BoolProperty(
+        name="Send Render Status",
+        description="Report queue depth, job times and finished output paths over OSC",
+        default=False
+    )
+
+    render_reply_host: StringProperty(
+        name="Reply Host",
+        description="Host render status messages are sent to",
+        default="127.0.0.1"
+    )
+
+    render_reply_port: IntProperty(
+        name="Reply Port",
+        description="Port render status messages are sent to",
+        default=9002,
+        min=1,
+        max=65535
+    )
+
+    record_to_disk: BoolProperty(
+        name="Stream Take to Disk",
+        description="Stream recorded samples to a compressed take file instead of keeping them in memory, for takes of any length",
+        default=False
+    )
+
+    take_path: StringProperty(
+        name="Take File",
+        description="Base name of take files. Every take is streamed to a new numbered file next to it (osc_take_001.osctake, ...)",
+        default="//osc_take.osctake",
+        subtype='FILE_PATH'
+    )
+
+    last_take_path: StringProperty(
+        name="Last Take",
+        description="Take file the last streamed recording was written to",
+        default="",
+        subtype='FILE_PATH'
+    )
     
     # Add frame rate options
     record_frame_rates = [
@@ -169,6 +390,16 @@ class OSCSettings(PropertyGroup):
         default='30'
     )
     
+    recording_clock: EnumProperty(
+        name="Recording Clock",
+        description="What decides the time of each recorded sample",
+        items=[
+            ('timestamps', "Receive Timestamps", "Sample values when they are applied and on every frame change, and resample them onto frames at the keyframe rate from their times"),
+            ('playback', "Playback Frames", "Sample values on every frame change during timeline playback"),
+        ],
+        default='timestamps'
+    )
+    
     # Post-processing smoothing options
     post_smooth_keyframes: BoolProperty(
         name="Apply Gaussian Smoothing",
@@ -178,7 +409,7 @@ class OSCSettings(PropertyGroup):
     
     post_smooth_factor: FloatProperty(
         name="Smoothing Factor",
-        description="Strength of the post-recording smoothing (1.0 = standard)",
+        description="Standard deviation of the post-recording Gaussian smoothing, in frames",
         default=1.0,
         min=0.1,
         max=5.0,
@@ -218,6 +449,8 @@ class OSCSettings(PropertyGroup):
         ('buffer', "Buffer", "Average over multiple values"),
         ('threshold', "Threshold", "Only update when change exceeds threshold"),
         ('both', "Both", "Use both buffer and threshold methods"),
+        ('ema', "Exponential", "Exponential moving average, cheap and lag-adjustable"),
+        ('one_euro', "One-Euro", "Adaptive low-pass filter: smooth when slow, responsive when fast"),
     ]
     
     smoothing_method: EnumProperty(
@@ -243,6 +476,39 @@ class OSCSettings(PropertyGroup):
         max=1.0,
         precision=4
     )
+    
+    smoothing_ema_factor: FloatProperty(
+        name="EMA Factor",
+        description="Weight of each new value in the exponential moving average (1.0 = no smoothing)",
+        default=0.5,
+        min=0.01,
+        max=1.0
+    )
+    
+    one_euro_min_cutoff: FloatProperty(
+        name="Min Cutoff",
+        description="One-Euro cutoff frequency (Hz) for slow movement, lower = smoother",
+        default=1.0,
+        min=0.01,
+        max=30.0
+    )
+    
+    one_euro_beta: FloatProperty(
+        name="Beta",
+        description="One-Euro speed coefficient, higher = less lag during fast movement",
+        default=0.007,
+        min=0.0,
+        max=10.0,
+        precision=4
+    )
+    
+    one_euro_d_cutoff: FloatProperty(
+        name="Derivative Cutoff",
+        description="One-Euro cutoff frequency (Hz) for the speed estimate",
+        default=1.0,
+        min=0.01,
+        max=30.0
+    )
 
 # OSC Debug Settings
 class OSCDebugSettings(PropertyGroup):
@@ -252,30 +518,43 @@ class OSCDebugSettings(PropertyGroup):
         default=False
     )
     
-    last_received_address: StringProperty(
-        name="Last Received Address",
-        default="None"
-    )
-    
-    last_received_value: StringProperty(
-        name="Last Received Value",
-        default="None"
-    )
-    
     show_all_values: BoolProperty(
         name="Show All OSC Values",
         description="Show all received OSC values",
         default=False
     )
+    
+    address_filter: StringProperty(
+        name="Filter",
+        description="Only show addresses containing this text (case-insensitive)",
+        default=""
+    )
+    
+    page: IntProperty(
+        name="Page",
+        description="Page of received OSC values to show",
+        default=1,
+        min=1
+    )
+    
+    page_size: IntProperty(
+        name="Per Page",
+        description="Number of OSC values shown per page",
+        default=20,
+        min=5,
+        max=200
+    )
 
 # Register all property groups
 def register():
     bpy.utils.register_class(OSCMapping)
+    bpy.utils.register_class(OSCBoneStream)
     bpy.utils.register_class(OSCRecordObject)
     bpy.utils.register_class(OSCSettings)
     bpy.utils.register_class(OSCDebugSettings)
     
     bpy.types.Scene.osc_mappings = bpy.props.CollectionProperty(type=OSCMapping)
+    bpy.types.Scene.osc_bone_streams = bpy.props.CollectionProperty(type=OSCBoneStream)
     bpy.types.Scene.osc_record_objects = bpy.props.CollectionProperty(type=OSCRecordObject)
     bpy.types.Scene.osc_settings = bpy.props.PointerProperty(type=OSCSettings)
     bpy.types.Scene.osc_debug = bpy.props.PointerProperty(type=OSCDebugSettings)
@@ -283,6 +562,7 @@ def register():
 # Unregister all property groups
 def unregister():
     del bpy.types.Scene.osc_mappings
+    del bpy.types.Scene.osc_bone_streams
     del bpy.types.Scene.osc_record_objects
     del bpy.types.Scene.osc_settings
     del bpy.types.Scene.osc_debug
@@ -290,4 +570,5 @@ def unregister():
     bpy.utils.unregister_class(OSCDebugSettings)
     bpy.utils.unregister_class(OSCSettings)
     bpy.utils.unregister_class(OSCRecordObject)
+    bpy.utils.unregister_class(OSCBoneStream)
     bpy.utils.unregister_class(OSCMapping)
\ No newline at end of file
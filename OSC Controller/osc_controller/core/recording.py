@@ -1,163 +1,546 @@
 import bpy
-import datetime
+import time
+import numpy as np
 from bpy.app import timers
+from bpy.app.handlers import persistent
+from . import fcurve_io
+from . import curve_math
+from . import take_stream
+from . import post_process
+from . import utils
 
 # Recording globals
 is_recording = False  # Flag to track recording state
-keyframe_timer = None  # Timer for keyframing
-
-# Function to insert keyframes for recorded objects
-def insert_keyframes():
-    """Insert keyframes for recorded objects"""
-    print("OSC Controller: Inserting keyframes...")
-    for obj_record in bpy.context.scene.osc_record_objects:
-        if not obj_record.target_object or not obj_record.is_active:
-            continue
-            
-        target = obj_record.target_object
-        frame = bpy.context.scene.frame_current
-        print(f"OSC Controller: Adding keyframes for {target.name} at frame {frame}")
-        
-        # Keyframe location if enabled
-        if obj_record.record_location:
-            target.keyframe_insert(data_path="location", frame=frame)
-            print(f"OSC Controller: Added location keyframes")
-        
-        # Keyframe rotation if enabled
-        if obj_record.record_rotation:
-            target.keyframe_insert(data_path="rotation_euler", frame=frame)
-            print(f"OSC Controller: Added rotation keyframes")
-        
-        # Keyframe scale if enabled
-        if obj_record.record_scale:
-            target.keyframe_insert(data_path="scale", frame=frame)
-            print(f"OSC Controller: Added scale keyframes")
-        
-        # Insert custom property keyframes if applicable
-        if obj_record.record_custom_properties and obj_record.custom_properties:
-            custom_props = [prop.strip() for prop in obj_record.custom_properties.split(',')]
-            for prop_name in custom_props:
-                if prop_name in target:
-                    target.keyframe_insert(data_path=f'["{prop_name}"]', frame=frame)
-                    print(f"OSC Controller: Added custom property keyframe for {prop_name}")
-
-# Function that's called each frame during recording
-def keyframe_recording_callback():
-    print("OSC Controller: Keyframe callback running...")
-    if is_recording:
-        # Get the current time
-        current_time = datetime.datetime.now()
-        
-        # Get the desired frame rate
-        try:
-            fps = int(bpy.context.scene.osc_settings.keyframe_rate)
-        except:
-            fps = 30  # Default to 30 fps if there's an issue
-        
-        # Calculate time between frames in seconds
-        frame_time = 1.0 / fps
-        
-        # Check if we've reached the end of the frame range
-        if bpy.context.scene.osc_settings.auto_stop_at_end:
-            current_frame = bpy.context.scene.frame_current
-            end_frame = bpy.context.scene.frame_end
-            
-            if current_frame >= end_frame:
-                # Stop recording
-                print("OSC Controller: Reached end frame, stopping recording")
-                timers.register(stop_recording)
-                return None
-        
-        # Only insert keyframes at the desired rate
-        if not hasattr(keyframe_recording_callback, "last_keyframe_time"):
-            print("OSC Controller: First keyframe of recording")
-            keyframe_recording_callback.last_keyframe_time = current_time
-            insert_keyframes()
+take_buffer = None  # Samples of the take in progress
+
+# Sample rows allocated up front; the take buffer doubles when it runs out
+INITIAL_SAMPLES = 1024
+
+class TakeBuffer:
+    """
+    Preallocated (sample, channel) arrays for one recording take.
+
+    The channel layout is fixed when the take starts, so taking a sample is a
+    handful of slice assignments with no keyframe insertion. The samples are
+    written to F-Curves in bulk when the take is flushed.
+
+    With the 'timestamps' clock every sample carries the monotonic receive time
+    of the values it holds, and the take is resampled onto an exact frame grid
+    at the keyframe rate when flushed. Samples are also taken on every frame
+    change, stamped with the current time, so channels that change without
+    going through the apply queue, such as driven ones, are recorded too. With the 'playback' clock every sample
+    carries the scene frame it was taken on.
+
+    When streaming to a take file the arrays hold one fixed-size chunk, which
+    is handed to a background writer whenever it fills up, so memory use does
+    not grow with the length of the take. If the disk falls behind, the
+    arrays grow until the writer takes the samples, so the main thread never
+    waits for the disk.
+    """
+
+    def __init__(self, scene, clock='timestamps', stream_path=None):
+        self.objects = []  # (object, first column, [(data_path, index, group), ...])
+        column = 0
+        for obj_record in scene.osc_record_objects:
+            if not utils.object_alive(obj_record.target_object) or not obj_record.is_active:
+                continue
+            channels = record_channels(obj_record)
+            if channels:
+                self.objects.append((obj_record.target_object, column, channels))
+                column += len(channels)
+
+        settings = scene.osc_settings
+        self.clock = clock
+        self.start_time = time.monotonic()
+        self.latest_time = self.start_time  # Keeps timestamps in order
+        self.start_frame = scene.frame_current
+        self.scene_fps = scene.render.fps / scene.render.fps_base
+        self.keyframe_rate = float(settings.keyframe_rate)
+        self.end_frame = scene.frame_end if settings.auto_stop_at_end else None
+
+        self.channel_count = column
+        self.count = 0  # Samples held in the arrays
+        self.total = 0  # Samples taken over the whole take
+        capacity = take_stream.CHUNK_ROWS if stream_path else INITIAL_SAMPLES
+        self.times = np.empty(capacity, dtype=np.float64)
+        self.samples = np.empty((capacity, column), dtype=np.float64)
+
+        # Columns of channels whose object or custom property was removed
+        # during the take, with the value they hold from then on
+        self.dropped = {}
+
+        self.stream = None
+        self.backlogged = False  # The writer refused the last chunk
+        self.stream_error_reported = False
+        if stream_path:
+            self.stream = take_stream.TakeWriter(stream_path, self.describe())
+
+    def describe(self):
+        """JSON-serializable description of the take, stored in take files"""
+        channels = []
+        for target, _, object_channels in self.objects:
+            for data_path, index, group in object_channels:
+                channels.append({"object": target.name, "data_path": data_path, "index": index, "group": group})
+        return {
+            "clock": self.clock,
+            "start_time": self.start_time,
+            "start_frame": self.start_frame,
+            "scene_fps": self.scene_fps,
+            "keyframe_rate": self.keyframe_rate,
+            "end_frame": self.end_frame,
+            "channels": channels,
+        }
+
+    def _grow(self):
+        capacity = len(self.times) * 2
+        times = np.empty(capacity, dtype=np.float64)
+        samples = np.empty((capacity, self.channel_count), dtype=np.float64)
+        times[:self.count] = self.times[:self.count]
+        samples[:self.count] = self.samples[:self.count]
+        self.times = times
+        self.samples = samples
+
+    def sample(self, clock_value):
+        """
+        Store the current value of every channel.
+
+        Args:
+            clock_value: Monotonic time ('timestamps') or scene frame ('playback')
+        """
+        if self.clock == 'timestamps':
+            # A batch received before the last frame tick is stamped at the tick
+            clock_value = max(clock_value, self.latest_time)
+            self.latest_time = clock_value
+        if self.count >= len(self.times):
+            if self.stream is not None:
+                self.spill()
+            else:
+                self._grow()
+        row = self.samples[self.count]
+        for target, column, channels in self.objects:
+            failed = read_channels(target, channels, row, column, self.dropped)
+            if failed:
+                self.drop_columns(channels, column, failed)
+        for column, value in self.dropped.items():
+            row[column] = value
+        self.times[self.count] = clock_value
+        self.count += 1
+        self.total += 1
+
+    def drop_columns(self, channels, column, failed):
+        """Stop reading channels that can no longer be read, holding their last value"""
+        for failed_column in failed:
+            held = self.samples[self.count - 1, failed_column] if self.count else 0.0
+            self.dropped[failed_column] = held
+        data_paths = sorted({channels[c - column][0] for c in failed})
+        print(f"OSC Controller: Stopped recording {', '.join(data_paths)}, "
+              f"the recorded object or custom property was removed")
+
+    def spill(self, block=False):
+        """
+        Hand the buffered samples to the take file writer and start a new chunk.
+
+        When the writer is behind, the samples stay buffered and the arrays
+        grow; they are handed over with the next chunk.
+        """
+        stream = self.stream
+        if stream.error is not None and not self.stream_error_reported:
+            self.stream_error_reported = True
+            print(f"OSC Controller: Writing take file {stream.path} failed, "
+                  f"samples from now on are lost: {stream.error}")
+
+        if not stream.write_chunk(self.times[:self.count], self.samples[:self.count], block):
+            if not self.backlogged:
+                print("OSC Controller: Take file writer is falling behind, buffering samples in memory")
+                self.backlogged = True
+            self._grow()
+            return
+
+        self.count = 0
+        if self.backlogged:
+            print("OSC Controller: Take file writer caught up")
+            self.backlogged = False
+            # Back to one chunk of memory
+            self.times = np.empty(take_stream.CHUNK_ROWS, dtype=np.float64)
+            self.samples = np.empty((take_stream.CHUNK_ROWS, self.channel_count), dtype=np.float64)
+
+    def close_stream(self):
+        """
+        Write the last chunk and close the take file.
+
+        Returns:
+            The closed TakeWriter
+        """
+        stream = self.stream
+        if self.count:
+            self.spill(block=True)
+        stream.close()
+        self.stream = None
+        return stream
+
+    def frame_at(self, timestamp):
+        """Scene frame a monotonic time falls on, counted from the start of the take"""
+        return self.start_frame + (timestamp - self.start_time) * self.scene_fps
+
+    def resample(self):
+        """Resample the timestamped samples onto the keyframe grid"""
+        return curve_math.resample_to_grid(
+            self.times[:self.count], self.samples[:self.count], self.start_time,
+            self.start_frame, self.scene_fps, self.keyframe_rate, self.end_frame)
+
+    def by_frame(self):
+        """Samples keyed by the frame they were taken on, the last sample of a frame winning"""
+        return curve_math.last_per_frame(self.times[:self.count], self.samples[:self.count])
+
+    def flush(self):
+        """
+        Write the take to F-Curves, one bulk write per channel.
+
+        Returns:
+            Number of F-Curves written
+        """
+        if not self.count or not self.channel_count:
+            return 0
+
+        if self.clock == 'timestamps':
+            frames, samples = self.resample()
         else:
-            elapsed = (current_time - keyframe_recording_callback.last_keyframe_time).total_seconds()
-            if elapsed >= frame_time:
-                print(f"OSC Controller: Adding keyframe after {elapsed:.3f}s (target: {frame_time:.3f}s)")
-                insert_keyframes()
-                keyframe_recording_callback.last_keyframe_time = current_time
-        
-        return 0.01  # Check again in 10ms (more responsive than waiting a full frame)
+            frames, samples = self.by_frame()
+
+        written = 0
+        for target, column, channels in self.objects:
+            # Dropped channels are not written
+            kept = [i for i in range(len(channels)) if column + i not in self.dropped]
+            if not kept:
+                continue
+            block = samples[:, [column + i for i in kept]]
+            try:
+                written += fcurve_io.write_channels(target, [channels[i] for i in kept], frames, block)
+            except (ReferenceError, RuntimeError) as e:
+                print(f"OSC Controller: Could not write keyframes for recorded object: {e}")
+        return written
+
+def record_channels(obj_record):
+    """
+    List the animated channels of a recorded object.
+
+    Returns:
+        List of (data_path, array index, action group or None)
+    """
+    target = obj_record.target_object
+    group = fcurve_io.TRANSFORM_GROUP
+    paths = []
+    if obj_record.record_location:
+        paths.append("location")
+    if obj_record.record_rotation:
+        if target.rotation_mode == 'QUATERNION':
+            paths.append("rotation_quaternion")
+        else:
+            paths.append("rotation_euler")
+    if obj_record.record_scale:
+        paths.append("scale")
+
+    channels = [
+        (path, index, group)
+        for path in paths
+        for index in range(utils.VECTOR_SIZES[path])
+    ]
+
+    # Custom properties with a numeric value, one channel each
+    if obj_record.record_custom_properties and obj_record.custom_properties:
+        for prop_name in (prop.strip() for prop in obj_record.custom_properties.split(',')):
+            if prop_name in target and isinstance(target[prop_name], (int, float)):
+                channels.append((f'["{prop_name}"]', 0, None))
+    return channels
+
+def read_channels(target, channels, row, column, skip=()):
+    """
+    Copy the current channel values of an object into a sample row.
+
+    Args:
+        skip: Columns not to read
+
+    Returns:
+        Columns that could not be read because the object or the custom
+        property was removed
+    """
+    failed = []
+    index = 0
+    count = len(channels)
+    while index < count:
+        data_path = channels[index][0]
+        custom = data_path.startswith('["')
+        size = 1 if custom else utils.VECTOR_SIZES[data_path]
+        first = column + index
+        if first not in skip:
+            try:
+                if custom:
+                    row[first] = target[data_path[2:-2]]
+                else:
+                    row[first:first + size] = getattr(target, data_path)
+            except (KeyError, ReferenceError):
+                failed.extend(range(first, first + size))
+        index += size
+    return failed
+
+def recorded_fcurves(rec_obj, min_points=1):
+    """
+    F-Curves of a record object's recorded channels.
+
+    Args:
+        rec_obj: OSCRecordObject
+        min_points: Skip curves with fewer keyframe points
+
+    Returns:
+        List of F-Curves
+    """
+    obj = rec_obj.target_object
+    animation_data = obj.animation_data
+    if not animation_data or not animation_data.action:
+        return []
+    action = animation_data.action
     
-    # Clean up when recording stops
-    if hasattr(keyframe_recording_callback, "last_keyframe_time"):
-        del keyframe_recording_callback.last_keyframe_time
+    channels = []
+    if rec_obj.record_location:
+        channels.extend(('location', i) for i in range(3))
+    if rec_obj.record_rotation:
+        channels.extend(('rotation_euler', i) for i in range(3))
+        channels.extend(('rotation_quaternion', i) for i in range(4))
+    if rec_obj.record_scale:
+        channels.extend(('scale', i) for i in range(3))
+    if rec_obj.record_custom_properties and rec_obj.custom_properties:
+        custom_props = [prop.strip() for prop in rec_obj.custom_properties.split(',')]
+        channels.extend((f'["{prop_name}"]', 0) for prop_name in custom_props)
     
-    print("OSC Controller: Keyframe callback stopping")
-    return None  # Stop the timer
+    fcurves = []
+    for data_path, index in channels:
+        fcurve = action.fcurves.find(data_path, index=index)
+        if fcurve and len(fcurve.keyframe_points) >= min_points:
+            fcurves.append(fcurve)
+    return fcurves
+
+def import_take(path, frame_start=None, frame_end=None):
+    """
+    Load a streamed take into F-Curves, one bulk write per channel.
+
+    Only the chunks overlapping the frame range are decompressed. Channels of
+    objects that no longer exist are skipped.
+
+    Args:
+        path: Take file path
+        frame_start, frame_end: Inclusive scene frame range to load, None for open-ended
+
+    Returns:
+        Tuple of (F-Curves written, keyframes per curve, names of missing objects)
+    """
+    reader = take_stream.TakeReader(path)
+    header = reader.header
+    clock = header["clock"]
+    start_time = header["start_time"]
+    start_frame = header["start_frame"]
+    scene_fps = header["scene_fps"]
+
+    # Frame range to clock range
+    def to_clock(frame):
+        if frame is None or clock != 'timestamps':
+            return frame
+        return start_time + (frame - start_frame) / scene_fps
+
+    # Group channel columns by object
+    groups = {}
+    for column, channel in enumerate(reader.channels):
+        groups.setdefault(channel["object"], []).append(column)
+    objects = {name: bpy.data.objects.get(name) for name in groups}
+    missing = [name for name, obj in objects.items() if obj is None]
+    columns = [column for name, object_columns in groups.items() if objects[name] for column in object_columns]
+    if not columns:
+        return 0, 0, missing
+
+    times, samples = reader.read(columns, to_clock(frame_start), to_clock(frame_end))
+    if not len(times):
+        return 0, 0, missing
+    if clock == 'timestamps':
+        frames, samples = curve_math.resample_to_grid(
+            times, samples, start_time, start_frame, scene_fps,
+            header["keyframe_rate"], header["end_frame"])
+    else:
+        frames, samples = curve_math.last_per_frame(times, samples)
+
+    written = 0
+    position = {column: i for i, column in enumerate(columns)}
+    for name, object_columns in groups.items():
+        if objects[name] is None:
+            continue
+        channels = [(reader.channels[c]["data_path"], reader.channels[c]["index"], reader.channels[c]["group"])
+                    for c in object_columns]
+        block = samples[:, [position[c] for c in object_columns]]
+        written += fcurve_io.write_channels(objects[name], channels, frames, block)
+    return written, len(frames), missing
+
+def on_values_applied(received_at):
+    """
+    Sample the take after the drain timer applied a batch of values.
+
+    Args:
+        received_at: Newest monotonic receive time of the applied values
+    """
+    if is_recording and take_buffer is not None and take_buffer.clock == 'timestamps':
+        take_buffer.sample(received_at)
+
+@persistent
+def recording_frame_handler(scene, depsgraph=None):
+    """Sample on playback frames and stop the take at the end frame"""
+    if not is_recording or take_buffer is None:
+        return
+    
+    frame = scene.frame_current
+    end_frame = take_buffer.end_frame
+    if end_frame is None or frame <= end_frame:
+        # With the timestamps clock this catches driven channels, which
+        # change on frame changes rather than in the drain timer
+        take_buffer.sample(frame if take_buffer.clock == 'playback' else time.monotonic())
+    
+    if end_frame is not None and frame >= end_frame:
+        # Leave the handler before stopping playback
+        print("OSC Controller: Reached end frame, stopping recording")
+        if not timers.is_registered(stop_recording):
+            timers.register(stop_recording)
 
 # Function to start recording frames
 def start_recording():
-    global is_recording, keyframe_timer
+    global is_recording, take_buffer
     
     # Make sure we're not already recording
     if is_recording:
         print("OSC Controller: Already recording, ignoring start request")
         return
-        
+    
+    # A post-processing run of the previous take would overwrite the new one
+    post_process.cancel_active_run()
+    
+    # Fix the channel layout of the take and take the first sample
+    scene = bpy.context.scene
+    settings = scene.osc_settings
+    clock = settings.recording_clock
+    stream_path = None
+    if settings.record_to_disk:
+        # Every take gets a new numbered file, earlier takes are never replaced
+        stream_path = take_stream.numbered_path(bpy.path.abspath(settings.take_path))
+    try:
+        take_buffer = TakeBuffer(scene, clock, stream_path)
+    except OSError as e:
+        print(f"OSC Controller: Could not open take file: {e}")
+        return
+    if stream_path:
+        settings.last_take_path = stream_path
+    take_buffer.sample(take_buffer.start_time if clock == 'timestamps' else scene.frame_current)
     is_recording = True
-    print("OSC Controller: Starting recording frames")
+    print(f"OSC Controller: Starting recording frames ({take_buffer.channel_count} channels, {clock} clock)")
+    
+    if recording_frame_handler not in bpy.app.handlers.frame_change_post:
+        bpy.app.handlers.frame_change_post.append(recording_frame_handler)
     
     # Start playing the timeline if it's not already playing
     if not bpy.context.screen.is_animation_playing:
         bpy.ops.screen.animation_play()
         print("OSC Controller: Started animation playback")
-    
-    # Set up a timer to insert keyframes at the specified rate
-    if keyframe_timer is not None and keyframe_timer in timers.get_list():
-        try:
-            timers.unregister(keyframe_timer)
-            print("OSC Controller: Removed existing timer")
-        except:
-            pass
-    
-    # Create a new timer
-    keyframe_timer = timers.register(keyframe_recording_callback, persistent=True)
-    print(f"OSC Controller: Registered new keyframe timer: {keyframe_timer}")
+
+def open_window():
+    """An open window for UI operators, None when Blender runs without a UI"""
+    windows = bpy.context.window_manager.windows
+    return windows[0] if windows else None
 
 # Function to stop recording frames
 def stop_recording():
-    global is_recording, keyframe_timer
+    if not is_recording:
+        return None
+    
+    # The auto-stop timer and the OSC stop message run without a window in
+    # the context. Stop in an open window, so playback can be stopped and
+    # post-processing runs modal instead of blocking the UI until it is done.
+    window = None
+    if getattr(bpy.context, "window", None) is None:
+        window = open_window()
+    if window is not None:
+        with bpy.context.temp_override(window=window):
+            finish_recording()
+    else:
+        finish_recording()
+    return None
+
+def finish_recording():
+    """Stop the take, write it out and start post-processing"""
+    global is_recording, take_buffer
     is_recording = False
     
-    # Stop playing the timeline
-    if bpy.context.screen.is_animation_playing:
-        bpy.ops.screen.animation_play()
+    if recording_frame_handler in bpy.app.handlers.frame_change_post:
+        bpy.app.handlers.frame_change_post.remove(recording_frame_handler)
     
-    # The keyframe timer will auto-stop when is_recording is False
-    if keyframe_timer and keyframe_timer in timers.get_list():
-        timers.unregister(keyframe_timer)
-    keyframe_timer = None
+    # Stop playing the timeline, there is no screen when running without a UI
+    screen = bpy.context.screen
+    if screen is not None and screen.is_animation_playing:
+        bpy.ops.screen.animation_play()
     
-    # Apply jitter removal if enabled
-    if bpy.context.scene.osc_settings.remove_jitter:
-        bpy.ops.osc.remove_jitter()
+    # A streamed take stays on disk until it is imported
+    if take_buffer is not None and take_buffer.stream is not None:
+        if take_buffer.clock == 'timestamps':
+            take_buffer.sample(time.monotonic())
+        stream = take_buffer.close_stream()
+        if stream.error is not None:
+            print(f"OSC Controller: Take file {stream.path} is incomplete, {stream.rows} of "
+                  f"{take_buffer.total} samples were written before writing failed: {stream.error}")
+        else:
+            print(f"OSC Controller: Streamed {take_buffer.total} samples ({stream.chunks} chunks, "
+                  f"{stream.bytes_written} bytes) to {stream.path}")
+        take_buffer = None
+        print("OSC Controller: Stopped recording frames")
+        return
     
-    # Apply interpolation if enabled
-    if bpy.context.scene.osc_settings.interpolate_keyframes:
-        bpy.ops.osc.interpolate_keyframes()
+    # Write the whole take to F-Curves before post-processing them
+    if take_buffer is not None:
+        if take_buffer.clock == 'timestamps':
+            # Hold the last values until the moment recording stopped
+            take_buffer.sample(time.monotonic())
+        written = take_buffer.flush()
+        print(f"OSC Controller: Wrote {take_buffer.total} samples to {written} F-Curves")
+        take_buffer = None
     
-    # Apply post-smoothing if enabled
-    if bpy.context.scene.osc_settings.post_smooth_keyframes:
-        bpy.ops.osc.smooth_keyframes()
+    settings = bpy.context.scene.osc_settings
+    if settings.parallel_post_processing:
+        # All enabled stages in worker processes, modal when there is a window
+        if post_process.pipeline_options(settings) and bpy.context.scene.osc_record_objects:
+            if getattr(bpy.context, "window", None):
+                bpy.ops.osc.process_recording('INVOKE_DEFAULT')
+            else:
+                bpy.ops.osc.process_recording()
+    else:
+        # Apply jitter removal if enabled
+        if settings.remove_jitter:
+            bpy.ops.osc.remove_jitter()
+        
+        # Apply interpolation if enabled
+        if settings.interpolate_keyframes:
+            bpy.ops.osc.interpolate_keyframes()
+        
+        # Apply post-smoothing if enabled
+        if settings.post_smooth_keyframes:
+            bpy.ops.osc.smooth_keyframes()
+        
+        # Apply decimation last, so the other stages see every recorded frame
+        if settings.decimate_keyframes:
+            bpy.ops.osc.decimate_keyframes()
     
     print("OSC Controller: Stopped recording frames")
 
 def register():
     """Register recording functionality"""
-    pass  # No specific registration required for this module
+    pass  # The frame handler is only installed while a take is recorded
 
 def unregister():
     """Unregister recording functionality"""
-    global is_recording, keyframe_timer
-    
     # Stop recording if active
     if is_recording:
         stop_recording()
     
-    # Remove the keyframe timer if it exists
-    if keyframe_timer and keyframe_timer in timers.get_list():
-        timers.unregister(keyframe_timer)
\ No newline at end of file
+    if recording_frame_handler in bpy.app.handlers.frame_change_post:
+        bpy.app.handlers.frame_change_post.remove(recording_frame_handler)
@@ -0,0 +1,220 @@
+import bpy
+from bpy.app import timers
+from bpy.app.handlers import persistent
+from . import utils
+
+def unremapped_arguments(property_type):
+    """Indices of the OSC arguments a mapping's range is not applied to"""
+    if property_type == 'matrix':
+        return frozenset(range(utils.MATRIX_SIZE))
+    fixed = set()
+    for attribute, first in utils.VECTOR_PROPERTIES.get(property_type, ()):
+        if attribute == 'rotation_quaternion':
+            fixed.update(range(first, first + utils.VECTOR_SIZES[attribute]))
+    return frozenset(fixed)
+
+class MappingRecord:
+    """
+    Immutable snapshot of an active OSCMapping used by the network thread.
+
+    The remap from the raw range to the output range is precomputed as
+    ``value * scale + offset`` so no RNA access is needed per message.
+    """
+    __slots__ = ("target_object", "property_type", "custom_property_name",
+                 "arity", "scale", "offset", "scales", "offsets", "key", "mapped_key")
+
+    def __init__(self, mapping):
+        self.target_object = mapping.target_object
+        self.property_type = mapping.property_type
+        self.custom_property_name = mapping.custom_property_name
+        
+        # Number of OSC arguments consumed, more than one for vector and matrix types
+        self.arity = utils.property_arity(self.property_type)
+
+        # Same semantics as utils.remap_value, folded into a linear function
+        raw_range = mapping.raw_max_value - mapping.raw_min_value
+        if raw_range == 0:
+            self.scale = 0.0
+            self.offset = mapping.remap_min_value
+        else:
+            self.scale = (mapping.remap_max_value - mapping.remap_min_value) / raw_range
+            self.offset = mapping.remap_min_value - mapping.raw_min_value * self.scale
+
+        # Per-argument remap for vector and matrix types. Quaternion and
+        # matrix components pass through unchanged, scaling them would break
+        # unit length and the homogeneous row of the matrix.
+        fixed = unremapped_arguments(self.property_type)
+        self.scales = tuple(1.0 if i in fixed else self.scale for i in range(self.arity))
+        self.offsets = tuple(0.0 if i in fixed else self.offset for i in range(self.arity))
+
+        # Apply queue key and driver lookup key
+        self.key = (self.target_object, self.property_type, self.custom_property_name)
+        self.mapped_key = f"{mapping.osc_address}_mapped"
+
+    def remap(self, value):
+        """Remap a raw OSC value into the output range"""
+        return value * self.scale + self.offset
+
+    def remap_vector(self, args):
+        """
+        Remap the first arity OSC arguments into the output range.
+
+        Returns:
+            Tuple of floats, or None if the message has too few arguments
+        """
+        if len(args) < self.arity:
+            return None
+        return tuple(value * scale + offset
+                     for value, scale, offset in zip(args, self.scales, self.offsets))
+
+class BoneRecord:
+    """
+    Routing entry for one pose bone of an OSCBoneStream.
+
+    The bone is addressed by its index in armature.pose.bones, resolved once
+    when the table is built, so no name lookups happen per message.
+    """
+    __slots__ = ("target_object", "property_type", "bone_index", "arity", "key", "mapped_key")
+
+    def __init__(self, armature, channel, bone_index, address):
+        self.target_object = armature
+        self.property_type = channel
+        self.bone_index = bone_index
+        self.arity = utils.property_arity(channel)
+        self.key = (armature, channel, bone_index)
+        self.mapped_key = f"{address}_mapped"
+
+    def remap(self, value):
+        return value
+
+    def remap_vector(self, args):
+        """Take the bone's values from the OSC arguments, or None if there are too few"""
+        if len(args) < self.arity:
+            return None
+        return tuple(args[:self.arity])
+
+# Address -> tuple of MappingRecord. The dict is never mutated after it is
+# published; rebuilds build a new dict and swap the reference, which is atomic
+# for readers on the network thread.
+routing_table = {}
+
+# Scene and object signature the table was built from. Records hold object
+# references and bone stream addresses hold bone names, so the table is
+# rebuilt when the scene is switched or objects are added, deleted or renamed.
+_table_scene = None
+_table_signature = None
+
+def object_signature(scene):
+    """
+    Identity and names of the objects the routing table depends on.
+
+    Objects are identified by session_uid, so a delete and an add in the
+    same update still change the signature. Bone names are only collected
+    for bone stream armatures.
+    """
+    objects = tuple((obj.session_uid, obj.name) for obj in bpy.data.objects)
+    bones = []
+    for stream in getattr(scene, "osc_bone_streams", ()):
+        armature = stream.armature
+        if armature and armature.pose:
+            bones.append(tuple(pose_bone.name for pose_bone in armature.pose.bones))
+    return objects, tuple(bones)
+
+def build_routing_table(scene):
+    """Build a new routing table from the scene's OSC mappings"""
+    table = {}
+    for mapping in scene.osc_mappings:
+        if not mapping.is_active or not mapping.target_object:
+            continue
+        table.setdefault(mapping.osc_address, []).append(MappingRecord(mapping))
+    
+    # Expand bone stream templates into one entry per pose bone
+    for stream in getattr(scene, "osc_bone_streams", ()):
+        armature = stream.armature
+        if not stream.is_active or not armature or armature.type != 'ARMATURE' or not armature.pose:
+            continue
+        template = stream.address_template
+        if template.count('*') != 1:
+            print(f"OSC Controller: Bone stream template '{template}' must contain exactly one '*'")
+            continue
+        for bone_index, pose_bone in enumerate(armature.pose.bones):
+            address = template.replace('*', pose_bone.name)
+            table.setdefault(address, []).append(BoneRecord(armature, stream.channel, bone_index, address))
+    return {address: tuple(records) for address, records in table.items()}
+
+def rebuild_routing_table(scene=None):
+    """Rebuild and publish the routing table. Must run on the main thread."""
+    global routing_table, _table_scene, _table_signature
+
+    if scene is None:
+        scene = bpy.context.scene
+    _table_scene = scene
+    if scene is None or not hasattr(scene, "osc_mappings"):
+        _table_signature = None
+        routing_table = {}
+        return
+
+    _table_signature = object_signature(scene)
+
+    routing_table = build_routing_table(scene)
+
+# Update callback for OSCMapping properties
+def mapping_updated(self, context):
+    rebuild_routing_table(context.scene)
+
+# Update callback for the target and property type of an OSCMapping
+def mapping_target_updated(self, context):
+    # Quaternion values have no effect in the Euler rotation modes, so the
+    # target is switched once here instead of on every applied value
+    obj = self.target_object
+    if obj and self.property_type in ('rotation_quaternion', 'location_quaternion'):
+        if obj.rotation_mode != 'QUATERNION':
+            obj.rotation_mode = 'QUATERNION'
+    rebuild_routing_table(context.scene)
+
+# Mappings are restored without update callbacks on file load and undo
+@persistent
+def routing_load_handler(*args):
+    rebuild_routing_table()
+
+# Deleting or renaming an object or switching scenes runs no mapping update
+# callback. The object signature is compared here; the table is only rebuilt
+# when one of them happened.
+@persistent
+def routing_depsgraph_handler(scene, depsgraph=None):
+    current = bpy.context.scene
+    if current != _table_scene:
+        rebuild_routing_table()
+    elif current is not None and hasattr(current, "osc_mappings") and object_signature(current) != _table_signature:
+        rebuild_routing_table()
+
+_handler_lists = (
+    bpy.app.handlers.load_post,
+    bpy.app.handlers.undo_post,
+    bpy.app.handlers.redo_post,
+)
+
+def register():
+    """Register handlers that keep the routing table in sync"""
+    for handler_list in _handler_lists:
+        if routing_load_handler not in handler_list:
+            handler_list.append(routing_load_handler)
+    if routing_depsgraph_handler not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(routing_depsgraph_handler)
+
+    # The scene is not accessible while the addon is being registered
+    timers.register(rebuild_routing_table, first_interval=0.0)
+
+def unregister():
+    """Remove handlers and clear the routing table"""
+    global routing_table, _table_scene, _table_signature
+
+    for handler_list in _handler_lists:
+        if routing_load_handler in handler_list:
+            handler_list.remove(routing_load_handler)
+    if routing_depsgraph_handler in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(routing_depsgraph_handler)
+
+    routing_table = {}
+    _table_scene = None
+    _table_signature = None
@@ -0,0 +1,145 @@
+import collections
+import heapq
+import itertools
+import threading
+import time
+
+# Number of recent releases kept for the lateness report
+LATENESS_HISTORY = 64
+
+# Most messages parked at once, further messages are dropped until some are due
+MAX_PENDING = 4096
+
+# Messages due further ahead than this (in seconds) are dropped. A timetag that
+# far out is most likely a sender clock that doesn't match ours.
+MAX_SCHEDULE_AHEAD = 60.0
+
+class TimetagScheduler:
+    """
+    Heap-based scheduler for OSC bundle messages with a future timetag.
+
+    The receive thread parks messages here instead of sleeping until they are
+    due. A single scheduler thread releases them in due-time order and records
+    how late each one was released.
+
+    The heap is bounded: messages beyond max_pending or due more than
+    max_ahead seconds from now are dropped, counted and reported to on_drop.
+    """
+
+    def __init__(self, max_pending=MAX_PENDING, max_ahead=MAX_SCHEDULE_AHEAD, on_drop=None):
+        """
+        Args:
+            max_pending: Most messages parked at once
+            max_ahead: Latest accepted due time, in seconds from now
+            on_drop: Optional callable invoked as on_drop(reason) for every
+                     dropped message, reason is 'full' or 'ahead'
+        """
+        self.max_pending = max_pending
+        self.max_ahead = max_ahead
+        self.on_drop = on_drop
+        self._heap = []
+        self._sequence = itertools.count()  # Keeps equal due times in FIFO order
+        self._condition = threading.Condition()
+        self._thread = None
+        self._running = False
+
+        # Lateness statistics (seconds)
+        self.released = 0
+        self.last_lateness = 0.0
+        self.max_lateness = 0.0
+        self.total_lateness = 0.0
+        self.recent = collections.deque(maxlen=LATENESS_HISTORY)  # (address, lateness)
+        self.dropped_full = 0  # Dropped because max_pending messages were parked
+        self.dropped_ahead = 0  # Dropped because they were due too far ahead
+
+    def __len__(self):
+        return len(self._heap)
+
+    def schedule(self, due_time, callback, address=""):
+        """
+        Park a callback until its due time. Safe to call from any thread.
+
+        Args:
+            due_time: Wall-clock time (seconds since the epoch) of the OSC timetag
+            callback: Callable invoked without arguments when the message is due
+            address: OSC address, used for the lateness report
+
+        Returns:
+            False if the message was dropped
+        """
+        with self._condition:
+            if due_time - time.time() > self.max_ahead:
+                self.dropped_ahead += 1
+                reason = 'ahead'
+            elif len(self._heap) >= self.max_pending:
+                self.dropped_full += 1
+                reason = 'full'
+            else:
+                heapq.heappush(self._heap, (due_time, next(self._sequence), callback, address))
+                # Only wake the thread if the new entry is now the earliest
+                if self._heap[0][2] is callback:
+                    self._condition.notify()
+                return True
+        if self.on_drop is not None:
+            self.on_drop(reason)
+        return False
+
+    def start(self):
+        """Start the scheduler thread"""
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the scheduler thread and discard messages that are not yet due"""
+        with self._condition:
+            self._running = False
+            self._heap.clear()
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def mean_lateness(self):
+        """Average lateness of all released messages"""
+        return self.total_lateness / self.released if self.released else 0.0
+
+    def reset_stats(self):
+        self.released = 0
+        self.last_lateness = 0.0
+        self.max_lateness = 0.0
+        self.total_lateness = 0.0
+        self.recent.clear()
+        self.dropped_full = 0
+        self.dropped_ahead = 0
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._running:
+                    if self._heap:
+                        delay = self._heap[0][0] - time.time()
+                        if delay <= 0:
+                            break
+                        self._condition.wait(delay)
+                    else:
+                        self._condition.wait()
+                if not self._running:
+                    return
+                due_time, _, callback, address = heapq.heappop(self._heap)
+
+            lateness = time.time() - due_time
+            self.released += 1
+            self.last_lateness = lateness
+            self.total_lateness += lateness
+            if lateness > self.max_lateness:
+                self.max_lateness = lateness
+            self.recent.append((address, lateness))
+
+            try:
+                callback()
+            except Exception as e:
+                print(f"OSC Controller: Error in scheduled OSC message: {str(e)}")
@@ -0,0 +1,207 @@
+import math
+import numpy as np
+
+# Number of channels allocated up front; the bank doubles when it runs out
+INITIAL_CHANNELS = 64
+
+# Fallback time step for the One-Euro filter when samples share a timestamp
+MIN_TIME_STEP = 1.0 / 240.0
+
+class SmoothingBank:
+    """
+    Array-backed smoothing state for many channels.
+
+    Every channel is identified by a stable key (e.g. the object's session_uid
+    plus a property path) mapped to a row index. Moving averages use
+    preallocated ring buffers with running sums, so each sample costs O(1)
+    regardless of the buffer size, and a whole tick's samples are filtered with
+    one vectorized call to process().
+    """
+
+    def __init__(self, method='buffer', buffer_size=5, threshold=0.01, ema_factor=0.5,
+                 min_cutoff=1.0, beta=0.007, d_cutoff=1.0):
+        self.method = method
+        self.buffer_size = buffer_size
+        self.threshold = threshold
+        self.ema_factor = ema_factor
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self, capacity=INITIAL_CHANNELS):
+        """Forget all channels and their state"""
+        self.channels = {}  # key -> row index
+        self._allocate(capacity)
+
+    def configure(self, settings):
+        """
+        Take the filter parameters from OSCSettings. Channel state is reset when
+        the method or buffer size changes.
+        """
+        method = settings.smoothing_method
+        buffer_size = settings.smoothing_buffer_size
+        changed = method != self.method or buffer_size != self.buffer_size
+
+        self.method = method
+        self.buffer_size = buffer_size
+        self.threshold = settings.smoothing_threshold
+        self.ema_factor = settings.smoothing_ema_factor
+        self.min_cutoff = settings.one_euro_min_cutoff
+        self.beta = settings.one_euro_beta
+        self.d_cutoff = settings.one_euro_d_cutoff
+
+        if changed:
+            self.reset()
+
+    def _allocate(self, capacity):
+        self.capacity = capacity
+        self.ring = np.zeros((capacity, self.buffer_size), dtype=np.float64)
+        self.sums = np.zeros(capacity, dtype=np.float64)
+        self.heads = np.zeros(capacity, dtype=np.intp)
+        self.held = np.zeros(capacity, dtype=np.float64)  # Threshold gate output
+        self.state = np.zeros(capacity, dtype=np.float64)  # EMA / One-Euro value
+        self.derivative = np.zeros(capacity, dtype=np.float64)  # One-Euro derivative
+        self.times = np.zeros(capacity, dtype=np.float64)  # One-Euro last sample time
+
+    def _grow(self, needed):
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        old = (self.ring, self.sums, self.heads, self.held, self.state, self.derivative, self.times)
+        count = len(self.channels)
+        self._allocate(capacity)
+        for new_array, old_array in zip(
+                (self.ring, self.sums, self.heads, self.held, self.state, self.derivative, self.times), old):
+            new_array[:count] = old_array[:count]
+
+    def channel_ids(self, keys, values, timestamp):
+        """
+        Map keys to row indices, creating channels seeded with their first value.
+
+        Returns:
+            Tuple of (int array of row indices, bool array marking new channels)
+        """
+        channels = self.channels
+        ids = np.empty(len(keys), dtype=np.intp)
+        new = np.zeros(len(keys), dtype=bool)
+        for i, key in enumerate(keys):
+            index = channels.get(key)
+            if index is None:
+                index = len(channels)
+                if index >= self.capacity:
+                    self._grow(index + 1)
+                channels[key] = index
+                self._seed(index, values[i], timestamp)
+                new[i] = True
+            ids[i] = index
+        return ids, new
+
+    def _seed(self, index, value, timestamp):
+        self.ring[index] = value
+        self.sums[index] = value * self.buffer_size
+        self.heads[index] = 0
+        self.held[index] = value
+        self.state[index] = value
+        self.derivative[index] = 0.0
+        self.times[index] = timestamp
+
+    def process(self, keys, values, timestamp):
+        """
+        Smooth one sample for each of the given channels.
+
+        Args:
+            keys: Sequence of unique channel keys
+            values: Sequence of raw values, one per key
+            timestamp: Sample time in seconds (monotonic), used by the One-Euro filter
+
+        Returns:
+            Float64 array of smoothed values. The first sample of a new channel
+            is passed through unchanged.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if not len(values):
+            return values
+        ids, new = self.channel_ids(keys, values, timestamp)
+
+        old = ~new
+        if not old.any():
+            return values.copy()
+
+        result = values.copy()
+        ids_old = ids[old]
+        values_old = values[old]
+        method = self.method
+
+        if method == 'ema':
+            state = self.state[ids_old]
+            state += self.ema_factor * (values_old - state)
+            self.state[ids_old] = state
+            result[old] = state
+        elif method == 'one_euro':
+            result[old] = self._one_euro(ids_old, values_old, timestamp)
+        else:
+            if method in ('threshold', 'both'):
+                held = self.held[ids_old]
+                values_old = np.where(np.abs(values_old - held) < self.threshold, held, values_old)
+                self.held[ids_old] = values_old
+            if method in ('buffer', 'both'):
+                values_old = self._moving_average(ids_old, values_old)
+            result[old] = values_old
+
+        return result
+
+    def _moving_average(self, ids, values):
+        heads = self.heads[ids]
+        outgoing = self.ring[ids, heads]
+        self.ring[ids, heads] = values
+        self.sums[ids] += values - outgoing
+
+        heads += 1
+        wrapped = heads >= self.buffer_size
+        heads[wrapped] = 0
+        self.heads[ids] = heads
+
+        # Recompute sums once per lap to stop floating point drift, O(1) amortized
+        if wrapped.any():
+            wrapped_ids = ids[wrapped]
+            self.sums[wrapped_ids] = self.ring[wrapped_ids].sum(axis=1)
+
+        return self.sums[ids] / self.buffer_size
+
+    def _one_euro(self, ids, values, timestamp):
+        """One-Euro filter (Casiez et al. 2012), vectorized over channels"""
+        dt = timestamp - self.times[ids]
+        dt = np.where(dt > 0, dt, MIN_TIME_STEP)
+        self.times[ids] = timestamp
+
+        previous = self.state[ids]
+        derivative = (values - previous) / dt
+        alpha_d = _smoothing_factor(self.d_cutoff, dt)
+        derivative_hat = self.derivative[ids] + alpha_d * (derivative - self.derivative[ids])
+        self.derivative[ids] = derivative_hat
+
+        cutoff = self.min_cutoff + self.beta * np.abs(derivative_hat)
+        alpha = _smoothing_factor(cutoff, dt)
+        filtered = previous + alpha * (values - previous)
+        self.state[ids] = filtered
+        return filtered
+
+def _smoothing_factor(cutoff, dt):
+    tau = 1.0 / (2.0 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+def channel_key(obj, prop):
+    """
+    Stable smoothing channel key for an object property.
+
+    Uses session_uid rather than the name, so renaming an object keeps its
+    smoothing state.
+    """
+    return (obj.session_uid, prop)
+
+# Bank used for live values applied by the drain timer
+live_bank = SmoothingBank()
+
+# Bank used when sampling property values for keyframes
+keyframe_bank = SmoothingBank()
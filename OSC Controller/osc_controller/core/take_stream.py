@@ -0,0 +1,242 @@
+"""
+Chunked, compressed, columnar take files.
+
+A take file streams the samples of a recording to disk so a take of any
+length is recorded with constant memory. The layout is an 8 byte magic
+header, a JSON description of the take, then append-only chunks:
+
+    uint32   JSON header length, followed by the UTF-8 JSON header
+    chunk:   uint32 rows, uint32 columns, float64 first and last time
+             per column: uint32 compressed length, zlib-compressed float64
+             little-endian values
+
+Column 0 of every chunk is the sample clock (monotonic seconds or scene
+frames, see the header's "clock"), the other columns are one channel each in
+the order of the header's "channels". Every column is compressed on its own,
+so a reader can decompress only the channels and chunks it needs. A take cut
+short by a crash is readable up to its last complete chunk.
+
+This module doesn't import bpy.
+"""
+
+import json
+import os
+import queue
+import struct
+import threading
+import zlib
+import numpy as np
+
+TAKE_MAGIC = b"OSCTAKE1"
+LENGTH = struct.Struct("<I")
+CHUNK_HEADER = struct.Struct("<IIdd")
+
+# Rows buffered per chunk before it is handed to the writer thread
+CHUNK_ROWS = 4096
+
+# Chunks waiting for the writer thread. When the disk falls this far behind,
+# write_chunk refuses new chunks instead of blocking the caller.
+MAX_PENDING_CHUNKS = 16
+
+# Seconds between checks that the writer thread is still alive while waiting for room
+WRITER_POLL_INTERVAL = 0.5
+
+# zlib level, low levels keep up with recording on a single core
+COMPRESSION_LEVEL = 3
+
+def numbered_path(path):
+    """
+    First free numbered variant of a take file path.
+
+    "takes/osc_take.osctake" gives "takes/osc_take_001.osctake", or the next
+    number that isn't taken yet, so a new take never replaces an old one.
+    """
+    stem, extension = os.path.splitext(path)
+    number = 1
+    while os.path.exists(f"{stem}_{number:03d}{extension}"):
+        number += 1
+    return f"{stem}_{number:03d}{extension}"
+
+class TakeWriter:
+    """
+    Streams chunks of a take to disk from a background thread.
+
+    write_chunk() only queues the arrays, compression and file writes happen
+    on the writer thread. The writer never replaces an existing file.
+    """
+
+    def __init__(self, path, header):
+        """
+        Args:
+            path: Output file path, which must not exist yet
+            header: JSON-serializable dict describing the take, with a "channels" list
+        """
+        self.path = path
+        self.header = header
+        self.columns = len(header["channels"]) + 1
+        self.rows = 0
+        self.chunks = 0
+        self.bytes_written = 0
+        self.refused = 0  # Chunks write_chunk turned away because the writer was behind
+        self.error = None  # First error of the writer thread; later chunks are discarded
+        self._queue = queue.Queue(maxsize=MAX_PENDING_CHUNKS)
+
+        self._file = open(path, "xb")
+        encoded = json.dumps(header).encode("utf-8")
+        self._file.write(TAKE_MAGIC + LENGTH.pack(len(encoded)) + encoded)
+        self.bytes_written = len(TAKE_MAGIC) + LENGTH.size + len(encoded)
+
+        self._thread = threading.Thread(target=self._run, name="OSCTakeWriter", daemon=True)
+        self._thread.start()
+
+    def write_chunk(self, times, samples, block=False):
+        """
+        Queue a chunk. The arrays are copied, so the caller may reuse its buffers.
+
+        Args:
+            times: 1-D clock values
+            samples: (rows, channels) values
+            block: Wait for room in the queue instead of refusing the chunk
+
+        Returns:
+            False if the writer is MAX_PENDING_CHUNKS chunks behind, or its
+            thread has exited, and the chunk was not queued. The caller keeps
+            the samples and retries.
+        """
+        if not len(times):
+            return True
+        chunk = (np.array(times, dtype="<f8"), np.array(samples, dtype="<f8"))
+        if self._put(chunk, block):
+            return True
+        self.refused += 1
+        return False
+
+    def _put(self, item, block):
+        """Queue an item, waiting only while the writer thread can still take it"""
+        while self._thread.is_alive():
+            try:
+                self._queue.put(item, timeout=WRITER_POLL_INTERVAL if block else None, block=block)
+                return True
+            except queue.Full:
+                if not block:
+                    return False
+        return False
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            if self.error is not None:
+                continue  # Keep draining so write_chunk never blocks forever
+            times, samples = item
+            try:
+                self._write(times, samples)
+            except Exception as e:
+                self.error = e
+                print(f"OSC Controller: Error writing take file: {str(e)}")
+
+    def _write(self, times, samples):
+        parts = [CHUNK_HEADER.pack(len(times), self.columns, times[0], times[-1])]
+        for column in [times] + [samples[:, i] for i in range(samples.shape[1])]:
+            compressed = zlib.compress(np.ascontiguousarray(column).tobytes(), COMPRESSION_LEVEL)
+            parts.append(LENGTH.pack(len(compressed)))
+            parts.append(compressed)
+        data = b"".join(parts)
+        self._file.write(data)
+        self.bytes_written += len(data)
+        self.rows += len(times)
+        self.chunks += 1
+
+    def close(self):
+        """Write the remaining chunks and close the file"""
+        # A dead writer thread never takes the stop marker, do not wait on it
+        self._put(None, block=True)
+        self._thread.join()
+        self._file.close()
+
+class TakeReader:
+    """
+    Reads a take file, loading only the requested chunks and channels.
+
+    Opening a take scans the chunk headers only, no sample data is read.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.chunks = []  # (rows, first time, last time, [(offset, length) per column])
+        with open(path, "rb") as f:
+            if f.read(len(TAKE_MAGIC)) != TAKE_MAGIC:
+                raise ValueError(f"{path} is not an OSC take file")
+            (length,) = LENGTH.unpack(f.read(LENGTH.size))
+            self.header = json.loads(f.read(length).decode("utf-8"))
+            self._scan(f)
+
+    @property
+    def channels(self):
+        return self.header["channels"]
+
+    @property
+    def rows(self):
+        return sum(chunk[0] for chunk in self.chunks)
+
+    def _scan(self, f):
+        size = os.fstat(f.fileno()).st_size
+        while True:
+            data = f.read(CHUNK_HEADER.size)
+            if len(data) < CHUNK_HEADER.size:
+                return
+            rows, columns, first, last = CHUNK_HEADER.unpack(data)
+            offsets = []
+            for _ in range(columns):
+                data = f.read(LENGTH.size)
+                if len(data) < LENGTH.size:
+                    return
+                (length,) = LENGTH.unpack(data)
+                offsets.append((f.tell(), length))
+                f.seek(length, 1)
+            # A chunk cut short by a crash ends the take
+            if f.tell() > size:
+                return
+            self.chunks.append((rows, first, last, offsets))
+
+    def read(self, channels=None, start=None, end=None):
+        """
+        Load part of a take.
+
+        Args:
+            channels: Indices into the header's channel list, None for all
+            start, end: Inclusive clock range to load, None for open-ended
+
+        Returns:
+            Tuple of (1-D clock values, (rows, channels) samples)
+        """
+        if channels is None:
+            channels = range(len(self.channels))
+        columns = [0] + [channel + 1 for channel in channels]
+
+        times = []
+        samples = []
+        with open(self.path, "rb") as f:
+            for rows, first, last, offsets in self.chunks:
+                if (start is not None and last < start) or (end is not None and first > end):
+                    continue
+                arrays = []
+                for column in columns:
+                    offset, length = offsets[column]
+                    f.seek(offset)
+                    arrays.append(np.frombuffer(zlib.decompress(f.read(length)), dtype="<f8"))
+                times.append(arrays[0])
+                samples.append(np.column_stack(arrays[1:]) if len(arrays) > 1 else np.empty((rows, 0)))
+
+        if not times:
+            return np.empty(0), np.empty((0, len(columns) - 1))
+        times = np.concatenate(times)
+        samples = np.concatenate(samples)
+
+        inside = np.ones(len(times), dtype=bool)
+        if start is not None:
+            inside &= times >= start
+        if end is not None:
+            inside &= times <= end
+        return times[inside], samples[inside]
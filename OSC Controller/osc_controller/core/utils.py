@@ -1,10 +1,12 @@
 import bpy
 import os
 import sys
+import time
+import numpy as np
+from . import smoothing
 
-# Dictionary for storing smoothing buffers
-smoothing_buffers = {}  # For storing value history for buffer smoothing
-last_keyframed_values = {}  # For storing the last keyframed values for threshold smoothing
+# Last keyframed value per smoothing channel, for threshold filtering
+last_keyframed_values = {}
 
 # Function to check if python-osc is available
 pythonosc_available = False
@@ -75,6 +77,73 @@ def remap_value(value, old_min, old_max, new_min, new_max):
     new_range = new_max - new_min
     return new_min + normalized * new_range
 
+# Transform property types mapped to their vector attribute and component index
+TRANSFORM_PROPERTIES = {
+    'location_x': ('location', 0),
+    'location_y': ('location', 1),
+    'location_z': ('location', 2),
+    'rotation_x': ('rotation_euler', 0),
+    'rotation_y': ('rotation_euler', 1),
+    'rotation_z': ('rotation_euler', 2),
+    'scale_x': ('scale', 0),
+    'scale_y': ('scale', 1),
+    'scale_z': ('scale', 2),
+}
+
+# Number of components of each transform vector attribute
+VECTOR_SIZES = {
+    'location': 3,
+    'rotation_euler': 3,
+    'rotation_quaternion': 4,
+    'scale': 3,
+}
+
+# Property types bound to whole vectors, mapped to the attributes they write
+# and the index of the first OSC argument used for each attribute
+VECTOR_PROPERTIES = {
+    'location': (('location', 0),),
+    'rotation_euler': (('rotation_euler', 0),),
+    'rotation_quaternion': (('rotation_quaternion', 0),),
+    'scale': (('scale', 0),),
+    'location_rotation': (('location', 0), ('rotation_euler', 3)),
+    'location_quaternion': (('location', 0), ('rotation_quaternion', 3)),
+}
+
+# Bone stream channels, mapped like VECTOR_PROPERTIES to pose bone attributes
+BONE_PROPERTIES = {
+    'bone_location': (('location', 0),),
+    'bone_rotation_euler': (('rotation_euler', 0),),
+    'bone_rotation_quaternion': (('rotation_quaternion', 0),),
+    'bone_scale': (('scale', 0),),
+    'bone_location_quaternion': (('location', 0), ('rotation_quaternion', 3)),
+}
+
+# Number of OSC arguments of the 4x4 matrix property type (row-major)
+MATRIX_SIZE = 16
+
+# Minimum number of pose bones of one armature channel in one batch before
+# the armature's bone collection is written with foreach_set
+FOREACH_MIN_BONES = 8
+
+def property_arity(prop_type):
+    """Number of OSC arguments a property type consumes"""
+    if prop_type == 'matrix':
+        return MATRIX_SIZE
+    vector = VECTOR_PROPERTIES.get(prop_type) or BONE_PROPERTIES.get(prop_type)
+    if vector is None:
+        return 1
+    return sum(VECTOR_SIZES[attribute] for attribute, _ in vector)
+
+def object_alive(obj):
+    """False for None and for objects deleted since the reference was taken"""
+    if not obj:
+        return False
+    try:
+        obj.name
+    except ReferenceError:
+        return False
+    return True
+
 # Helper function to set object property
 def set_object_property(obj, prop_type, custom_prop_name, value):
     """
@@ -90,38 +159,142 @@ def set_object_property(obj, prop_type, custom_prop_name, value):
         return
     
     try:
-        if prop_type == 'location_x':
-            obj.location[0] = value
-        elif prop_type == 'location_y':
-            obj.location[1] = value
-        elif prop_type == 'location_z':
-            obj.location[2] = value
-        elif prop_type == 'rotation_x':
-            obj.rotation_euler[0] = value
-        elif prop_type == 'rotation_y':
-            obj.rotation_euler[1] = value
-        elif prop_type == 'rotation_z':
-            obj.rotation_euler[2] = value
-        elif prop_type == 'scale_x':
-            obj.scale[0] = value
-        elif prop_type == 'scale_y':
-            obj.scale[1] = value
-        elif prop_type == 'scale_z':
-            obj.scale[2] = value
+        channel = TRANSFORM_PROPERTIES.get(prop_type)
+        if channel is not None:
+            attribute, index = channel
+            getattr(obj, attribute)[index] = value
         elif prop_type == 'custom_property':
             if custom_prop_name in obj:
                 obj[custom_prop_name] = value
     except Exception as e:
         print(f"OSC Controller: Error setting property: {str(e)}")
 
-# Functions for smoothing
-def initialize_smoothing_buffers(obj, prop_path, initial_value):
-    """Initialize or reset a smoothing buffer for a property with an initial value"""
-    buffer_key = f"{obj.name}_{prop_path}"
-    buffer_size = bpy.context.scene.osc_settings.smoothing_buffer_size
-    smoothing_buffers[buffer_key] = [initial_value] * buffer_size
-    last_keyframed_values[buffer_key] = initial_value
+def apply_property_batch(updates):
+    """
+    Apply many property updates with as few RNA writes as possible.
+    
+    Transform components are gathered per object and channel and written as
+    one vector assignment. Only the objects in the batch are written. Pose
+    bones of one armature channel are written with a single foreach_set.
+    
+    Args:
+        updates: Iterable of ((obj, prop_type, custom_prop_name), value), where
+                 value is a sequence of property_arity(prop_type) floats for
+                 vector and matrix property types
+        
+    Returns:
+        The number of RNA writes performed
+    """
+    writes = 0
+    vectors = {}  # (obj, attribute) -> {component index: value}
+    bones = {}  # (armature, attribute) -> {bone index: values}
+    
+    for (obj, prop_type, custom_prop_name), value in updates:
+        if not object_alive(obj):
+            continue
+        bone_vector = BONE_PROPERTIES.get(prop_type)
+        if bone_vector is not None:
+            # For bone streams the third key element is the pose bone index
+            for attribute, first in bone_vector:
+                size = VECTOR_SIZES[attribute]
+                bones.setdefault((obj, attribute), {})[custom_prop_name] = value[first:first + size]
+            continue
+        
+        channel = TRANSFORM_PROPERTIES.get(prop_type)
+        if channel is not None:
+            attribute, index = channel
+            vectors.setdefault((obj, attribute), {})[index] = value
+            continue
+        
+        vector = VECTOR_PROPERTIES.get(prop_type)
+        if vector is not None:
+            for attribute, first in vector:
+                components = vectors.setdefault((obj, attribute), {})
+                for index in range(VECTOR_SIZES[attribute]):
+                    components[index] = value[first + index]
+            continue
+        
+        if prop_type == 'matrix':
+            writes += write_matrix(obj, value)
+        else:
+            set_object_property(obj, prop_type, custom_prop_name, value)
+            writes += 1
+    
+    for (obj, attribute), components in vectors.items():
+        writes += write_vector(obj, attribute, components)
+    
+    # All bones of an armature channel are written in one pass
+    armatures = set()
+    for (armature, attribute), bone_values in bones.items():
+        writes += write_pose_bones(armature, attribute, bone_values)
+        armatures.add(armature)
+    for armature in armatures:
+        armature.update_tag(refresh={'OBJECT'})
+    
+    return writes
 
+def write_vector(obj, attribute, components):
+    """Write the given components of a vector property in one assignment"""
+    try:
+        size = VECTOR_SIZES[attribute]
+        if len(components) == size:
+            setattr(obj, attribute, tuple(components[index] for index in range(size)))
+        else:
+            vector = list(getattr(obj, attribute))
+            for index, value in components.items():
+                vector[index] = value
+            setattr(obj, attribute, vector)
+        return 1
+    except Exception as e:
+        print(f"OSC Controller: Error setting property: {str(e)}")
+        return 0
+
+def write_pose_bones(armature, attribute, bone_values):
+    """
+    Write one transform channel for many pose bones of an armature.
+    
+    Args:
+        armature: The armature object
+        attribute: Pose bone attribute, e.g. 'rotation_quaternion'
+        bone_values: Dict of pose bone index -> component values
+        
+    Returns:
+        The number of RNA writes performed
+    """
+    pose_bones = armature.pose.bones
+    count = len(pose_bones)
+    if any(index >= count for index in bone_values):
+        # Bones removed since the routing table was built are skipped
+        bone_values = {index: values for index, values in bone_values.items() if index < count}
+    try:
+        if len(bone_values) < FOREACH_MIN_BONES:
+            for index, values in bone_values.items():
+                setattr(pose_bones[index], attribute, values)
+            return len(bone_values)
+        
+        size = VECTOR_SIZES[attribute]
+        buffer = np.empty(len(pose_bones) * size, dtype=np.float32)
+        pose_bones.foreach_get(attribute, buffer)
+        rows = buffer.reshape(-1, size)
+        for index, values in bone_values.items():
+            rows[index] = values
+        pose_bones.foreach_set(attribute, buffer)
+        return 2
+    except Exception as e:
+        print(f"OSC Controller: Error writing pose bones of {armature.name}: {str(e)}")
+        return 0
+
+def write_matrix(obj, values):
+    """Write a row-major 4x4 matrix to the object's local (basis) matrix"""
+    from mathutils import Matrix
+    try:
+        obj.matrix_basis = Matrix((values[0:4], values[4:8], values[8:12], values[12:16]))
+        return 1
+    except Exception as e:
+        print(f"OSC Controller: Error setting matrix: {str(e)}")
+        return 0
+
+# Functions for smoothing
 def get_current_property_value(obj, prop_path):
     """Get the current value of a property using its path"""
     if '.' in prop_path:
@@ -159,35 +332,11 @@ def get_smoothed_value(obj, prop_path, current_value):
     
     if not settings.enable_smoothing:
         return current_value
-        
-    buffer_key = f"{obj.name}_{prop_path}"
-    
-    # Initialize buffer if it doesn't exist
-    if buffer_key not in smoothing_buffers:
-        initialize_smoothing_buffers(obj, prop_path, current_value)
-        return current_value
-    
-    # Get the last keyframed value
-    last_value = last_keyframed_values.get(buffer_key, current_value)
-    
-    # Apply threshold filter if enabled
-    if settings.smoothing_method in ('threshold', 'both'):
-        # If the change is smaller than the threshold, use the last value
-        if abs(current_value - last_value) < settings.smoothing_threshold:
-            return last_value
-    
-    # Apply buffer smoothing if enabled
-    if settings.smoothing_method in ('buffer', 'both'):
-        # Update the buffer with the new value
-        buffer = smoothing_buffers[buffer_key]
-        buffer.pop(0)
-        buffer.append(current_value)
-        
-        # Calculate the average of the buffer
-        return sum(buffer) / len(buffer)
     
-    # If only threshold filtering is used, return the current value
-    return current_value
+    bank = smoothing.keyframe_bank
+    bank.configure(settings)
+    key = smoothing.channel_key(obj, prop_path)
+    return float(bank.process([key], [current_value], time.monotonic())[0])
 
 def should_keyframe_property(obj, prop_path, current_value):
     """Determine if a property should be keyframed based on smoothing settings"""
@@ -196,15 +345,15 @@ def should_keyframe_property(obj, prop_path, current_value):
     if not settings.enable_smoothing:
         return True
         
-    buffer_key = f"{obj.name}_{prop_path}"
+    key = smoothing.channel_key(obj, prop_path)
     
     # Initialize if it doesn't exist
-    if buffer_key not in last_keyframed_values:
-        last_keyframed_values[buffer_key] = current_value
+    if key not in last_keyframed_values:
+        last_keyframed_values[key] = current_value
         return True
     
     # Get the last keyframed value
-    last_value = last_keyframed_values[buffer_key]
+    last_value = last_keyframed_values[key]
     
     # If threshold filtering is enabled, check if the change is significant
     if settings.smoothing_method in ('threshold', 'both'):
@@ -212,7 +361,7 @@ def should_keyframe_property(obj, prop_path, current_value):
             return False
     
     # Update the last keyframed value
-    last_keyframed_values[buffer_key] = current_value
+    last_keyframed_values[key] = current_value
     return True
 
 # Perform initial check for pythonosc
@@ -2,14 +2,17 @@ from . import server_ops
 from . import mapping_ops
 from . import recording_ops
 from . import utility_ops
+from . import capture_ops
 
 def register():
     server_ops.register()
     mapping_ops.register()
     recording_ops.register()
     utility_ops.register()
+    capture_ops.register()
 
 def unregister():
+    capture_ops.unregister()
     utility_ops.unregister()
     recording_ops.unregister()
     mapping_ops.unregister()
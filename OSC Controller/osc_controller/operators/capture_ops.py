@@ -0,0 +1,120 @@
+import bpy
+from bpy.types import Operator
+from bpy.props import StringProperty
+from ..core import osc_server
+from ..core import capture
+from ..core import take_stream
+
+# Operator to start capturing received OSC packets
+class OSC_OT_StartCapture(Operator):
+    bl_idname = "osc.start_capture"
+    bl_label = "Start Capture"
+    bl_description = "Write every received OSC packet with its receive time to the capture file"
+
+    def execute(self, context):
+        settings = context.scene.osc_settings
+        # Every capture gets a new numbered file, earlier captures are never replaced
+        path = take_stream.numbered_path(bpy.path.abspath(settings.capture_path))
+
+        try:
+            capture.start_capture(path)
+        except Exception as e:
+            self.report({'ERROR'}, f"Failed to start capture: {str(e)}")
+            return {'CANCELLED'}
+        settings.last_capture_path = path
+
+        if not osc_server.is_server_running:
+            self.report({'WARNING'}, f"Capturing to {path}, packets are recorded once the server is started")
+        else:
+            self.report({'INFO'}, f"Capturing to {path}")
+        return {'FINISHED'}
+
+# Operator to stop capturing
+class OSC_OT_StopCapture(Operator):
+    bl_idname = "osc.stop_capture"
+    bl_label = "Stop Capture"
+    bl_description = "Stop capturing OSC packets and close the capture file"
+
+    def execute(self, context):
+        writer = capture.stop_capture()
+        if writer is None:
+            self.report({'WARNING'}, "No capture is running")
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, f"Captured {writer.records} packets ({writer.bytes_written / 1024:.1f} KB)")
+        return {'FINISHED'}
+
+# Operator to replay a capture file
+class OSC_OT_ReplayCapture(Operator):
+    bl_idname = "osc.replay_capture"
+    bl_label = "Replay Capture"
+    bl_description = "Replay a capture file into the running OSC server"
+
+    filepath: StringProperty(
+        name="Capture File",
+        description="Capture file to replay",
+        subtype='FILE_PATH'
+    )
+
+    def invoke(self, context, event):
+        # Default to the capture recorded last
+        self.filepath = context.scene.osc_settings.last_capture_path
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        settings = context.scene.osc_settings
+        path = bpy.path.abspath(self.filepath or settings.last_capture_path)
+        if not path:
+            self.report({'ERROR'}, "No capture file selected")
+            return {'CANCELLED'}
+
+        if not osc_server.is_server_running:
+            self.report({'ERROR'}, "Start the OSC server before replaying")
+            return {'CANCELLED'}
+
+        if settings.replay_target == 'udp':
+            # A wildcard bind address can't be sent to on every platform
+            host = settings.ip_address
+            if host in ("0.0.0.0", ""):
+                host = "127.0.0.1"
+            target = (host, settings.port)
+        else:
+            # Bypass the capture tap so a running capture doesn't record the replay
+            target = osc_server.osc_dispatcher.dispatcher
+
+        try:
+            # Validate the file before handing it to the replay thread
+            next(capture.iter_capture(path), None)
+            capture.start_replay(path, target, settings.replay_speed)
+        except Exception as e:
+            self.report({'ERROR'}, f"Failed to replay capture: {str(e)}")
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, f"Replaying {path}")
+        return {'FINISHED'}
+
+# Operator to stop a running replay
+class OSC_OT_StopReplay(Operator):
+    bl_idname = "osc.stop_replay"
+    bl_label = "Stop Replay"
+    bl_description = "Stop replaying the capture file"
+
+    def execute(self, context):
+        capture.stop_replay()
+        return {'FINISHED'}
+
+# Register
+classes = (
+    OSC_OT_StartCapture,
+    OSC_OT_StopCapture,
+    OSC_OT_ReplayCapture,
+    OSC_OT_StopReplay,
+)
+
+def register():
+    for cls in classes:
+        bpy.utils.register_class(cls)
+
+def unregister():
+    for cls in reversed(classes):
+        bpy.utils.unregister_class(cls)
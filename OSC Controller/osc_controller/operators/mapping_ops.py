@@ -1,6 +1,7 @@
 import bpy
 from bpy.types import Operator
 from bpy.props import IntProperty, StringProperty, FloatProperty
+from ..core import routing
 
 # Operator to add a new OSC mapping
 class OSC_OT_AddMapping(Operator):
@@ -13,6 +14,7 @@ class OSC_OT_AddMapping(Operator):
             mapping = context.scene.osc_mappings.add()
             if context.active_object:
                 mapping.target_object = context.active_object
+            routing.rebuild_routing_table(context.scene)
             return {'FINISHED'}
         except Exception as e:
             self.report({'ERROR'}, f"Failed to add mapping: {str(e)}")
@@ -29,11 +31,56 @@ class OSC_OT_RemoveMapping(Operator):
     def execute(self, context):
         try:
             context.scene.osc_mappings.remove(self.index)
+            routing.rebuild_routing_table(context.scene)
             return {'FINISHED'}
         except Exception as e:
             self.report({'ERROR'}, f"Failed to remove mapping: {str(e)}")
             return {'CANCELLED'}
 
+# Operator to add a new bone stream
+class OSC_OT_AddBoneStream(Operator):
+    bl_idname = "osc.add_bone_stream"
+    bl_label = "Add Bone Stream"
+    bl_description = "Drive all pose bones of an armature from one OSC address template"
+    
+    def execute(self, context):
+        try:
+            stream = context.scene.osc_bone_streams.add()
+            if context.active_object and context.active_object.type == 'ARMATURE':
+                stream.armature = context.active_object
+            routing.rebuild_routing_table(context.scene)
+            return {'FINISHED'}
+        except Exception as e:
+            self.report({'ERROR'}, f"Failed to add bone stream: {str(e)}")
+            return {'CANCELLED'}
+
+# Operator to remove a bone stream
+class OSC_OT_RemoveBoneStream(Operator):
+    bl_idname = "osc.remove_bone_stream"
+    bl_label = "Remove Bone Stream"
+    bl_description = "Remove the selected bone stream"
+    
+    index: IntProperty()
+    
+    def execute(self, context):
+        try:
+            context.scene.osc_bone_streams.remove(self.index)
+            routing.rebuild_routing_table(context.scene)
+            return {'FINISHED'}
+        except Exception as e:
+            self.report({'ERROR'}, f"Failed to remove bone stream: {str(e)}")
+            return {'CANCELLED'}
+
+# Operator to re-resolve bone stream addresses after bones were added or renamed
+class OSC_OT_RefreshRouting(Operator):
+    bl_idname = "osc.refresh_routing"
+    bl_label = "Refresh Bones"
+    bl_description = "Rebuild the OSC routing table, e.g. after adding or renaming bones"
+    
+    def execute(self, context):
+        routing.rebuild_routing_table(context.scene)
+        return {'FINISHED'}
+
 # Operator to copy driver expression to clipboard
 class OSC_OT_CopyDriverExpression(Operator):
     bl_idname = "osc.copy_driver_expression"
@@ -69,6 +116,9 @@ class OSC_OT_CopyDriverExpression(Operator):
 classes = (
     OSC_OT_AddMapping,
     OSC_OT_RemoveMapping,
+    OSC_OT_AddBoneStream,
+    OSC_OT_RemoveBoneStream,
+    OSC_OT_RefreshRouting,
     OSC_OT_CopyDriverExpression
 )
 
@@ -1,7 +1,10 @@
 import bpy
 from bpy.types import Operator
-from bpy.props import IntProperty, EnumProperty, BoolProperty
+from bpy.props import IntProperty, EnumProperty, BoolProperty, StringProperty
 from ..core import recording
+from ..core import fcurve_io
+from ..core import curve_math
+from ..core import post_process
 
 # Operator to add a new Record Object
 class OSC_OT_AddRecordObject(Operator):
@@ -90,134 +93,37 @@ class OSC_OT_SmoothKeyframes(Operator):
     
     def execute(self, context):
         settings = context.scene.osc_settings
-        successful_objects = 0
         
         try:
+            # Need at least 3 points to smooth
+            curves = []  # (object name, fcurve)
             for rec_obj in context.scene.osc_record_objects:
                 if not rec_obj.target_object or not rec_obj.is_active:
                     continue
-                    
-                obj = rec_obj.target_object
-                fcurves_smoothed = 0
-                
-                # Get the object's animation data or create it if it doesn't exist
-                animation_data = obj.animation_data
-                if not animation_data or not animation_data.action:
-                    continue
-                    
-                # Get all FCurves for this object
-                action = animation_data.action
-                
-                # Process location FCurves
-                if rec_obj.record_location:
-                    for i in range(3):  # x, y, z
-                        fcurve = action.fcurves.find('location', index=i)
-                        if fcurve and len(fcurve.keyframe_points) > 2:  # Need at least 3 points to smooth
-                            # Apply custom smoothing
-                            if self.apply_smooth_modifier(fcurve, settings.post_smooth_factor):
-                                fcurves_smoothed += 1
-                
-                # Process rotation FCurves
-                if rec_obj.record_rotation:
-                    for i in range(3):  # x, y, z
-                        fcurve = action.fcurves.find('rotation_euler', index=i)
-                        if fcurve and len(fcurve.keyframe_points) > 2:
-                            if self.apply_smooth_modifier(fcurve, settings.post_smooth_factor):
-                                fcurves_smoothed += 1
-                
-                # Process scale FCurves
-                if rec_obj.record_scale:
-                    for i in range(3):  # x, y, z
-                        fcurve = action.fcurves.find('scale', index=i)
-                        if fcurve and len(fcurve.keyframe_points) > 2:
-                            if self.apply_smooth_modifier(fcurve, settings.post_smooth_factor):
-                                fcurves_smoothed += 1
-                
-                # Process custom properties
-                if rec_obj.record_custom_properties and rec_obj.custom_properties:
-                    custom_props = [prop.strip() for prop in rec_obj.custom_properties.split(',')]
-                    for prop_name in custom_props:
-                        data_path = f'["{prop_name}"]'
-                        fcurve = action.fcurves.find(data_path)
-                        if fcurve and len(fcurve.keyframe_points) > 2:
-                            if self.apply_smooth_modifier(fcurve, settings.post_smooth_factor):
-                                fcurves_smoothed += 1
-                
-                if fcurves_smoothed > 0:
-                    successful_objects += 1
-                    
-            if successful_objects > 0:
-                self.report({'INFO'}, f"Smoothed keyframes on {successful_objects} objects")
-                return {'FINISHED'}
-            else:
+                for fcurve in recording.recorded_fcurves(rec_obj, min_points=3):
+                    curves.append((rec_obj.target_object.name, fcurve))
+            
+            if not curves:
                 self.report({'WARNING'}, "No keyframes found to smooth (need at least 3 keyframes per curve)")
                 return {'CANCELLED'}
-                
-        except Exception as e:
-            self.report({'ERROR'}, f"Error while smoothing: {str(e)}")
-            return {'CANCELLED'}
-    
-    def apply_smooth_modifier(self, fcurve, smooth_factor):
-        """Apply smoothing to an FCurve manually since Blender doesn't have a GAUSSIAN_SMOOTH modifier"""
-        try:
-            # First create a backup of the original keyframe points
-            original_points = [(p.co.x, p.co.y) for p in fcurve.keyframe_points]
             
-            if len(original_points) < 3:
-                # Not enough points to smooth
-                return False
-                
-            # Get the smooth width based on the factor
-            # Higher factor = more neighbors considered = smoother curve
-            kernel_size = max(3, int(3 + (smooth_factor * 2)))
-            if kernel_size % 2 == 0:  # Ensure odd kernel size
-                kernel_size += 1
-                
-            # Create a simple Gaussian-like smoothing kernel
-            # This is a triangular kernel which approximates a Gaussian
-            half = kernel_size // 2
-            kernel = []
-            for i in range(kernel_size):
-                weight = 1.0 - (abs(i - half) / (half + 0.5))
-                kernel.append(weight)
-                
-            # Normalize kernel
-            total = sum(kernel)
-            kernel = [k / total for k in kernel]
+            # Smooth every curve in one vectorized pass
+            keys = [fcurve_io.read_keyframes(fcurve) for _, fcurve in curves]
+            values, mask = curve_math.pack_curves([key_values for _, key_values in keys])
+            frame_matrix, _ = curve_math.pack_curves([key_frames for key_frames, _ in keys])
+            sigma = curve_math.gaussian_sigma(settings.post_smooth_factor)
+            smoothed = curve_math.unpack_curves(curve_math.gaussian_smooth(frame_matrix, values, mask, sigma), mask)
             
-            # Apply the smoothing
-            # We'll work with a temporary list to avoid affecting values we haven't processed yet
-            new_values = []
+            for (_, fcurve), (frames, _), new_values in zip(curves, keys, smoothed):
+                fcurve_io.set_values(fcurve, frames, new_values)
             
-            # For each point, calculate the weighted average of it and its neighbors
-            for i in range(len(original_points)):
-                weighted_sum = 0
-                weights_used = 0
-                
-                for j in range(-half, half + 1):
-                    if 0 <= (i + j) < len(original_points):
-                        weight = kernel[j + half]
-                        weighted_sum += original_points[i + j][1] * weight
-                        weights_used += weight
+            successful_objects = len({name for name, _ in curves})
+            self.report({'INFO'}, f"Smoothed {len(curves)} curves on {successful_objects} objects")
+            return {'FINISHED'}
                 
-                # Normalize based on weights actually used (for edge cases)
-                if weights_used > 0:
-                    new_values.append(weighted_sum / weights_used)
-                else:
-                    new_values.append(original_points[i][1])
-                    
-            # Apply the new values
-            for i, kf in enumerate(fcurve.keyframe_points):
-                if i < len(new_values):
-                    kf.co.y = new_values[i]
-            
-            # Update the FCurve
-            fcurve.update()
-            return True
-            
         except Exception as e:
-            print(f"OSC Controller: Error smoothing FCurve: {str(e)}")
-            return False
+            self.report({'ERROR'}, f"Error while smoothing: {str(e)}")
+            return {'CANCELLED'}
 
 class OSC_OT_RemoveJitter(Operator):
     bl_idname = "osc.remove_jitter"
@@ -240,56 +146,10 @@ class OSC_OT_RemoveJitter(Operator):
                 if not rec_obj.target_object or not rec_obj.is_active:
                     continue
                 
-                obj = rec_obj.target_object
-                fcurves_processed = 0
-                keyframes_removed = 0
-                
-                # Get the object's animation data
-                animation_data = obj.animation_data
-                if not animation_data or not animation_data.action:
-                    continue
-                
-                action = animation_data.action
-                
-                # Process all selected property types
-                curves_to_process = []
-                
-                # Add location curves
-                if rec_obj.record_location:
-                    for i in range(3):
-                        fcurve = action.fcurves.find('location', index=i)
-                        if fcurve and len(fcurve.keyframe_points) > 4:
-                            curves_to_process.append(fcurve)
-                
-                # Add rotation curves
-                if rec_obj.record_rotation:
-                    for i in range(3):
-                        fcurve = action.fcurves.find('rotation_euler', index=i)
-                        if fcurve and len(fcurve.keyframe_points) > 4:
-                            curves_to_process.append(fcurve)
-                
-                # Add scale curves
-                if rec_obj.record_scale:
-                    for i in range(3):
-                        fcurve = action.fcurves.find('scale', index=i)
-                        if fcurve and len(fcurve.keyframe_points) > 4:
-                            curves_to_process.append(fcurve)
-                
-                # Add custom properties
-                if rec_obj.record_custom_properties and rec_obj.custom_properties:
-                    custom_props = [prop.strip() for prop in rec_obj.custom_properties.split(',')]
-                    for prop_name in custom_props:
-                        data_path = f'["{prop_name}"]'
-                        fcurve = action.fcurves.find(data_path)
-                        if fcurve and len(fcurve.keyframe_points) > 4:
-                            curves_to_process.append(fcurve)
-                
                 # Process each curve to remove jitter
-                for fcurve in curves_to_process:
-                    removed = self.remove_jitter_from_curve(fcurve, threshold)
-                    if removed > 0:
-                        keyframes_removed += removed
-                        fcurves_processed += 1
+                keyframes_removed = 0
+                for fcurve in recording.recorded_fcurves(rec_obj, min_points=5):
+                    keyframes_removed += self.remove_jitter_from_curve(fcurve, threshold)
                 
                 if keyframes_removed > 0:
                     objects_affected += 1
@@ -307,51 +167,17 @@ class OSC_OT_RemoveJitter(Operator):
             return {'CANCELLED'}
     
     def remove_jitter_from_curve(self, fcurve, threshold):
-        """Identify and remove keyframes that appear to be jitter outliers"""
+        """Identify all jitter outliers at once and rebuild the curve without them"""
         try:
-            # Need at least 5 keyframes for this to work effectively
-            if len(fcurve.keyframe_points) < 5:
-                return 0
-            
-            # Create a working copy of keyframe points and sort by frame
-            keyframes = [(kf.co.x, kf.co.y, i) for i, kf in enumerate(fcurve.keyframe_points)]
-            keyframes.sort(key=lambda k: k[0])  # Sort by x (frame)
-            
-            # Find outliers by comparing each point to its neighbors' trend
-            to_remove = []
-            
-            for i in range(2, len(keyframes) - 2):
-                # Get five consecutive points
-                p0 = keyframes[i-2][1]  # y value
-                p1 = keyframes[i-1][1]
-                p2 = keyframes[i][1]    # Current point
-                p3 = keyframes[i+1][1]
-                p4 = keyframes[i+2][1]
-                
-                # Calculate expected value based on neighbors
-                expected = (p0 + p1 + p3 + p4) / 4.0
-                
-                # Calculate difference from expected value
-                diff = abs(p2 - expected)
-                
-                # Calculate local range of values to normalize the difference
-                local_range = max(p0, p1, p2, p3, p4) - min(p0, p1, p2, p3, p4)
-                if local_range == 0:
-                    local_range = 0.0001  # Avoid division by zero
-                
-                # If normalized difference exceeds threshold, mark for removal
-                if (diff / local_range) > threshold:
-                    to_remove.append(keyframes[i][2])  # Original index
-            
-            # Remove the marked keyframes (in reverse order to avoid index shifting)
-            for idx in sorted(to_remove, reverse=True):
-                fcurve.keyframe_points.remove(fcurve.keyframe_points[idx])
+            frames, values = fcurve_io.read_keyframes(fcurve)
+            outliers = curve_math.hampel_outliers(values, threshold)
+            removed = int(outliers.sum())
             
-            # Update the curve
-            if to_remove:
-                fcurve.update()
+            if removed:
+                keep = ~outliers
+                fcurve_io.write_keyframes(fcurve, frames[keep], values[keep], replace=True)
             
-            return len(to_remove)
+            return removed
         
         except Exception as e:
             print(f"OSC Controller: Error removing jitter: {str(e)}")
@@ -371,8 +197,8 @@ class OSC_OT_InterpolateKeyframes(Operator):
     def execute(self, context):
         settings = context.scene.osc_settings
         gap_threshold = settings.interpolation_gap_threshold
+        method = settings.interpolation_method
         total_added = 0
-        total_removed = 0
         objects_affected = 0
         
         try:
@@ -380,56 +206,10 @@ class OSC_OT_InterpolateKeyframes(Operator):
                 if not rec_obj.target_object or not rec_obj.is_active:
                     continue
                 
-                obj = rec_obj.target_object
-                fcurves_processed = 0
-                changes_made = 0
-                
-                # Get the object's animation data
-                animation_data = obj.animation_data
-                if not animation_data or not animation_data.action:
-                    continue
-                
-                action = animation_data.action
-                
-                # Process all selected property types
-                curves_to_process = []
-                
-                # Add location curves
-                if rec_obj.record_location:
-                    for i in range(3):
-                        fcurve = action.fcurves.find('location', index=i)
-                        if fcurve and len(fcurve.keyframe_points) > 2:
-                            curves_to_process.append(fcurve)
-                
-                # Add rotation curves
-                if rec_obj.record_rotation:
-                    for i in range(3):
-                        fcurve = action.fcurves.find('rotation_euler', index=i)
-                        if fcurve and len(fcurve.keyframe_points) > 2:
-                            curves_to_process.append(fcurve)
-                
-                # Add scale curves
-                if rec_obj.record_scale:
-                    for i in range(3):
-                        fcurve = action.fcurves.find('scale', index=i)
-                        if fcurve and len(fcurve.keyframe_points) > 2:
-                            curves_to_process.append(fcurve)
-                
-                # Add custom properties
-                if rec_obj.record_custom_properties and rec_obj.custom_properties:
-                    custom_props = [prop.strip() for prop in rec_obj.custom_properties.split(',')]
-                    for prop_name in custom_props:
-                        data_path = f'["{prop_name}"]'
-                        fcurve = action.fcurves.find(data_path)
-                        if fcurve and len(fcurve.keyframe_points) > 2:
-                            curves_to_process.append(fcurve)
-                
                 # Process each curve to interpolate missing frames
-                for fcurve in curves_to_process:
-                    changes = self.interpolate_missing_frames(fcurve, gap_threshold)
-                    if changes > 0:
-                        changes_made += changes
-                        fcurves_processed += 1
+                changes_made = 0
+                for fcurve in recording.recorded_fcurves(rec_obj, min_points=3):
+                    changes_made += self.interpolate_missing_frames(fcurve, gap_threshold, method)
                 
                 if changes_made > 0:
                     objects_affected += 1
@@ -446,112 +226,250 @@ class OSC_OT_InterpolateKeyframes(Operator):
             self.report({'ERROR'}, f"Error while interpolating: {str(e)}")
             return {'CANCELLED'}
     
-    def interpolate_missing_frames(self, fcurve, gap_threshold):
-        """Add bezier-interpolated keyframes in gaps between existing keyframes and handle identical keyframes"""
+    def interpolate_missing_frames(self, fcurve, gap_threshold, method='bezier'):
+        """Fill gaps of up to gap_threshold frames and collapse identical keyframes, rebuilding the curve once"""
         try:
             # Need at least 2 keyframes to interpolate between
             if len(fcurve.keyframe_points) < 2:
                 return 0
             
-            # Create a working copy of keyframe points and sort by frame
-            keyframes = [(kf.co.x, kf.co.y, i) for i, kf in enumerate(fcurve.keyframe_points)]
-            keyframes.sort(key=lambda k: k[0])  # Sort by x (frame)
+            frames, values = fcurve_io.read_keyframes(fcurve)
             
-            # First, identify sequences of identical keyframes
-            identical_sequences = []
-            current_sequence = []
+            # Fill gaps first, so Bezier values come from the curve as recorded
+            handles_left = handles_right = None
+            if method == 'bezier':
+                handles_left, handles_right = fcurve_io.read_handles(fcurve)
+            frames, values, frames_added = curve_math.fill_gaps(
+                frames, values, gap_threshold, method, handles_left, handles_right)
             
-            for i in range(len(keyframes) - 1):
-                current_value = keyframes[i][1]
-                next_value = keyframes[i+1][1]
-                
-                # Check if the values are identical (within a small epsilon for floating-point comparison)
-                if abs(current_value - next_value) < 0.0001:
-                    if not current_sequence:
-                        current_sequence = [i]  # Start a new sequence
-                    current_sequence.append(i+1)
-                else:
-                    # End of a sequence
-                    if current_sequence:
-                        if len(current_sequence) > 1:  # Only consider sequences of 2+ identical keyframes
-                            identical_sequences.append(current_sequence)
-                        current_sequence = []
-            
-            # Add the last sequence if it exists
-            if current_sequence and len(current_sequence) > 1:
-                identical_sequences.append(current_sequence)
-            
-            # Get indices to remove (keep first and last keyframe of each identical sequence)
-            indices_to_remove = []
-            for sequence in identical_sequences:
-                # Keep first and last of sequence, remove the middle ones
-                indices_to_remove.extend([keyframes[idx][2] for idx in sequence[1:-1]])
-            
-            # Remove identical keyframes (in reverse order to avoid index shifting)
-            removed_count = 0
-            for idx in sorted(indices_to_remove, reverse=True):
-                fcurve.keyframe_points.remove(fcurve.keyframe_points[idx - removed_count])
-                removed_count += 1
-            
-            # Refresh the keyframes list after removing identical ones
-            if removed_count > 0:
-                fcurve.update()
-                keyframes = [(kf.co.x, kf.co.y, i) for i, kf in enumerate(fcurve.keyframe_points)]
-                keyframes.sort(key=lambda k: k[0])
+            # Keep only the first and last keyframe of each identical run
+            interiors = curve_math.duplicate_run_interiors(values)
+            removed_count = int(interiors.sum())
             
-            # Now look for gaps and interpolate
-            frames_added = 0
-            new_keyframes = []
+            if frames_added or removed_count:
+                keep = ~interiors
+                fcurve_io.write_keyframes(fcurve, frames[keep], values[keep], replace=True)
             
-            for i in range(len(keyframes) - 1):
-                current_frame = int(keyframes[i][0])
-                next_frame = int(keyframes[i+1][0])
+            return frames_added + removed_count  # Return total count of changes (frames added + identical frames removed)
+        
+        except Exception as e:
+            print(f"OSC Controller: Error interpolating frames: {str(e)}")
+            return 0
+
+class OSC_OT_DecimateKeyframes(Operator):
+    bl_idname = "osc.decimate_keyframes"
+    bl_label = "Decimate Keyframes"
+    bl_description = "Remove keyframes that the recorded curves can do without (Ramer-Douglas-Peucker)"
+    
+    @classmethod
+    def poll(cls, context):
+        # Only show this operator if we have record objects
+        return len(context.scene.osc_record_objects) > 0
+    
+    def execute(self, context):
+        tolerance = context.scene.osc_settings.decimate_tolerance
+        keys_before = 0
+        keys_after = 0
+        
+        try:
+            for rec_obj in context.scene.osc_record_objects:
+                if not rec_obj.target_object or not rec_obj.is_active:
+                    continue
                 
-                # Check if there's a gap larger than threshold
-                frame_gap = next_frame - current_frame
-                if frame_gap > gap_threshold:
-                    # Calculate how many frames to add
-                    frames_to_add = frame_gap - 1  # -1 because we don't count start/end frames
+                for fcurve in recording.recorded_fcurves(rec_obj, min_points=3):
+                    frames, values = fcurve_io.read_keyframes(fcurve)
+                    keep = curve_math.decimate(frames, values, tolerance)
+                    kept = int(keep.sum())
+                    keys_before += len(frames)
+                    keys_after += kept
                     
-                    # Get the handle positions for bezier interpolation
-                    # We'll use the actual handle positions if available for better curves
-                    p0 = (keyframes[i][0], keyframes[i][1])      # Start point
-                    p3 = (keyframes[i+1][0], keyframes[i+1][1])  # End point
-                    
-                    # Generate frames
-                    for j in range(1, frames_to_add + 1):
-                        # Calculate bezier interpolation at this point
-                        t = j / (frames_to_add + 1)  # Normalized time parameter (0-1)
-                        
-                        # Simple cubic bezier interpolation
-                        frame = current_frame + j
-                        # Calculate a mid-point value using bezier interpolation
-                        value = self.bezier_interpolate(p0[1], p3[1], t)
-                        
-                        new_keyframes.append((frame, value))
-                        frames_added += 1
+                    # Rebuild once. Segments that lost keys become LINEAR, the
+                    # tolerance holds for straight lines between the kept keys.
+                    if kept < len(frames):
+                        fcurve_io.write_keyframes(fcurve, frames[keep], values[keep], replace=True,
+                                                  linear=curve_math.decimated_segments(keep))
+            
+            if keys_before == 0:
+                self.report({'INFO'}, "No keyframes found to decimate")
+                return {'FINISHED'}
             
-            # Add all the new keyframes
-            for frame, value in new_keyframes:
-                kf = fcurve.keyframe_points.insert(frame, value)
-                # Set the interpolation mode to bezier
-                kf.interpolation = 'BEZIER'
+            ratio = keys_before / max(keys_after, 1)
+            self.report({'INFO'}, f"Decimated {keys_before} keyframes to {keys_after} ({ratio:.1f}x reduction)")
+            return {'FINISHED'}
+        
+        except Exception as e:
+            self.report({'ERROR'}, f"Error while decimating: {str(e)}")
+            return {'CANCELLED'}
+
+class OSC_OT_ProcessRecording(Operator):
+    bl_idname = "osc.process_recording"
+    bl_label = "Process Recording"
+    bl_description = "Run all enabled post-processing stages on the recorded curves in worker processes (Esc to cancel)"
+    
+    _timer = None
+    _run = None
+    
+    @classmethod
+    def poll(cls, context):
+        # Only one run at a time, and only with record objects
+        return post_process.active_run is None and len(context.scene.osc_record_objects) > 0
+    
+    def start_run(self, context):
+        settings = context.scene.osc_settings
+        options = post_process.pipeline_options(settings)
+        if options is None:
+            self.report({'INFO'}, "No post-processing stages enabled")
+            return None
+        
+        curves = []
+        for rec_obj in context.scene.osc_record_objects:
+            if rec_obj.target_object and rec_obj.is_active:
+                obj = rec_obj.target_object
+                curves.extend((obj, fcurve) for fcurve in recording.recorded_fcurves(rec_obj, min_points=3))
+        if not curves:
+            self.report({'INFO'}, "No recorded keyframes found to process")
+            return None
+        
+        run = post_process.PostProcessRun(curves, options, settings.post_process_workers)
+        run.start()
+        return run
+    
+    def finish(self, context, run):
+        totals = run.write_back()
+        ratio = totals['keys_before'] / max(totals['keys_after'], 1)
+        self.report({'INFO'}, (
+            f"Processed {run.total} curves: {totals['removed']} removed, {totals['added']} added, "
+            f"{totals['decimated']} decimated ({totals['keys_before']} -> {totals['keys_after']} keys, {ratio:.1f}x)"
+        ))
+        if totals['skipped']:
+            self.report({'WARNING'}, f"Skipped {totals['skipped']} curves that were removed during processing")
+    
+    def execute(self, context):
+        try:
+            run = self.start_run(context)
+            if run is None:
+                return {'CANCELLED'}
+            run.wait()
+            self.finish(context, run)
+            return {'FINISHED'}
+        except Exception as e:
+            self.report({'ERROR'}, f"Error while processing recording: {str(e)}")
+            return {'CANCELLED'}
+    
+    def invoke(self, context, event):
+        try:
+            run = self.start_run(context)
+        except Exception as e:
+            self.report({'ERROR'}, f"Error while processing recording: {str(e)}")
+            return {'CANCELLED'}
+        if run is None:
+            return {'CANCELLED'}
+        if run.finished:
+            self.finish(context, run)
+            return {'FINISHED'}
+        
+        post_process.active_run = run
+        self._run = run
+        wm = context.window_manager
+        wm.progress_begin(0, run.total)
+        self._timer = wm.event_timer_add(0.1, window=context.window)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+    
+    def modal(self, context, event):
+        run = post_process.active_run
+        if run is None or run is not self._run:
+            # Cancelled from elsewhere: undo, file load, a new take or add-on unregister
+            self.cleanup(context)
+            return {'CANCELLED'}
+        
+        if event.type == 'ESC':
+            run.cancel()
+            self.cleanup(context)
+            self.report({'WARNING'}, "Post-processing cancelled, curves left unchanged")
+            return {'CANCELLED'}
+        
+        if event.type == 'TIMER':
+            try:
+                done = run.poll()
+            except Exception as e:
+                run.cancel()
+                self.cleanup(context)
+                self.report({'ERROR'}, f"Error while processing recording: {str(e)}")
+                return {'CANCELLED'}
             
-            # Update the curve
-            if new_keyframes or removed_count > 0:
-                fcurve.update()
+            context.window_manager.progress_update(done)
+            for area in context.screen.areas:
+                if area.type == 'VIEW_3D':
+                    area.tag_redraw()
             
-            return frames_added + removed_count  # Return total count of changes (frames added + identical frames removed)
+            if run.finished:
+                self.cleanup(context)
+                self.finish(context, run)
+                return {'FINISHED'}
         
+        return {'PASS_THROUGH'}
+    
+    def cleanup(self, context):
+        wm = context.window_manager
+        if self._timer is not None:
+            wm.event_timer_remove(self._timer)
+            self._timer = None
+        wm.progress_end()
+        if post_process.active_run is self._run:
+            post_process.active_run = None
+        self._run = None
+
+class OSC_OT_ImportTake(Operator):
+    bl_idname = "osc.import_take"
+    bl_label = "Import Take"
+    bl_description = "Load a take streamed to disk into F-Curves"
+    
+    filepath: StringProperty(
+        name="Take File",
+        description="Take file to import",
+        subtype='FILE_PATH'
+    )
+    
+    use_frame_range: BoolProperty(
+        name="Frame Range Only",
+        description="Only import the part of the take within a frame range",
+        default=False
+    )
+    
+    frame_start: IntProperty(name="Start Frame", default=1)
+    
+    frame_end: IntProperty(name="End Frame", default=250)
+    
+    def invoke(self, context, event):
+        # Default to the take recorded last
+        self.filepath = context.scene.osc_settings.last_take_path
+        self.frame_start = context.scene.frame_start
+        self.frame_end = context.scene.frame_end
+        return context.window_manager.invoke_props_dialog(self)
+    
+    def execute(self, context):
+        path = bpy.path.abspath(self.filepath or context.scene.osc_settings.last_take_path)
+        if not path:
+            self.report({'ERROR'}, "No take file selected")
+            return {'CANCELLED'}
+        frame_start = self.frame_start if self.use_frame_range else None
+        frame_end = self.frame_end if self.use_frame_range else None
+        
+        try:
+            written, keys, missing = recording.import_take(path, frame_start, frame_end)
         except Exception as e:
-            print(f"OSC Controller: Error interpolating frames: {str(e)}")
-            return 0
+            self.report({'ERROR'}, f"Failed to import take: {str(e)}")
+            return {'CANCELLED'}
+        
+        if missing:
+            self.report({'WARNING'}, f"Skipped channels of missing objects: {', '.join(missing)}")
+        if not written:
+            self.report({'WARNING'}, "No samples found to import")
+            return {'CANCELLED'}
         
-        def bezier_interpolate(self, start_value, end_value, t):
-            """Simple bezier interpolation between two values"""
-            # For a simple curve, we can use a basic cubic interpolation
-            # In a more complex implementation, we'd use the actual handle positions
-            return start_value + (end_value - start_value) * (3 * t**2 - 2 * t**3)
+        self.report({'INFO'}, f"Imported {keys} keyframes into {written} F-Curves")
+        return {'FINISHED'}
 
 # Register
 classes = (
@@ -561,7 +479,10 @@ classes = (
     OSC_OT_SetSceneFPS,
     OSC_OT_SmoothKeyframes,
     OSC_OT_RemoveJitter,
-    OSC_OT_InterpolateKeyframes
+    OSC_OT_InterpolateKeyframes,
+    OSC_OT_DecimateKeyframes,
+    OSC_OT_ProcessRecording,
+    OSC_OT_ImportTake
 )
 
 def register():
@@ -5,6 +5,9 @@ import threading
 from bpy.types import Operator
 from ..core import utils
 from ..core import osc_server
+from ..core import routing
+from ..core import ingest
+from ..core import capture
 
 # Operator to install dependencies
 class OSC_OT_InstallDependencies(Operator):
@@ -58,29 +61,44 @@ class OSC_OT_StartServer(Operator):
             return {'CANCELLED'}
         
         try:
-            from pythonosc import dispatcher, osc_server as osc_server_lib
+            from pythonosc import dispatcher
+            
+            # Make sure the network thread starts with up-to-date routing
+            routing.rebuild_routing_table(context.scene)
             
             # Create OSC dispatcher
             disp = dispatcher.Dispatcher()
             disp.map("/*", osc_server.osc_handler)  # Map all OSC addresses
             
+            # Park bundle messages with future timetags instead of sleeping
+            # in the receive thread
+            osc_server.timetag_scheduler.reset_stats()
+            osc_server.timetag_scheduler.start()
+            disp.set_scheduler(osc_server.timetag_scheduler.schedule)
+            
+            # Every packet passes through the capture tap, which copies it to
+            # the capture file while a capture is running
+            disp = capture.CaptureDispatcher(disp)
+            
             # Start OSC server
             settings = context.scene.osc_settings
             ip = settings.ip_address
             port = settings.port
             
-            server = osc_server_lib.ThreadingOSCUDPServer((ip, port), disp)
+            server = ingest.create_server(settings, disp)
             server_thread = threading.Thread(target=server.serve_forever)
             server_thread.daemon = True
             server_thread.start()
             
             osc_server.osc_server_instance = server
             osc_server.osc_server_thread = server_thread
+            osc_server.osc_dispatcher = disp
             osc_server.is_server_running = True
             
-            self.report({'INFO'}, f"OSC Server started at {ip}:{port}")
+            self.report({'INFO'}, f"OSC Server started at {ip}:{port} ({settings.server_type})")
             return {'FINISHED'}
         except Exception as e:
+            osc_server.timetag_scheduler.stop()
             error_message = str(e)
             self.report({'ERROR'}, f"Failed to start OSC Server: {error_message}")
             utils.dependency_error = f"Server error: {error_message}"
@@ -100,8 +118,11 @@ class OSC_OT_StopServer(Operator):
         try:
             if osc_server.osc_server_instance:
                 osc_server.osc_server_instance.shutdown()
+                osc_server.osc_server_instance.server_close()
                 osc_server.osc_server_instance = None
+                osc_server.osc_dispatcher = None
                 osc_server.is_server_running = False
+                osc_server.timetag_scheduler.stop()
                 self.report({'INFO'}, "OSC Server stopped")
             return {'FINISHED'}
         except Exception as e:
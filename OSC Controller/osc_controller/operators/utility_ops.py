@@ -2,6 +2,8 @@ import bpy
 import webbrowser
 from bpy.types import Operator
 from bpy.props import StringProperty
+from ..core import metrics
+from ..core import background_render
 
 # Operator to open documentation URL
 class OSC_OT_OpenDocumentation(Operator):
@@ -19,9 +21,32 @@ class OSC_OT_OpenDocumentation(Operator):
             self.report({'ERROR'}, f"Failed to open URL: {str(e)}")
             return {'CANCELLED'}
 
+# Operator to reset the ingest metrics shown in the debug panel
+class OSC_OT_ResetMetrics(Operator):
+    bl_idname = "osc.reset_metrics"
+    bl_label = "Reset Metrics"
+    bl_description = "Reset message counts, latency histogram and apply queue statistics"
+    
+    def execute(self, context):
+        metrics.reset()
+        return {'FINISHED'}
+
+# Operator to drop queued background renders that have not started
+class OSC_OT_CancelRenderQueue(Operator):
+    bl_idname = "osc.cancel_render_queue"
+    bl_label = "Cancel Queued Renders"
+    bl_description = "Drop queued /renderimage jobs that have not started; running renders finish"
+    
+    def execute(self, context):
+        count = background_render.cancel_pending()
+        self.report({'INFO'}, f"Cancelled {count} queued render(s)")
+        return {'FINISHED'}
+
 # Register
 classes = (
     OSC_OT_OpenDocumentation,
+    OSC_OT_ResetMetrics,
+    OSC_OT_CancelRenderQueue,
 )
 
 def register():
@@ -2,6 +2,10 @@ import bpy
 from bpy.types import Panel
 from ..core import osc_server
 from ..core import recording
+from ..core import apply_queue
+from ..core import metrics
+from ..core import capture
+from ..core import debug_snapshot
 
 # Debug UI Panel
 class OSC_PT_DebugPanel(Panel):
@@ -19,14 +23,22 @@ class OSC_PT_DebugPanel(Panel):
         layout.prop(debug, "show_debug")
         
         if debug.show_debug:
+            # Throttled copy of the received state, see SNAPSHOT_INTERVAL
+            snapshot = debug_snapshot.get_snapshot(debug.address_filter)
+            
             box = layout.box()
             col = box.column()
             col.label(text="Last OSC Address:")
-            col.label(text=debug.last_received_address)
+            col.label(text=snapshot.last_address)
             
             col.separator()
             col.label(text="Last OSC Value:")
-            col.label(text=debug.last_received_value)
+            col.label(text=snapshot.last_value)
+            
+            col.separator()
+            col.label(text="Recent Messages:")
+            for address, value in snapshot.recent:
+                col.label(text=f"  {address}: {value}")
             
             # Show current recording state
             col.separator()
@@ -35,6 +47,65 @@ class OSC_PT_DebugPanel(Panel):
             else:
                 col.label(text="Recording Status: Inactive", icon='SNAP_FACE')
             
+            # Show ingest metrics
+            col.separator()
+            row = col.row()
+            row.label(text=f"Messages Received: {metrics.messages_total}")
+            row.operator("osc.reset_metrics", text="", icon='FILE_REFRESH')
+            for address, rate, count in metrics.top_addresses(5):
+                col.label(text=f"  {address}: {rate:.1f}/s ({count})")
+            
+            lat = metrics.latency
+            col.label(text=f"Latency: p50 {lat.percentile(0.5):.1f} ms, p99 {lat.percentile(0.99):.1f} ms, "
+                           f"max {lat.max_ms:.1f} ms")
+            
+            # Show apply queue statistics
+            last = metrics.last_drain_stats
+            total = metrics.total_drain_stats
+            col.label(text=f"Apply Queue: {len(apply_queue.update_queue)} pending, max {metrics.max_queue_depth}")
+            col.label(text=f"Last Tick: {last['applied']} applied in {last['writes']} writes, "
+                           f"{metrics.last_apply_ms:.2f} ms (max {metrics.max_apply_ms:.2f} ms)")
+            col.label(text=f"Last Tick: {last['coalesced']} coalesced, {last['dropped']} dropped")
+            col.label(text=f"Total: {total['applied']} applied, {total['coalesced']} coalesced, {total['dropped']} dropped")
+            
+            # Show timetag scheduler statistics
+            col.separator()
+            sched = osc_server.timetag_scheduler
+            col.label(text=f"Scheduled Bundles: {len(sched)} pending, {sched.released} released")
+            drops = metrics.scheduler_drops
+            if drops["full"] or drops["ahead"]:
+                col.label(text=f"Dropped Bundles: {drops['full']} over {sched.max_pending} pending, "
+                               f"{drops['ahead']} due over {sched.max_ahead:.0f} s ahead", icon='ERROR')
+            col.label(text=f"Release Lateness: last {sched.last_lateness * 1000:.2f} ms, "
+                           f"mean {sched.mean_lateness() * 1000:.2f} ms, max {sched.max_lateness * 1000:.2f} ms")
+            
+            # Traffic capture and replay
+            col.separator()
+            settings = context.scene.osc_settings
+            col.label(text="Capture & Replay:")
+            col.prop(settings, "capture_path", text="")
+            row = col.row(align=True)
+            writer = capture.active_writer
+            if writer is not None:
+                row.operator("osc.stop_capture", icon='SNAP_FACE')
+                row.label(text=f"{writer.records} packets", icon='REC')
+            else:
+                row.operator("osc.start_capture", icon='REC')
+                if settings.last_capture_path:
+                    row.label(text=f"Last: {bpy.path.basename(settings.last_capture_path)}")
+            
+            row = col.row(align=True)
+            row.prop(settings, "replay_target", text="")
+            row.prop(settings, "replay_speed", text="Speed")
+            row = col.row(align=True)
+            if capture.is_replaying():
+                row.operator("osc.stop_replay", icon='PAUSE')
+            else:
+                row.operator("osc.replay_capture", icon='PLAY')
+                result = capture.last_replay_result
+                if result is not None:
+                    row.label(text=f"Last: {result['packets']} packets in {result['elapsed']:.2f} s")
+            
             # Show all values option
             col.separator()
             col.prop(debug, "show_all_values")
@@ -42,19 +113,32 @@ class OSC_PT_DebugPanel(Panel):
             if debug.show_all_values:
                 col.separator()
                 col.label(text="All OSC Values:")
+                col.prop(debug, "address_filter", icon='VIEWZOOM')
                 
-                if not osc_server.osc_values_dict:
-                    col.label(text="No values received yet")
+                rows = snapshot.rows
+                if not rows:
+                    if osc_server.osc_values_dict:
+                        col.label(text="No addresses match the filter")
+                    else:
+                        col.label(text="No values received yet")
                 else:
-                    for addr, value in osc_server.osc_values_dict.items():
+                    # Only build widgets for the current page
+                    page_count = (len(rows) + debug.page_size - 1) // debug.page_size
+                    page = min(debug.page, page_count)
+                    row = col.row(align=True)
+                    row.prop(debug, "page")
+                    row.prop(debug, "page_size")
+                    col.label(text=f"Page {page} of {page_count} ({len(rows)} addresses)")
+                    
+                    start = (page - 1) * debug.page_size
+                    for addr, value, mapped_value in rows[start:start + debug.page_size]:
                         value_box = col.box()
                         value_box.label(text=f"Address: {addr}")
                         value_box.label(text=f"Raw Value: {value}")
                         
                         # Show mapped value if available
-                        mapped_key = f"{addr}_mapped"
-                        if mapped_key in osc_server.mapped_values_dict:
-                            value_box.label(text=f"Mapped Value: {osc_server.mapped_values_dict[mapped_key]}")
+                        if mapped_value is not None:
+                            value_box.label(text=f"Mapped Value: {mapped_value}")
                         
                         # Add copy buttons for driver expressions
                         row = value_box.row()
@@ -62,7 +146,7 @@ class OSC_PT_DebugPanel(Panel):
                         raw_op.driver_type = "raw"
                         raw_op.address = addr
                         
-                        if mapped_key in osc_server.mapped_values_dict:
+                        if mapped_value is not None:
                             mapped_op = row.operator("osc.copy_driver_expression", text="Copy Mapped", icon='COPYDOWN')
                             mapped_op.driver_type = "mapped"
                             mapped_op.address = addr
@@ -3,6 +3,7 @@ from bpy.types import Panel
 from ..core import osc_server
 from ..core import utils
 from ..core import recording  # Make sure this import is present
+from ..core import background_render
 
 # Main UI Panel
 class OSC_PT_MainPanel(Panel):
@@ -26,6 +27,16 @@ class OSC_PT_MainPanel(Panel):
         row = box.row()
         row.prop(settings, "port")
         
+        row = box.row()
+        row.prop(settings, "server_type")
+        
+        if settings.server_type == 'asyncio':
+            row = box.row()
+            row.prop(settings, "extra_listeners")
+        
+        row = box.row()
+        row.prop(settings, "receive_buffer_size")
+        
         # Server status and control
         row = box.row()
         if osc_server.is_server_running:
@@ -35,12 +46,59 @@ class OSC_PT_MainPanel(Panel):
             row.operator("osc.start_server", icon='PLAY')
             row.label(text="Server Stopped", icon='X')
         
+        # Live smoothing of incoming values
+        box = layout.box()
+        row = box.row()
+        row.prop(settings, "enable_smoothing")
+        
+        if settings.enable_smoothing:
+            row = box.row()
+            row.prop(settings, "smoothing_method")
+            
+            if settings.smoothing_method in ('buffer', 'both'):
+                row = box.row()
+                row.prop(settings, "smoothing_buffer_size")
+            if settings.smoothing_method in ('threshold', 'both'):
+                row = box.row()
+                row.prop(settings, "smoothing_threshold")
+            if settings.smoothing_method == 'ema':
+                row = box.row()
+                row.prop(settings, "smoothing_ema_factor")
+            if settings.smoothing_method == 'one_euro':
+                row = box.row(align=True)
+                row.prop(settings, "one_euro_min_cutoff")
+                row.prop(settings, "one_euro_beta")
+                row = box.row()
+                row.prop(settings, "one_euro_d_cutoff")
+        
         # Special commands info
         special_box = layout.box()
         special_box.label(text="Special OSC Commands:")
         
         row = special_box.row()
         row.label(text="/renderimage: Start a render (value=1)")
+        row = special_box.row()
+        row.prop(settings, "render_mode", text="Render")
+        if settings.render_mode == 'background':
+            row = special_box.row()
+            row.prop(settings, "render_workers")
+            row = special_box.row()
+            row.prop(settings, "render_reply_enabled")
+            if settings.render_reply_enabled:
+                row = special_box.row(align=True)
+                row.prop(settings, "render_reply_host", text="")
+                row.prop(settings, "render_reply_port", text="")
+            row = special_box.row()
+            row.label(text=f"Queue: {len(background_render.pending)} waiting, {len(background_render.running)} rendering")
+            if background_render.pending:
+                row.operator("osc.cancel_render_queue", text="", icon='X')
+            if background_render.last_result:
+                job_id, path, seconds, code = background_render.last_result
+                row = special_box.row()
+                if code == 0:
+                    row.label(text=f"Job {job_id}: {seconds:.1f}s - {bpy.path.basename(path)}")
+                else:
+                    row.label(text=f"Job {job_id}: failed (code {code})", icon='ERROR')
         
         row = special_box.row()
         # Use recording.is_recording here, not osc_server.is_recording
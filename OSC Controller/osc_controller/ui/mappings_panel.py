@@ -1,6 +1,7 @@
 import bpy
 from bpy.types import Panel
 from ..core import osc_server
+from ..core import utils
 
 # Mappings UI Panel
 class OSC_PT_MappingsPanel(Panel):
@@ -42,6 +43,14 @@ class OSC_PT_MappingsPanel(Panel):
                 if mapping.property_type == 'custom_property':
                     box.prop(mapping, "custom_property_name")
                 
+                arity = utils.property_arity(mapping.property_type)
+                if arity > 1:
+                    box.label(text=f"Expects {arity} float arguments per message", icon='INFO')
+                    if mapping.property_type == 'matrix':
+                        box.label(text="Ranges are not applied to matrix arguments")
+                    elif mapping.property_type in ('rotation_quaternion', 'location_quaternion'):
+                        box.label(text="Ranges are not applied to quaternion arguments")
+                
                 box.prop(mapping, "osc_address")
                 
                 # Raw input range
@@ -104,7 +113,10 @@ class OSC_PT_MappingsPanel(Panel):
                     # Mapped value
                     mapped_key = f"{mapping.osc_address}_mapped"
                     mapped_value = osc_server.mapped_values_dict.get(mapped_key, 0.0)
-                    driver_box.label(text=f"Mapped: {round(mapped_value, 4)}")
+                    if isinstance(mapped_value, tuple):
+                        driver_box.label(text=f"Mapped: ({', '.join(f'{v:.4f}' for v in mapped_value)})")
+                    else:
+                        driver_box.label(text=f"Mapped: {round(mapped_value, 4)}")
                     
                     # Example usage
                     driver_box.label(text="Usage: Add a driver, set to Scripted Expression")
@@ -112,9 +124,57 @@ class OSC_PT_MappingsPanel(Panel):
                 elif mapping.show_driver_info and not osc_server.is_server_running:
                     box.label(text="Start the OSC server to use drivers", icon='INFO')
 
+# Bone Streams UI Panel
+class OSC_PT_BoneStreamsPanel(Panel):
+    bl_label = "OSC Bone Streams"
+    bl_idname = "OSC_PT_BoneStreamsPanel"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = 'OSC'
+    bl_options = {'DEFAULT_CLOSED'}
+    
+    def draw(self, context):
+        layout = self.layout
+        
+        row = layout.row(align=True)
+        row.scale_y = 1.5
+        row.operator("osc.add_bone_stream", icon='ADD')
+        row.operator("osc.refresh_routing", text="", icon='FILE_REFRESH')
+        
+        if len(context.scene.osc_bone_streams) == 0:
+            box = layout.box()
+            box.label(text="No bone streams defined", icon='INFO')
+            box.label(text="Drive every pose bone of an armature from")
+            box.label(text="one address template such as /skel/*/rot")
+            return
+        
+        for idx, stream in enumerate(context.scene.osc_bone_streams):
+            box = layout.box()
+            row = box.row()
+            row.prop(stream, "is_active", text="")
+            
+            if stream.is_active:
+                row.label(text=f"Bone Stream {idx+1}")
+            else:
+                row.label(text=f"Bone Stream {idx+1} (Disabled)")
+            
+            row.operator("osc.remove_bone_stream", text="", icon='X').index = idx
+            
+            box.prop(stream, "armature")
+            box.prop(stream, "address_template")
+            box.prop(stream, "channel")
+            
+            arity = utils.property_arity(stream.channel)
+            if stream.armature and stream.armature.pose:
+                bones = stream.armature.pose.bones
+                if len(bones):
+                    example = stream.address_template.replace('*', bones[0].name)
+                    box.label(text=f"{len(bones)} bones, e.g. {example} with {arity} floats", icon='BONE_DATA')
+
 # Register
 classes = (
     OSC_PT_MappingsPanel,
+    OSC_PT_BoneStreamsPanel,
 )
 
 def register():
@@ -1,6 +1,7 @@
 import bpy
 from bpy.types import Panel
 from ..core import recording
+from ..core import post_process
 
 # Recording Panel
 class OSC_PT_RecordingPanel(Panel):
@@ -38,11 +39,34 @@ class OSC_PT_RecordingPanel(Panel):
         row = box.row()
         row.label(text=f"Scene Frame Rate: {context.scene.render.fps} fps")
         
+        # Recording clock
+        row = box.row()
+        row.prop(settings, "recording_clock", text="Clock")
+        
         # Auto-stop option
         row = box.row()
         row.prop(settings, "auto_stop_at_end")
         row.label(text=f"End Frame: {context.scene.frame_end}")
         
+        # Streaming long takes to disk
+        box = layout.box()
+        row = box.row()
+        row.prop(settings, "record_to_disk")
+        if settings.record_to_disk:
+            col = box.column(align=True)
+            col.prop(settings, "take_path", text="")
+            take = recording.take_buffer
+            if take is not None and take.stream is not None:
+                col.label(text=f"Streamed: {take.stream.rows} samples, {take.stream.bytes_written / 1024:.1f} KB")
+                if take.stream.error is not None:
+                    col.label(text=f"Writing failed: {take.stream.error}", icon='ERROR')
+                elif take.backlogged:
+                    col.label(text="Disk is falling behind, buffering in memory", icon='INFO')
+            elif settings.last_take_path:
+                col.label(text=f"Last take: {bpy.path.basename(settings.last_take_path)}")
+        row = box.row()
+        row.operator("osc.import_take", icon='IMPORT')
+        
  # Post-processing section
         box = layout.box()
         box.label(text="Post-Recording Processing:")
@@ -83,9 +107,40 @@ class OSC_PT_RecordingPanel(Panel):
             row.prop(settings, "interpolation_gap_threshold", text="Max Frame Gap")
             row.label(text="Maximum gap to fill")
             
+            row = sub_box.row()
+            row.prop(settings, "interpolation_method", text="Method")
+            
             row = sub_box.row()
             row.operator("osc.interpolate_keyframes", text="Apply Effect", icon='IPO_BEZIER')
         
+        # Decimation options
+        row = box.row()
+        row.prop(settings, "decimate_keyframes", text="Decimate Keyframes")
+        
+        if settings.decimate_keyframes:
+            sub_box = box.box()
+            row = sub_box.row()
+            row.prop(settings, "decimate_tolerance", text="Tolerance")
+            row.label(text="Higher = Fewer Keys")
+            
+            row = sub_box.row()
+            row.operator("osc.decimate_keyframes", text="Apply Effect", icon='IPO_LINEAR')
+        
+        # Background processing
+        row = box.row(align=True)
+        row.prop(settings, "parallel_post_processing")
+        sub = row.row(align=True)
+        sub.enabled = settings.parallel_post_processing
+        sub.prop(settings, "post_process_workers", text="Workers")
+        
+        run = post_process.active_run
+        if run is not None:
+            row = box.row()
+            row.label(text=f"Processing curves: {run.done}/{run.total} (Esc to cancel)", icon='SORTTIME')
+        else:
+            row = box.row()
+            row.operator("osc.process_recording", text="Process All Now", icon='PLAY')
+        
         # Explanation text
         col = box.column(align=True)
         col.separator()
@@ -94,6 +149,7 @@ class OSC_PT_RecordingPanel(Panel):
         col.label(text="• Gaussian Smoothing: Reduce jitter while keeping intentional motion")
         col.label(text="• Interpolate Frames: Remove redundant identical keyframes and")
         col.label(text="  fill gaps with smooth bezier curves")
+        col.label(text="• Decimate: Drop keyframes the curve shape does not need")
         
         # Recording instructions
         box = layout.box()
@@ -0,0 +1,120 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# capture has no bpy dependency, import it without the add-on package
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "osc_controller", "core"))
+import capture
+
+
+PACKETS = [
+    (10.0, b"/a\x00\x00,f\x00\x00?\x80\x00\x00"),
+    (10.25, b"/b\x00\x00,i\x00\x00\x00\x00\x00\x07"),
+    (10.5, b"#bundle\x00" + bytes(8)),
+]
+
+
+class RecordingDispatcher:
+    """Dispatcher stand-in that keeps every packet it is handed"""
+
+    def __init__(self):
+        self.packets = []
+
+    def call_handlers_for_packet(self, data, client_address):
+        self.packets.append((bytes(data), client_address))
+
+
+class TestCapture(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "traffic.osccap")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write_capture(self, packets=PACKETS):
+        writer = capture.CaptureWriter(self.path)
+        for received_at, data in packets:
+            writer.write(data, received_at)
+        writer.close()
+        return writer
+
+    def test_round_trip(self):
+        writer = self.write_capture()
+        self.assertEqual(writer.records, 3)
+        self.assertEqual(writer.bytes_written, os.path.getsize(self.path))
+        records = [(received_at, bytes(data)) for received_at, data in capture.iter_capture(self.path)]
+        self.assertEqual(records, PACKETS)
+
+    def test_empty_capture(self):
+        self.write_capture([])
+        self.assertEqual(list(capture.iter_capture(self.path)), [])
+
+    def test_truncated_last_record(self):
+        self.write_capture()
+        size = os.path.getsize(self.path)
+        with open(self.path, "r+b") as f:
+            f.truncate(size - 3)
+
+        # The cut record is dropped, the complete ones replay
+        records = [(received_at, bytes(data)) for received_at, data in capture.iter_capture(self.path)]
+        self.assertEqual(records, PACKETS[:2])
+
+    def test_truncated_record_header(self):
+        self.write_capture()
+        last = capture.RECORD_HEADER.size + len(PACKETS[-1][1])
+        with open(self.path, "r+b") as f:
+            f.truncate(os.path.getsize(self.path) - last + 5)
+        self.assertEqual(len(list(capture.iter_capture(self.path))), 2)
+
+    def test_not_a_capture_file(self):
+        with open(self.path, "wb") as f:
+            f.write(b"something else")
+        with self.assertRaises(ValueError):
+            list(capture.iter_capture(self.path))
+
+    def test_existing_file_is_not_replaced(self):
+        self.write_capture()
+        with self.assertRaises(FileExistsError):
+            capture.CaptureWriter(self.path)
+        self.assertEqual(len(list(capture.iter_capture(self.path))), 3)
+
+    def test_replay_into_dispatcher(self):
+        self.write_capture()
+        dispatcher = RecordingDispatcher()
+        result = capture.replay(self.path, dispatcher, speed=0)
+        self.assertEqual(result["packets"], 3)
+        self.assertEqual(dispatcher.packets, [(data, capture.REPLAY_CLIENT_ADDRESS) for _, data in PACKETS])
+
+    def test_replay_truncated_capture(self):
+        self.write_capture()
+        with open(self.path, "r+b") as f:
+            f.truncate(os.path.getsize(self.path) - 1)
+        dispatcher = RecordingDispatcher()
+        self.assertEqual(capture.replay(self.path, dispatcher, speed=0)["packets"], 2)
+        self.assertEqual([data for data, _ in dispatcher.packets], [data for _, data in PACKETS[:2]])
+
+    def test_replay_keeps_timing(self):
+        self.write_capture()
+        result = capture.replay(self.path, RecordingDispatcher(), speed=10)
+        # 0.5 s of traffic at ten times speed
+        self.assertGreaterEqual(result["elapsed"], 0.05)
+
+    def test_capture_tap(self):
+        dispatcher = RecordingDispatcher()
+        tap = capture.CaptureDispatcher(dispatcher)
+        tap.call_handlers_for_packet(b"not captured", ("host", 1))
+        writer = capture.start_capture(self.path)
+        try:
+            tap.call_handlers_for_packet(PACKETS[0][1], ("host", 1))
+        finally:
+            self.assertIs(capture.stop_capture(), writer)
+        self.assertEqual(len(dispatcher.packets), 2)
+        self.assertEqual([bytes(data) for _, data in capture.iter_capture(self.path)], [PACKETS[0][1]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,206 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+# curve_math has no bpy dependency, import it without the add-on package
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "osc_controller", "core"))
+import curve_math
+
+
+class TestResampleToGrid(unittest.TestCase):
+
+    def test_dense_samples_are_interpolated(self):
+        # Samples closer together than a grid step
+        times = np.array([0.0, 0.03, 0.06])
+        samples = np.array([[0.0], [1.0], [2.0]])
+        frames, values = curve_math.resample_to_grid(times, samples, 0.0, 1, 24, 24)
+        np.testing.assert_allclose(frames, [1.0, 2.0])
+        np.testing.assert_allclose(values[:, 0], [0.0, 1.0 + (1 / 24 - 0.03) / 0.03])
+
+    def test_step_input_is_held(self):
+        # A fader held at 0 that sends 1.0 at 2 seconds, sampled only on receive
+        times = np.array([0.0, 2.0])
+        samples = np.array([[0.0], [1.0]])
+        frames, values = curve_math.resample_to_grid(times, samples, 0.0, 1, 24, 24)
+        self.assertEqual(len(frames), 49)
+        np.testing.assert_array_equal(values[:-1, 0], np.zeros(48))
+        self.assertEqual(values[-1, 0], 1.0)
+
+    def test_grid_lands_on_scene_frames(self):
+        times = np.linspace(0.0, 1.0, 101)
+        samples = times[:, None] * 10
+        frames, values = curve_math.resample_to_grid(times, samples, 0.0, 10, 24, 24, end_frame=20)
+        np.testing.assert_allclose(frames, np.arange(10, 21))
+        np.testing.assert_allclose(values[:, 0], (frames - 10) / 24 * 10)
+
+
+def reference_smooth(frames, values, sigma):
+    """Gaussian weights by frame distance, every key against every key"""
+    frames = np.asarray(frames, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    distance = frames[None, :] - frames[:, None]
+    weights = np.exp(-0.5 * (distance / sigma) ** 2)
+    weights[np.abs(distance) > curve_math.KERNEL_RADIUS_SIGMAS * sigma] = 0.0
+    return (weights @ values) / weights.sum(axis=1)
+
+
+class TestGaussianSmooth(unittest.TestCase):
+
+    def smooth(self, curves, sigma):
+        frames, mask = curve_math.pack_curves([f for f, _ in curves])
+        values, _ = curve_math.pack_curves([v for _, v in curves])
+        return curve_math.unpack_curves(curve_math.gaussian_smooth(frames, values, mask, sigma), mask)
+
+    def test_matches_reference(self):
+        rng = np.random.default_rng(5)
+        sparse = np.arange(0.0, 60.0, 1.0)
+        dense = np.sort(rng.uniform(0.0, 60.0, 200))
+        curves = [(sparse, rng.normal(size=len(sparse))), (dense, rng.normal(size=len(dense)))]
+        for sigma in (0.3, 1.0, 2.5):
+            for (frames, values), smoothed in zip(curves, self.smooth(curves, sigma)):
+                np.testing.assert_allclose(smoothed, reference_smooth(frames, values, sigma))
+
+    def test_sigma_is_in_frames(self):
+        # The same curve keyed every frame and every quarter frame
+        coarse = np.arange(0.0, 41.0)
+        fine = np.arange(0.0, 40.25, 0.25)
+        smoothed_coarse, smoothed_fine = self.smooth([(coarse, np.sin(coarse / 3)), (fine, np.sin(fine / 3))], 2.0)
+        # Away from the ends, where the cut-off kernel depends on the sampling
+        np.testing.assert_allclose(smoothed_fine[::4][6:-6], smoothed_coarse[6:-6], atol=0.005)
+
+        # Counted in keys, the fine curve would be smoothed four times less
+        self.assertGreater(np.abs(smoothed_coarse - np.sin(coarse / 3))[8:-8].max(), 0.1)
+
+    def test_small_factors_differ(self):
+        frames = np.arange(10.0)
+        values = np.array([0.0, 1.0] * 5)
+        untouched, smoothed = self.smooth([(frames, values)], 0.1)[0], self.smooth([(frames, values)], 0.5)[0]
+        np.testing.assert_array_equal(untouched, values)
+        self.assertLess(np.ptp(smoothed[2:-2]), 0.9)
+
+    def test_constant_curve_ends_stay(self):
+        curves = [(np.arange(5.0), np.full(5, 3.0)), (np.arange(12.0), np.full(12, -1.0))]
+        short, long = self.smooth(curves, 2.0)
+        np.testing.assert_allclose(short, 3.0)
+        np.testing.assert_allclose(long, -1.0)
+
+
+class TestHampelOutliers(unittest.TestCase):
+
+    def test_hampel_flags_a_spike(self):
+        values = [0.0, 0.0, 0.0, 0.0, 5.0, 0.0, 0.0, 0.0, 0.0]
+        np.testing.assert_array_equal(np.flatnonzero(curve_math.hampel_outliers(values, 0.5)), [4])
+
+    def test_hampel_leaves_a_ramp(self):
+        self.assertFalse(curve_math.hampel_outliers(np.arange(9.0), 0.1).any())
+
+    def test_hampel_skips_the_ends(self):
+        values = [5.0, 0.0, 0.0, 0.0, 0.0, 0.0, 5.0]
+        self.assertFalse(curve_math.hampel_outliers(values, 0.5).any())
+
+
+class TestFillGaps(unittest.TestCase):
+
+    def test_smoothstep(self):
+        frames, values, added = curve_math.fill_gaps([1.0, 4.0, 5.0], [0.0, 1.0, 1.0], 3)
+        self.assertEqual(added, 2)
+        np.testing.assert_array_equal(frames, [1.0, 2.0, 3.0, 4.0, 5.0])
+        np.testing.assert_allclose(values, [0.0, 7 / 27, 20 / 27, 1.0, 1.0])
+
+    def test_gap_longer_than_max_is_left(self):
+        frames, values, added = curve_math.fill_gaps([0.0, 5.0], [0.0, 1.0], 3)
+        self.assertEqual(added, 0)
+        np.testing.assert_array_equal(frames, [0.0, 5.0])
+
+    def test_bezier_follows_the_handles(self):
+        # Handles on the thirds of a straight line make a straight segment
+        handles_left = np.array([[-1.0, -1.0], [2.0, 2.0]])
+        handles_right = np.array([[1.0, 1.0], [4.0, 4.0]])
+        frames, values, added = curve_math.fill_gaps(
+            [0.0, 3.0], [0.0, 3.0], 3, method='bezier',
+            handles_left=handles_left, handles_right=handles_right,
+        )
+        self.assertEqual(added, 2)
+        np.testing.assert_allclose(values, [0.0, 1.0, 2.0, 3.0])
+
+    def test_gap_frames(self):
+        segments, missing = curve_math.gap_frames([0.0, 2.5, 3.0, 6.0], 4)
+        np.testing.assert_array_equal(segments, [0, 0, 2, 2])
+        np.testing.assert_array_equal(missing, [1.0, 2.0, 4.0, 5.0])
+
+
+class TestDuplicateRunInteriors(unittest.TestCase):
+
+    def test_duplicate_run_interiors(self):
+        values = [0.0, 1.0, 1.0, 1.0, 1.0, 2.0, 2.0]
+        np.testing.assert_array_equal(
+            curve_math.duplicate_run_interiors(values),
+            [False, False, True, True, False, False, False],
+        )
+
+
+def reference_decimate(frames, values, tolerance):
+    """Textbook recursive Ramer-Douglas-Peucker on value error"""
+    keep = np.zeros(len(frames), dtype=bool)
+    keep[0] = keep[-1] = True
+
+    def split(first, last):
+        if last - first < 2:
+            return
+        worst, worst_error = None, -1.0
+        for i in range(first + 1, last):
+            t = (frames[i] - frames[first]) / (frames[last] - frames[first])
+            error = abs(values[i] - (values[first] + t * (values[last] - values[first])))
+            if error > worst_error:
+                worst, worst_error = i, error
+        if worst_error > tolerance:
+            keep[worst] = True
+            split(first, worst)
+            split(worst, last)
+
+    split(0, len(frames) - 1)
+    return keep
+
+
+class TestDecimate(unittest.TestCase):
+
+    def test_matches_reference(self):
+        rng = np.random.default_rng(7)
+        for tolerance in (0.01, 0.1, 0.5):
+            frames = np.arange(300, dtype=np.float64)
+            values = np.cumsum(rng.normal(0.0, 0.1, 300))
+            np.testing.assert_array_equal(
+                curve_math.decimate(frames, values, tolerance),
+                reference_decimate(frames, values, tolerance),
+            )
+
+    def test_ties_keep_the_first_key(self):
+        frames = np.arange(5, dtype=np.float64)
+        values = np.array([0.0, 1.0, 0.0, 1.0, 0.0])
+        np.testing.assert_array_equal(
+            curve_math.decimate(frames, values, 0.1),
+            reference_decimate(frames, values, 0.1),
+        )
+
+    def test_straight_line_keeps_the_ends(self):
+        frames = np.arange(10, dtype=np.float64)
+        keep = curve_math.decimate(frames, frames * 2, 0.001)
+        np.testing.assert_array_equal(np.flatnonzero(keep), [0, 9])
+
+    def test_linear_segments_stay_within_tolerance(self):
+        rng = np.random.default_rng(3)
+        frames = np.arange(500, dtype=np.float64)
+        values = np.cumsum(rng.normal(0.0, 0.2, 500))
+        keep = curve_math.decimate(frames, values, 0.25)
+        rebuilt = np.interp(frames, frames[keep], values[keep])
+        self.assertLessEqual(np.abs(rebuilt - values).max(), 0.25)
+
+    def test_decimated_segments(self):
+        keep = np.array([True, False, True, True, False, False, True])
+        np.testing.assert_array_equal(curve_math.decimated_segments(keep), [True, False, True, False])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+import contextlib
+import io
+import os
+import sys
+import threading
+import time
+import unittest
+
+# scheduler has no bpy dependency, import it without the add-on package
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "osc_controller", "core"))
+sys.path.insert(0, os.path.join(HERE, "..", "osc_controller", "vendor"))
+import scheduler
+from pythonosc import dispatcher, osc_bundle_builder, osc_message_builder
+
+
+class Releases:
+    """Collects released labels and signals once the expected number arrived"""
+
+    def __init__(self, expected):
+        self.labels = []
+        self.expected = expected
+        self.done = threading.Event()
+
+    def callback(self, label):
+        def release():
+            self.labels.append(label)
+            if len(self.labels) == self.expected:
+                self.done.set()
+        return release
+
+
+class TestTimetagScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.scheduler = scheduler.TimetagScheduler()
+        self.scheduler.start()
+
+    def tearDown(self):
+        self.scheduler.stop()
+
+    def test_releases_in_due_time_order(self):
+        releases = Releases(4)
+        now = time.time()
+        for label, delay in (("c", 0.09), ("a", 0.03), ("b", 0.06), ("d", 0.12)):
+            self.assertTrue(self.scheduler.schedule(now + delay, releases.callback(label), "/" + label))
+        self.assertTrue(releases.done.wait(2.0))
+        self.assertEqual(releases.labels, ["a", "b", "c", "d"])
+        self.assertEqual(self.scheduler.released, 4)
+        self.assertEqual(len(self.scheduler), 0)
+
+    def test_equal_due_times_keep_arrival_order(self):
+        releases = Releases(5)
+        due = time.time() + 0.05
+        for label in "abcde":
+            self.scheduler.schedule(due, releases.callback(label))
+        self.assertTrue(releases.done.wait(2.0))
+        self.assertEqual(releases.labels, list("abcde"))
+
+    def test_not_released_before_due(self):
+        releases = Releases(1)
+        due = time.time() + 0.1
+        self.scheduler.schedule(due, releases.callback("a"))
+        self.assertFalse(releases.done.wait(0.05))
+        self.assertTrue(releases.done.wait(2.0))
+        self.assertGreaterEqual(self.scheduler.last_lateness, 0.0)
+
+    def test_late_message_is_released_at_once(self):
+        releases = Releases(1)
+        self.scheduler.schedule(time.time() - 1.0, releases.callback("late"), "/late")
+        self.assertTrue(releases.done.wait(0.5))
+
+        # Lateness counts from the due time, so it includes the second it was late
+        self.assertGreaterEqual(self.scheduler.last_lateness, 1.0)
+        self.assertEqual(self.scheduler.max_lateness, self.scheduler.last_lateness)
+        self.assertEqual(self.scheduler.recent[-1][0], "/late")
+
+    def test_failing_callback_keeps_the_thread(self):
+        releases = Releases(1)
+        now = time.time()
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            self.scheduler.schedule(now, lambda: 1 / 0)
+            self.scheduler.schedule(now + 0.01, releases.callback("after"))
+            self.assertTrue(releases.done.wait(2.0))
+        self.assertIn("division by zero", output.getvalue())
+
+    def test_stop_discards_pending(self):
+        releases = Releases(1)
+        self.scheduler.schedule(time.time() + 10.0, releases.callback("a"))
+        self.scheduler.stop()
+        self.assertEqual(len(self.scheduler), 0)
+        self.assertEqual(releases.labels, [])
+
+
+class TestSchedulerLimits(unittest.TestCase):
+
+    def test_far_future_is_dropped(self):
+        drops = []
+        sched = scheduler.TimetagScheduler(max_ahead=5.0, on_drop=drops.append)
+        self.assertFalse(sched.schedule(time.time() + 10.0, lambda: None))
+        self.assertTrue(sched.schedule(time.time() + 4.0, lambda: None))
+        self.assertEqual((len(sched), sched.dropped_ahead, sched.dropped_full), (1, 1, 0))
+        self.assertEqual(drops, ['ahead'])
+
+    def test_full_heap_drops(self):
+        drops = []
+        sched = scheduler.TimetagScheduler(max_pending=3, on_drop=drops.append)
+        due = time.time() + 1.0
+        accepted = [sched.schedule(due, lambda: None) for _ in range(5)]
+        self.assertEqual(accepted, [True, True, True, False, False])
+        self.assertEqual((len(sched), sched.dropped_full), (3, 2))
+        self.assertEqual(drops, ['full', 'full'])
+
+        sched.reset_stats()
+        self.assertEqual(sched.dropped_full, 0)
+
+
+class TestDispatcherScheduling(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = []
+        self.scheduled = []
+        self.dispatcher = dispatcher.Dispatcher()
+        self.dispatcher.map("/value", lambda address, *args: self.calls.append((address, args)))
+        self.dispatcher.set_scheduler(lambda due, callback, address: self.scheduled.append((due, callback, address)))
+
+    def bundle(self, timestamp, value):
+        builder = osc_bundle_builder.OscBundleBuilder(timestamp)
+        message = osc_message_builder.OscMessageBuilder("/value")
+        message.add_arg(value)
+        builder.add_content(message.build())
+        return builder.build().dgram
+
+    def test_future_bundle_is_handed_to_the_scheduler(self):
+        due = time.time() + 30.0
+        self.dispatcher.call_handlers_for_packet(self.bundle(due, 1), ("host", 1))
+        self.assertEqual(self.calls, [])
+        self.assertEqual(len(self.scheduled), 1)
+        scheduled_due, callback, address = self.scheduled[0]
+        self.assertAlmostEqual(scheduled_due, due, places=3)
+        self.assertEqual(address, "/value")
+
+        callback()
+        self.assertEqual(self.calls, [("/value", (1,))])
+
+    def test_late_bundle_is_dispatched_at_once(self):
+        self.dispatcher.call_handlers_for_packet(self.bundle(time.time() - 5.0, 2), ("host", 1))
+        self.assertEqual(self.calls, [("/value", (2,))])
+        self.assertEqual(self.scheduled, [])
+
+    def test_immediate_bundle_is_dispatched_at_once(self):
+        self.dispatcher.call_handlers_for_packet(self.bundle(osc_bundle_builder.IMMEDIATELY, 3), ("host", 1))
+        self.assertEqual(self.calls, [("/value", (3,))])
+        self.assertEqual(self.scheduled, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
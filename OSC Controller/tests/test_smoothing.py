@@ -0,0 +1,99 @@
+import math
+import os
+import sys
+import unittest
+
+import numpy as np
+
+# smoothing has no bpy dependency, import it without the add-on package
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "osc_controller", "core"))
+import smoothing
+
+
+def run_step(bank, steps, key="a", low=0.0, high=1.0, dt=0.1):
+    """Seed a channel at low, then feed high for a number of samples"""
+    bank.process([key], [low], 0.0)
+    return [bank.process([key], [high], (i + 1) * dt)[0] for i in range(steps)]
+
+
+class TestStepInput(unittest.TestCase):
+
+    def test_moving_average(self):
+        bank = smoothing.SmoothingBank('buffer', buffer_size=4)
+        np.testing.assert_allclose(run_step(bank, 6), [0.25, 0.5, 0.75, 1.0, 1.0, 1.0])
+
+    def test_threshold_holds_small_steps(self):
+        bank = smoothing.SmoothingBank('threshold', threshold=0.5)
+        np.testing.assert_array_equal(run_step(bank, 3, high=0.3), [0.0, 0.0, 0.0])
+        np.testing.assert_array_equal(run_step(bank, 2, key="b", high=1.0), [1.0, 1.0])
+
+    def test_both_gates_then_averages(self):
+        bank = smoothing.SmoothingBank('both', buffer_size=2, threshold=0.5)
+        np.testing.assert_allclose(run_step(bank, 3), [0.5, 1.0, 1.0])
+
+    def test_ema(self):
+        bank = smoothing.SmoothingBank('ema', ema_factor=0.5)
+        np.testing.assert_allclose(run_step(bank, 3), [0.5, 0.75, 0.875])
+
+    def test_one_euro(self):
+        # With beta 0 the cutoff is fixed and the filter is a plain low-pass
+        bank = smoothing.SmoothingBank('one_euro', min_cutoff=1.0, beta=0.0)
+        alpha = 1.0 / (1.0 + 1.0 / (2.0 * math.pi * 0.1))
+        expected = [1.0 - (1.0 - alpha) ** n for n in range(1, 5)]
+        np.testing.assert_allclose(run_step(bank, 4), expected)
+
+    def test_one_euro_speed_raises_cutoff(self):
+        slow = run_step(smoothing.SmoothingBank('one_euro', beta=0.0), 1)[0]
+        fast = run_step(smoothing.SmoothingBank('one_euro', beta=1.0), 1)[0]
+        self.assertGreater(fast, slow)
+        self.assertLess(fast, 1.0)
+
+
+class TestChannels(unittest.TestCase):
+
+    def test_first_sample_passes_through(self):
+        bank = smoothing.SmoothingBank('ema', ema_factor=0.5)
+        np.testing.assert_array_equal(bank.process(["a", "b"], [3.0, -2.0], 0.0), [3.0, -2.0])
+
+    def test_channels_are_independent(self):
+        bank = smoothing.SmoothingBank('ema', ema_factor=0.5)
+        bank.process(["a"], [0.0], 0.0)
+        bank.process(["a"], [1.0], 0.1)
+
+        # A new channel starts from its own value and leaves "a" alone
+        np.testing.assert_allclose(bank.process(["b", "a"], [10.0, 1.0], 0.2), [10.0, 0.75])
+
+    def test_reset_forgets_every_channel(self):
+        bank = smoothing.SmoothingBank('buffer', buffer_size=4)
+        run_step(bank, 2)
+        bank.reset()
+        self.assertEqual(bank.channels, {})
+        np.testing.assert_array_equal(bank.process(["a"], [5.0], 0.0), [5.0])
+        np.testing.assert_allclose(bank.process(["a"], [1.0], 0.1), [4.0])
+
+    def test_grows_past_initial_capacity(self):
+        bank = smoothing.SmoothingBank('ema', ema_factor=0.5)
+        count = smoothing.INITIAL_CHANNELS + 10
+        keys = list(range(count))
+        bank.process(keys, np.zeros(count), 0.0)
+        np.testing.assert_allclose(bank.process(keys, np.ones(count), 0.1), np.full(count, 0.5))
+
+    def test_configure_resets_on_method_change(self):
+        bank = smoothing.SmoothingBank('ema', ema_factor=0.5)
+        run_step(bank, 2)
+        settings = type("Settings", (), dict(
+            smoothing_method='buffer', smoothing_buffer_size=5, smoothing_threshold=0.01,
+            smoothing_ema_factor=0.5, one_euro_min_cutoff=1.0, one_euro_beta=0.007,
+            one_euro_d_cutoff=1.0,
+        ))()
+        bank.configure(settings)
+        self.assertEqual(bank.channels, {})
+
+        # The same parameters again keep the state
+        bank.process(["a"], [1.0], 0.0)
+        bank.configure(settings)
+        self.assertIn("a", bank.channels)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+# take_stream has no bpy dependency, import it without the add-on package
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "osc_controller", "core"))
+import take_stream
+
+
+def _header(channels=2):
+    return {
+        "clock": "timestamps",
+        "start_time": 0.0,
+        "channels": [{"object": "Cube", "data_path": "location", "index": i, "group": None}
+                     for i in range(channels)],
+    }
+
+
+class FailingWriter(take_stream.TakeWriter):
+    """Writer whose chunk writes fail with an error other than OSError"""
+
+    def _write(self, times, samples):
+        raise ValueError("cannot encode chunk")
+
+
+class ExitedWriter(take_stream.TakeWriter):
+    """Writer whose thread exits without draining the queue"""
+
+    def _run(self):
+        return
+
+
+class TestTakeStream(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "take.osctake")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write_take(self, chunks, rows=100, channels=2):
+        writer = take_stream.TakeWriter(self.path, _header(channels))
+        times = np.arange(chunks * rows, dtype=np.float64) / 10
+        samples = np.column_stack([times * (i + 1) for i in range(channels)])
+        for chunk in range(chunks):
+            rows_slice = slice(chunk * rows, (chunk + 1) * rows)
+            self.assertTrue(writer.write_chunk(times[rows_slice], samples[rows_slice], block=True))
+        writer.close()
+        self.assertIsNone(writer.error)
+        return times, samples
+
+    def test_round_trip(self):
+        times, samples = self.write_take(chunks=3)
+        reader = take_stream.TakeReader(self.path)
+        self.assertEqual(reader.header, _header())
+        self.assertEqual(len(reader.chunks), 3)
+        self.assertEqual(reader.rows, 300)
+
+        read_times, read_samples = reader.read()
+        np.testing.assert_array_equal(read_times, times)
+        np.testing.assert_array_equal(read_samples, samples)
+
+    def test_read_selected_channels(self):
+        _, samples = self.write_take(chunks=2)
+        _, read_samples = take_stream.TakeReader(self.path).read(channels=[1])
+        np.testing.assert_array_equal(read_samples, samples[:, [1]])
+
+    def test_range_read(self):
+        times, samples = self.write_take(chunks=3)
+        read_times, read_samples = take_stream.TakeReader(self.path).read(start=12.0, end=15.5)
+        inside = (times >= 12.0) & (times <= 15.5)
+        np.testing.assert_array_equal(read_times, times[inside])
+        np.testing.assert_array_equal(read_samples, samples[inside])
+
+    def test_range_outside_take(self):
+        self.write_take(chunks=1)
+        read_times, read_samples = take_stream.TakeReader(self.path).read(start=1000.0)
+        self.assertEqual(len(read_times), 0)
+        self.assertEqual(read_samples.shape, (0, 2))
+
+    def test_truncated_file(self):
+        times, samples = self.write_take(chunks=3)
+        size = os.path.getsize(self.path)
+        with open(self.path, "r+b") as f:
+            f.truncate(size - 10)
+
+        # The cut chunk is dropped, the complete ones are readable
+        reader = take_stream.TakeReader(self.path)
+        self.assertEqual(len(reader.chunks), 2)
+        read_times, read_samples = reader.read()
+        np.testing.assert_array_equal(read_times, times[:200])
+        np.testing.assert_array_equal(read_samples, samples[:200])
+
+    def test_not_a_take_file(self):
+        with open(self.path, "wb") as f:
+            f.write(b"not a take")
+        with self.assertRaises(ValueError):
+            take_stream.TakeReader(self.path)
+
+    def test_existing_file_is_not_replaced(self):
+        with open(self.path, "wb") as f:
+            f.write(b"earlier take")
+        with self.assertRaises(FileExistsError):
+            take_stream.TakeWriter(self.path, _header())
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), b"earlier take")
+
+    def test_numbered_path(self):
+        first = take_stream.numbered_path(self.path)
+        self.assertEqual(first, os.path.join(self.directory, "take_001.osctake"))
+        open(first, "wb").close()
+        self.assertEqual(take_stream.numbered_path(self.path), os.path.join(self.directory, "take_002.osctake"))
+
+    def test_write_failure_is_reported(self):
+        writer = FailingWriter(self.path, _header())
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            for _ in range(take_stream.MAX_PENDING_CHUNKS + 4):
+                self.assertTrue(writer.write_chunk(np.zeros(3), np.zeros((3, 2)), block=True))
+            writer.close()
+        self.assertIsInstance(writer.error, ValueError)
+        self.assertIn("cannot encode chunk", output.getvalue())
+        self.assertEqual(take_stream.TakeReader(self.path).chunks, [])
+
+    def test_close_after_writer_thread_exited(self):
+        writer = ExitedWriter(self.path, _header())
+        writer._thread.join()
+        for _ in range(take_stream.MAX_PENDING_CHUNKS):
+            writer._queue.put_nowait(None)
+
+        # Neither a blocking write nor close waits on the exited thread
+        self.assertFalse(writer.write_chunk(np.zeros(3), np.zeros((3, 2)), block=True))
+        self.assertEqual(writer.refused, 1)
+        writer.close()
+        self.assertTrue(writer._file.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()